@@ -0,0 +1,117 @@
+"""
+Log de atividades com memória limitada e gravação em ficheiro fora da UI thread.
+
+As linhas ficam num buffer circular (as mais antigas saem quando enche); a
+caixa de log da janela só mostra o fim desse buffer. Cada linha também vai
+para um ficheiro com rotação por tamanho, escrito por uma thread própria
+(`logging.handlers.QueueListener`), para a UI nunca esperar pelo disco.
+"""
+import logging
+import logging.handlers
+import queue
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Iterable, List, Optional, Tuple
+
+DEFAULT_CAPACITY = 5000  # Linhas guardadas em memória
+DEFAULT_MAX_BYTES = 1024 * 1024  # Tamanho de cada ficheiro antes de rodar
+DEFAULT_BACKUP_COUNT = 5  # activity.log.1 ... activity.log.5
+
+LOG_FILE_NAME = "activity.log"
+
+# "[HH:MM:SS] " do início de cada linha: no ficheiro, o formatter já põe data e hora
+_TIME_PREFIX = re.compile(r"^\[\d{2}:\d{2}:\d{2}\] ")
+
+
+class ActivityLog:
+    """Buffer circular de linhas de log (seguro entre threads) + ficheiro rotativo."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, path: Optional[Path] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT) -> None:
+        # Cada entrada guarda também a versão em minúsculas, para filtrar rápido
+        self._lines: Deque[Tuple[str, str]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.path = Path(path) if path else None
+        self._logger: Optional[logging.Logger] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._file_handler: Optional[logging.Handler] = None
+        if self.path:
+            self._start_file_writer(max_bytes, backup_count)
+
+    @property
+    def capacity(self) -> int:
+        return self._lines.maxlen or 0
+
+    def _start_file_writer(self, max_bytes: int, backup_count: int) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        except OSError as e:
+            print(f"Log de atividades só em memória (ficheiro indisponível): {e}")
+            self.path = None
+            return
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+        self._file_handler = handler
+
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(records, handler)
+        self._listener.start()
+
+        self._logger = logging.getLogger(f"github_manager.activity.{id(self)}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(logging.handlers.QueueHandler(records))
+
+    def append(self, lines: Iterable[str]) -> None:
+        """Guarda as linhas (já com o horário) e agenda a gravação no ficheiro."""
+        lines = list(lines)
+        with self._lock:
+            self._lines.extend((line, line.lower()) for line in lines)
+        if self._logger:
+            for line in lines:
+                self._logger.info(_TIME_PREFIX.sub("", line.rstrip("\n"), count=1))
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def tail(self, count: int) -> List[str]:
+        """As últimas `count` linhas, da mais antiga para a mais recente."""
+        with self._lock:
+            start = max(0, len(self._lines) - count)
+            return [line for line, _ in list(self._lines)[start:]]
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Linhas que contêm `text` (sem diferenciar maiúsculas), as mais recentes no fim."""
+        needle = text.lower()
+        with self._lock:
+            snapshot = list(self._lines)
+        found: List[str] = []
+        for line, lowered in reversed(snapshot):
+            if needle in lowered:
+                found.append(line)
+                if limit is not None and len(found) >= limit:
+                    break
+        found.reverse()
+        return found
+
+    @staticmethod
+    def matches(line: str, text: str) -> bool:
+        return text.lower() in line.lower()
+
+    def close(self) -> None:
+        """Grava o que falta no ficheiro e para a thread de escrita."""
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
+        if self._logger:
+            for handler in list(self._logger.handlers):
+                self._logger.removeHandler(handler)
+            self._logger = None
+        if self._file_handler:
+            self._file_handler.close()
+            self._file_handler = None
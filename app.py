@@ -1,36 +1,68 @@
+from __future__ import annotations
+
+import sys
+
+# O profiler precisa ser instalado antes dos demais imports para poder medi-los
+from lazy_imports import ImportProfiler, LazyModule
+PROFILER = ImportProfiler.install_if_requested(sys.argv)
+
+import bisect
 import subprocess
 import webbrowser
 import os
 import shutil
-from tkinter import messagebox, Tk, Listbox, filedialog
-import sys
+from tkinter import messagebox, filedialog
 import threading
+import time
 from pathlib import Path
+from collections import deque
 from datetime import datetime  # <- ADICIONADO para o Log
-from typing import Optional, List, Dict, Self, Tuple, Any  # Para type hints
-from github.Repository import Repository as GitHubRepository  # Importa Repository com um alias
+from typing import Optional, List, Dict, Set, Tuple, Any, Deque, TYPE_CHECKING  # Para type hints
+
 # customtkinter
 import customtkinter as ctk  # type: ignore
 
-# PyGithub
-from github import Github, GithubException  # type: ignore
-from github.GithubObject import NotSet  # type: ignore
-from github.AuthenticatedUser import AuthenticatedUser  # type: ignore
-from github.Repository import Repository  # type: ignore
+# Módulos do projeto
+import activity_log
+import bulk_clone
+import clone_options
+import git_progress
+import github_http
+import github_rest
+import graphql_loader
+import issue_cache
+import lfs
+import mirror_store
+import rate_limit
+import repo_cache
+import repo_index
+from repo_models import IssueSummary, RepoSummary
+import services
+import staging
+import tasks
+from tasks import Cancelled, CancelToken
+import tracing
+import ui_dispatch
+from virtual_list import VirtualListbox
+
+# Módulos pesados (PyGithub, GitPython, Pandas, Matplotlib):
+# só são importados no primeiro uso, para a janela abrir mais rápido.
+# Assim que carregam, os pedidos do PyGithub passam a respeitar o rate limit
+# (e a gerar spans de tracing), tal como os comandos do GitPython.
+github = services.github
+git = services.git
+pd = LazyModule("pandas")
+plt = LazyModule("matplotlib.pyplot")
+
+# `--trace ARQUIVO`: grava os spans ao fechar (.jsonl = JSON Lines; senão, Chrome trace)
+TRACE_PATH = tracing.trace_path_from_argv(sys.argv)
+# `--base-url URL`: outra API compatível (ex: `python github_emulator.py`)
+API_BASE_URL = github_http.base_url_from_argv(sys.argv)
+
+if TYPE_CHECKING:
+    from github import Github  # type: ignore
+    from github.AuthenticatedUser import AuthenticatedUser  # type: ignore
 
-# grafico
-
-import threading
-from pathlib import Path
-from datetime import datetime
-from typing import Optional, List, Dict, Tuple, Any 
-import pandas as pd  # <- Adicione esta linha
-import matplotlib.pyplot as plt  # <- Adicione esta linha
-from matplotlib.dates import DateFormatter # <- Adicione esta linha
-
-
-# GitPython
-import git  # type: ignore
 
 # ------------------------------------
 # Funções Auxiliares de Verificação
@@ -48,8 +80,12 @@ def _get_startup_info() -> Optional[subprocess.STARTUPINFO]:
     return None
 
 
-def check_git_installed() -> bool:
-    """Verifica se o Git está disponível no PATH."""
+def probe_git() -> Optional[str]:
+    """
+    Verifica se o Git está disponível no PATH.
+    Retorna None se estiver tudo bem, "missing" se não foi encontrado
+    ou "broken" se está instalado mas falhou ao executar.
+    """
     try:
         subprocess.run(
             ["git", "--version"],
@@ -58,30 +94,14 @@ def check_git_installed() -> bool:
             startupinfo=_get_startup_info()
         )
         print("✓ Git está instalado.")
-        return True
+        return None
 
     except FileNotFoundError:
         print("✗ Git NÃO foi encontrado.")
-        root_popup = Tk()
-        root_popup.withdraw()
-        resposta = messagebox.askyesno(
-            "Git não encontrado",
-            "O Git não foi encontrado no seu computador.\n"
-            "Ele é essencial para este aplicativo funcionar.\n\n"
-            "Deseja ir para a página de download do Git agora?"
-        )
-        if resposta:
-            webbrowser.open_new("https://git-scm.com/downloads")
-        root_popup.destroy()
-        return False
+        return "missing"
 
     except subprocess.CalledProcessError:
-        root_popup = Tk()
-        root_popup.withdraw()
-        messagebox.showerror(
-            "Erro de Git", "O Git parece estar instalado, mas falhou ao executar. Tente reinstalá-lo.")
-        root_popup.destroy()
-        return False
+        return "broken"
 
 
 def check_git_credentials() -> Tuple[Optional[str], Optional[str]]:
@@ -107,10 +127,6 @@ def check_git_credentials() -> Tuple[Optional[str], Optional[str]]:
 # -------------------------
 
 
-if not check_git_installed():
-    print("Execução interrompida. O Git é necessário.")
-    sys.exit(1)
-
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
@@ -161,12 +177,368 @@ class IDEPrompt(ctk.CTkToplevel):
         return self.choice
 
 
+# --- Pop-up de opções do clone em lote ---
+class BulkCloneDialog(ctk.CTkToplevel):
+    """Pergunta a pasta, quantos clones em paralelo e o que fazer com pastas existentes."""
+
+    JOB_CHOICES = ["1", "2", "4", "8", "16"]
+    POLICY_LABELS = {
+        "Ignorar (não mexe)": bulk_clone.IF_EXISTS_SKIP,
+        "Atualizar (git pull)": bulk_clone.IF_EXISTS_UPDATE,
+        "Marcar como erro": bulk_clone.IF_EXISTS_FAIL,
+    }
+
+    def __init__(self, master: Any, count: int, jobs: int, **kwargs: Any):
+        super().__init__(master, **kwargs)
+        self.geometry("460x260")
+        self.title("Clonar em lote")
+        self.choice: Optional[Tuple[Path, int, str]] = None
+
+        ctk.CTkLabel(self, text=f"Clonar {count} repositórios", font=("", 14)).pack(pady=10)
+
+        dest_frame = ctk.CTkFrame(self, fg_color="transparent")
+        dest_frame.pack(fill="x", padx=10, pady=2)
+        self.dest_entry = ctk.CTkEntry(dest_frame, placeholder_text="Pasta de destino")
+        self.dest_entry.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(dest_frame, text="📁", width=40, command=self.browse).pack(side="left", padx=(5, 0))
+
+        options = ctk.CTkFrame(self, fg_color="transparent")
+        options.pack(fill="x", padx=10, pady=5)
+        ctk.CTkLabel(options, text="Em paralelo:").grid(row=0, column=0, sticky="w", pady=2)
+        self.jobs_menu = ctk.CTkOptionMenu(options, values=self.JOB_CHOICES, width=80)
+        self.jobs_menu.set(str(jobs))
+        self.jobs_menu.grid(row=0, column=1, sticky="w", padx=5, pady=2)
+        ctk.CTkLabel(options, text="Se a pasta existir:").grid(row=1, column=0, sticky="w", pady=2)
+        self.policy_menu = ctk.CTkOptionMenu(options, values=list(self.POLICY_LABELS))
+        self.policy_menu.grid(row=1, column=1, sticky="w", padx=5, pady=2)
+
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(buttons, text="⬇️ Clonar", command=self.confirm).pack(side="left", expand=True)
+        ctk.CTkButton(buttons, text="Cancelar", fg_color="gray",
+                      command=self.destroy).pack(side="left", expand=True)
+
+        self.transient(self.master)  # type: ignore
+        self.grab_set()
+
+    def browse(self) -> None:
+        path = filedialog.askdirectory(parent=self, title="Selecione onde clonar os repositórios")
+        if path:
+            self.dest_entry.delete(0, "end")
+            self.dest_entry.insert(0, path)
+
+    def confirm(self) -> None:
+        dest = self.dest_entry.get().strip()
+        if not dest:
+            messagebox.showwarning("Aviso", "Escolha a pasta de destino.", parent=self)
+            return
+        self.choice = (Path(dest).expanduser(), int(self.jobs_menu.get()),
+                       self.POLICY_LABELS[self.policy_menu.get()])
+        self.destroy()
+
+    def get_choice(self) -> Optional[Tuple[Path, int, str]]:
+        self.master.wait_window(self)
+        return self.choice
+
+
+# --- Pop-up do modo de clone personalizado ---
+class CloneOptionsDialog(ctk.CTkToplevel):
+    """Edita as opções do clone: profundidade, filtro, branch, sparse, submódulos e LFS."""
+
+    FILTER_LABELS = {
+        "Nenhum (todos os blobs)": None,
+        "Sem blobs (blob:none)": clone_options.FILTER_BLOBLESS,
+        "Só commits (tree:0)": clone_options.FILTER_TREELESS,
+    }
+
+    def __init__(self, master: Any, options: clone_options.CloneOptions, **kwargs: Any):
+        super().__init__(master, **kwargs)
+        self.geometry("460x400")
+        self.title("Modo do clone")
+        self.choice: Optional[clone_options.CloneOptions] = None
+
+        form = ctk.CTkFrame(self, fg_color="transparent")
+        form.pack(fill="both", expand=True, padx=10, pady=10)
+        form.grid_columnconfigure(1, weight=1)
+
+        ctk.CTkLabel(form, text="Profundidade (vazio = tudo):").grid(row=0, column=0, sticky="w", pady=3)
+        self.depth_entry = ctk.CTkEntry(form, placeholder_text="ex: 1")
+        self.depth_entry.grid(row=0, column=1, sticky="we", padx=5, pady=3)
+        if options.depth:
+            self.depth_entry.insert(0, str(options.depth))
+
+        ctk.CTkLabel(form, text="Clone parcial:").grid(row=1, column=0, sticky="w", pady=3)
+        self.filter_menu = ctk.CTkOptionMenu(form, values=list(self.FILTER_LABELS))
+        self.filter_menu.set(next(label for label, value in self.FILTER_LABELS.items()
+                                  if value == options.filter))
+        self.filter_menu.grid(row=1, column=1, sticky="we", padx=5, pady=3)
+
+        ctk.CTkLabel(form, text="Branch (vazio = padrão):").grid(row=2, column=0, sticky="w", pady=3)
+        self.branch_entry = ctk.CTkEntry(form)
+        self.branch_entry.grid(row=2, column=1, sticky="we", padx=5, pady=3)
+        if options.branch:
+            self.branch_entry.insert(0, options.branch)
+        self.single_branch_var = ctk.BooleanVar(value=options.single_branch)
+        ctk.CTkCheckBox(form, text="Só esse branch (--single-branch)",
+                        variable=self.single_branch_var).grid(row=3, column=1, sticky="w", padx=5, pady=3)
+
+        ctk.CTkLabel(form, text="Sparse (caminhos):").grid(row=4, column=0, sticky="w", pady=3)
+        self.sparse_entry = ctk.CTkEntry(form, placeholder_text="ex: src/app docs")
+        self.sparse_entry.grid(row=4, column=1, sticky="we", padx=5, pady=3)
+        if options.sparse_paths:
+            self.sparse_entry.insert(0, " ".join(options.sparse_paths))
+
+        self.submodules_var = ctk.BooleanVar(value=options.recurse_submodules)
+        ctk.CTkCheckBox(form, text="Submódulos, em paralelo:",
+                        variable=self.submodules_var).grid(row=5, column=0, sticky="w", pady=3)
+        self.submodule_jobs_entry = ctk.CTkEntry(form, width=60)
+        self.submodule_jobs_entry.insert(0, str(options.submodule_jobs))
+        self.submodule_jobs_entry.grid(row=5, column=1, sticky="w", padx=5, pady=3)
+
+        self.lfs_skip_smudge_var = ctk.BooleanVar(value=options.lfs_skip_smudge)
+        ctk.CTkCheckBox(form, text="Binários LFS sob demanda (ficam como ponteiros)",
+                        variable=self.lfs_skip_smudge_var).grid(row=6, column=0, columnspan=2,
+                                                                sticky="w", pady=3)
+
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(fill="x", padx=10, pady=(0, 10))
+        ctk.CTkButton(buttons, text="OK", command=self.confirm).pack(side="left", expand=True)
+        ctk.CTkButton(buttons, text="Cancelar", fg_color="gray",
+                      command=self.destroy).pack(side="left", expand=True)
+
+        self.transient(self.master)  # type: ignore
+        self.grab_set()
+
+    def confirm(self) -> None:
+        try:
+            depth_text = self.depth_entry.get().strip()
+            self.choice = clone_options.CloneOptions(
+                depth=int(depth_text) if depth_text else None,
+                filter=self.FILTER_LABELS[self.filter_menu.get()],
+                single_branch=self.single_branch_var.get(),
+                branch=self.branch_entry.get().strip() or None,
+                sparse_paths=self.sparse_entry.get().split(),
+                recurse_submodules=self.submodules_var.get(),
+                submodule_jobs=int(self.submodule_jobs_entry.get().strip() or 1),
+                lfs_skip_smudge=self.lfs_skip_smudge_var.get(),
+            )
+        except ValueError as e:
+            messagebox.showwarning("Aviso", f"Opção inválida: {e}", parent=self)
+            return
+        self.destroy()
+
+    def get_choice(self) -> Optional[clone_options.CloneOptions]:
+        self.master.wait_window(self)
+        return self.choice
+
+
+# --- Pop-up de revisão do push ---
+class PushReviewDialog(ctk.CTkToplevel):
+    """
+    Mostra o que o push vai levar; oferece o .gitignore sugerido, enviar os
+    grandes pelo Git LFS (se instalado) ou deixá-los de fora.
+    """
+
+    TRANSFER_CHOICES = ["4", "8", "16", "32"]
+
+    def __init__(self, master: Any, repo_name: str, plan: staging.StagePlan,
+                 lfs_available: bool = False, **kwargs: Any):
+        super().__init__(master, **kwargs)
+        self.geometry("620x480")
+        self.title("Revisar push")
+        self.plan = plan
+        self.choice: Optional[Tuple[bool, List[str], Optional[lfs.LfsOptions]]] = None
+
+        ctk.CTkLabel(self, text=f"Enviar {plan.root} para '{repo_name}'",
+                     font=("", 14)).pack(padx=10, pady=10)
+        self.summary_box = ctk.CTkTextbox(self, wrap="none")
+        self.summary_box.pack(fill="both", expand=True, padx=10)
+
+        self.gitignore_var = ctk.BooleanVar(value=plan.suggested_gitignore is not None)
+        if plan.suggested_gitignore is not None:
+            languages = ", ".join(plan.languages) or "pastas geradas"
+            ctk.CTkCheckBox(self, text=f"Criar .gitignore sugerido ({languages}) antes do commit",
+                            variable=self.gitignore_var).pack(anchor="w", padx=10, pady=(8, 0))
+
+        large = plan.large_files()
+        # Com o LFS, os grandes vão como ponteiros: fica marcado por padrão
+        self.lfs_var = ctk.BooleanVar(value=lfs_available and bool(large))
+        self.transfers_var = ctk.StringVar(value=str(lfs.DEFAULT_CONCURRENT_TRANSFERS))
+        if lfs_available:
+            lfs_row = ctk.CTkFrame(self, fg_color="transparent")
+            lfs_row.pack(fill="x", padx=10, pady=(8, 0))
+            ctk.CTkCheckBox(lfs_row, text=f"Enviar pelo Git LFS os ficheiros a partir de "
+                                          f"{lfs.DEFAULT_THRESHOLD_BYTES // 1024 ** 2} MB",
+                            variable=self.lfs_var, command=self.show_summary).pack(side="left")
+            ctk.CTkOptionMenu(lfs_row, values=self.TRANSFER_CHOICES, variable=self.transfers_var,
+                              width=70).pack(side="right")
+            ctk.CTkLabel(lfs_row, text="em paralelo:").pack(side="right", padx=5)
+        elif large:
+            ctk.CTkLabel(self, text="ℹ️ Com o git-lfs instalado, os grandes podem ir pelo Git LFS.",
+                         anchor="w").pack(fill="x", padx=10, pady=(8, 0))
+        # Acima do limite do GitHub o push falharia: fica marcado por padrão
+        self.skip_large_var = ctk.BooleanVar(value=bool(plan.too_large()) and not self.lfs_var.get())
+        if large:
+            size = sum(change.size for change in large) / 1024 ** 2
+            ctk.CTkCheckBox(self, text=f"Deixar de fora os {len(large)} ficheiros grandes "
+                                       f"({size:.1f} MB)",
+                            variable=self.skip_large_var,
+                            command=self.show_summary).pack(anchor="w", padx=10, pady=(8, 0))
+        self.show_summary()
+
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(buttons, text="⬆️ Enviar", command=self.confirm).pack(side="left", expand=True)
+        ctk.CTkButton(buttons, text="Cancelar", fg_color="gray",
+                      command=self.destroy).pack(side="left", expand=True)
+
+        self.transient(self.master)  # type: ignore
+        self.grab_set()
+
+    @property
+    def lfs_options(self) -> Optional[lfs.LfsOptions]:
+        if not self.lfs_var.get():
+            return None
+        return lfs.LfsOptions(concurrent_transfers=int(self.transfers_var.get()))
+
+    @property
+    def lfs_paths(self) -> List[str]:
+        options = self.lfs_options
+        if options is None:
+            return []
+        return lfs.covered(self.plan) + [change.path for change in lfs.candidates(self.plan, options)]
+
+    @property
+    def excluded(self) -> List[str]:
+        if not self.skip_large_var.get():
+            return []
+        in_lfs = set(self.lfs_paths)
+        return [change.path for change in self.plan.large_files() if change.path not in in_lfs]
+
+    def show_summary(self) -> None:
+        excluded = self.excluded
+        text = self.plan.summary(excluded)
+        in_lfs = set(self.lfs_paths) - set(excluded)
+        if in_lfs:
+            size = sum(change.size for change in self.plan.changes if change.path in in_lfs)
+            text += f"\n📦 Git LFS: {len(in_lfs)} ficheiros ({size / 1024 ** 2:.1f} MB) vão como ponteiros."
+        self.summary_box.configure(state="normal")
+        self.summary_box.delete("1.0", "end")
+        self.summary_box.insert("1.0", text)
+        self.summary_box.configure(state="disabled")
+
+    def confirm(self) -> None:
+        self.choice = (self.gitignore_var.get(), self.excluded, self.lfs_options)
+        self.destroy()
+
+    def get_choice(self) -> Optional[Tuple[bool, List[str], Optional[lfs.LfsOptions]]]:
+        self.master.wait_window(self)
+        return self.choice
+
+
+# --- Janela com as tarefas em curso ---
+class TaskPanel(ctk.CTkToplevel):
+    """Lista as tarefas pendentes/em curso do agendador, com botão de cancelar."""
+
+    REFRESH_MS = 500  # Atualiza o tempo decorrido enquanto a janela está aberta
+
+    def __init__(self, master: Any, scheduler: tasks.TaskScheduler,
+                 dispatcher: Optional[ui_dispatch.UIDispatcher] = None, **kwargs: Any):
+        super().__init__(master, **kwargs)
+        self.geometry("520x320")
+        self.title("Tarefas em curso")
+        self.scheduler = scheduler
+        self.dispatcher = dispatcher
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", padx=10, pady=(10, 0))
+        self.dispatch_label = ctk.CTkLabel(header, text="", anchor="w")
+        self.dispatch_label.pack(side="left", fill="x", expand=True)
+        self.pool_label = ctk.CTkLabel(self, text="", anchor="w")
+        ctk.CTkButton(header, text="💾 Exportar trace", width=120,
+                      command=master.export_trace).pack(side="right")
+        self.pool_label.pack(fill="x", padx=10)
+        self.rows_frame = ctk.CTkScrollableFrame(self)
+        self.rows_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.empty_label = ctk.CTkLabel(self.rows_frame, text="Nenhuma tarefa em curso.")
+
+        self.transient(master)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """(UI Thread) Redesenha a lista (são poucas linhas; recriar é simples)."""
+        if not self.winfo_exists():
+            return
+        for child in self.rows_frame.winfo_children():
+            if child is not self.empty_label:
+                child.destroy()
+
+        if self.dispatcher is not None:
+            depth, latency, max_latency = self.dispatcher.snapshot()
+            self.dispatch_label.configure(
+                text=f"Fila da UI: {depth} pendentes · latência {latency:.0f} ms "
+                     f"(máx {max_latency:.0f} ms)")
+        pool = github_http.pool_stats()
+        self.pool_label.configure(
+            text=f"Conexões HTTP: {pool['connects']} abertas · {pool['reused']}/"
+                 f"{pool['checkouts']} reutilizadas · {pool['waits']} esperas "
+                 f"({pool['wait_ms']:.0f} ms)")
+
+        active = self.scheduler.active_tasks()
+        if not active:
+            self.empty_label.pack(pady=10)
+        else:
+            self.empty_label.pack_forget()
+        for task in active:
+            row = ctk.CTkFrame(self.rows_frame, fg_color="transparent")
+            row.pack(fill="x", pady=1)
+            text = f"[{task.lane}] {task.name} — {task.state} ({task.elapsed:.1f}s)"
+            if task.token.cancelled:
+                text += " — a cancelar..."
+            if task.progress:
+                text += "\n" + task.progress
+            ctk.CTkLabel(row, text=text, anchor="w", justify="left").pack(
+                side="left", fill="x", expand=True)
+            ctk.CTkButton(row, text="✗", width=30, fg_color="gray",
+                          state="disabled" if task.token.cancelled else "normal",
+                          command=lambda t=task: self.cancel_task(t)).pack(side="right")
+
+    def cancel_task(self, task: tasks.Task) -> None:
+        task.cancel()
+        self.refresh()
+
+    def auto_refresh(self) -> None:
+        if self.winfo_exists():
+            self.refresh()
+            self.after(self.REFRESH_MS, self.auto_refresh)
+
+
 class GitHubApp(ctk.CTk):
 
     # --- Constantes (Boas Práticas) ---
     APP_NAME = "Gestor Completo de GitHub"
     GEOMETRY = "1200x750"
     TEMP_DIR = Path.home() / ".github_manager_temp"
+    CACHE_DIR = repo_cache.default_cache_dir()
+    REPOS_PER_PAGE = 100
+    REPO_FETCH_WORKERS = 8  # Páginas de repositórios pedidas em paralelo
+    FILTER_DEBOUNCE_MS = 120  # Espera entre teclas antes de filtrar
+    FILTER_MAX_DIFF_OPS = repo_index.MAX_DIFF_OPS  # Acima disso, reconstrói a Listbox de uma vez
+    INDEX_SLICE_GAP_MS = 15  # Pausa entre fatias da montagem dos trigramas da busca
+    ISSUE_PREFETCH_TOP = 5  # Repositórios mais recentes com issues pré-carregadas
+    ISSUE_PREFETCH_NEIGHBORS = 1  # Vizinhos (acima/abaixo) da seleção pré-carregados
+    ISSUE_PREFETCH_WORKERS = 2  # Workers da pista de segundo plano
+    INTERACTIVE_WORKERS = 4  # Cliques do utilizador (issues, criar/apagar, gráfico)
+    BULK_WORKERS = 2  # Clone/push/pull: nunca ocupam os workers interativos
+    BULK_CLONE_JOBS = 4  # Clones em paralelo no clone em lote (ajustável no diálogo)
+    CLONE_MODE_LABELS = [label for label, _ in clone_options.PRESETS.values()]
+    CLONE_MODE_CUSTOM = "Personalizado..."
+    MIRROR_QUOTA_BYTES = mirror_store.DEFAULT_QUOTA_BYTES  # Espaço máximo dos espelhos locais
+    MIRROR_REFRESH_MS = 30 * 60 * 1000  # Fetch em segundo plano dos espelhos antigos
+    ISSUE_RENDER_LIMIT = 200  # Issues mostradas antes do "carregar mais"
+    LOG_CAPACITY = 5000  # Linhas do log guardadas em memória (o resto fica no ficheiro)
+    LOG_TAIL_LINES = 500  # Entradas mostradas na caixa de log
+    ISSUE_RENDER_BATCH = 50  # Issues inseridas por ciclo do loop principal (~16 ms)
     
     # Type hints para atributos que são inicializados fora do __init__
     open_browser_button: ctk.CTkButton
@@ -197,14 +569,52 @@ class GitHubApp(ctk.CTk):
         # Estado (com type hints)
         self.github_api: Optional[Github] = None
         self.github_user: Optional[AuthenticatedUser] = None
-        self.current_repo_object: Optional[GitHubRepository] = None
+        self.current_repo_object: Optional[RepoSummary] = None
         self.current_local_path: Optional[str] = None
-        # CORRIGIDO: Removido .Repository extra
-        self.repo_map: Dict[str, Repository] = {}
+        # Resumos compactos; o Repository completo só é pedido quando uma ação precisa
+        self.repo_map: Dict[str, RepoSummary] = {}
+        self.repo_search_index = repo_index.RepoIndex([])
+        self._visible_repo_names: List[str] = []  # Nomes mostrados na Listbox, em ordem
+        self._filter_after_id: Optional[str] = None
+        self._index_after_id: Optional[str] = None
+        self.rest_client: Optional[github_rest.RestClient] = None
+        self.service: Optional[services.GitHubService] = None
+        self._repo_cache: Optional[repo_cache.RepoCache] = None
+        self._repo_cache_lock = threading.Lock()
+        self.issue_cache = issue_cache.IssueCache()
+        # Todo o trabalho em segundo plano passa pelo agendador (pistas separadas)
+        self.scheduler = tasks.TaskScheduler({
+            tasks.INTERACTIVE: self.INTERACTIVE_WORKERS,
+            tasks.BULK: self.BULK_WORKERS,
+            tasks.BACKGROUND: self.ISSUE_PREFETCH_WORKERS,
+        })
+        # Uma conexão keep-alive por worker que pode estar a fazer um pedido
+        github_http.configure_pool(self.INTERACTIVE_WORKERS + self.BULK_WORKERS +
+                                   self.ISSUE_PREFETCH_WORKERS + self.REPO_FETCH_WORKERS)
+        self.task_panel: Optional[TaskPanel] = None
+        # Modo dos próximos clones (preset ou personalizado)
+        self.clone_options = clone_options.preset(clone_options.DEFAULT_PRESET)
+        # Clones em paralelo do último clone em lote (lembrado até fechar o app)
+        self._bulk_clone_jobs = self.BULK_CLONE_JOBS
+        # Espelhos locais (criados no primeiro clone que os usa)
+        self._mirror_store: Optional[mirror_store.MirrorStore] = None
+        # Pastas com clone/push/pull em curso (só mexidas na UI thread)
+        self._busy_paths: Set[Path] = set()
+        self._prefetching: Set[str] = set()  # Repositórios com pré-carregamento em curso
+        self._prefetch_lock = threading.Lock()
+        # Token do carregamento de issues da seleção atual (os anteriores são cancelados)
+        self._issue_request: Optional[CancelToken] = None
+        # Issues recebidas e quantas já estão na caixa de texto
+        self._issue_buffer: List[IssueSummary] = []
+        self._issues_rendered = 0
+        self._issue_render_limit = self.ISSUE_RENDER_LIMIT
+        self._issue_render_after_id: Optional[str] = None
 
         # --- Widgets ---
         self.token_entry: ctk.CTkEntry
         self.connect_button: ctk.CTkButton
+        self.graphql_var: ctk.BooleanVar
+        self.graphql_checkbox: ctk.CTkCheckBox
         self.git_name_entry: ctk.CTkEntry
         self.git_email_entry: ctk.CTkEntry
         self.save_git_config_button: ctk.CTkButton
@@ -216,27 +626,53 @@ class GitHubApp(ctk.CTk):
         self.readme_checkbox: ctk.CTkCheckBox  # <- ADICIONADO
         self.create_repo_button: ctk.CTkButton
         self.refresh_repos_button: ctk.CTkButton
+        self.force_refresh_button: ctk.CTkButton
         self.search_entry: ctk.CTkEntry
-        self.repo_listbox: Listbox
+        self.repo_listbox: VirtualListbox
         self.delete_repo_button: ctk.CTkButton
         self.open_browser_button: ctk.CTkButton
         self.issue_textbox: ctk.CTkTextbox
         self.clone_button: ctk.CTkButton
+        self.clone_mode_menu: ctk.CTkOptionMenu
+        self.use_mirror_var: ctk.BooleanVar
+        self.use_mirror_checkbox: ctk.CTkCheckBox
         self.link_local_button: ctk.CTkButton
         self.pull_button: ctk.CTkButton
+        self.fetch_lfs_button: ctk.CTkButton
         self.open_terminal_button: ctk.CTkButton
         # REMOVIDO: self.import_folder_button
         # REMOVIDO: self.import_file_button
         self.issue_title_entry: ctk.CTkEntry
         self.issue_body_text: ctk.CTkTextbox
         self.create_issue_button: ctk.CTkButton
+        self.tasks_button: ctk.CTkButton
         self.log_textbox: ctk.CTkTextbox  # <- ADICIONADO
+        self.log_filter_entry: ctk.CTkEntry
         self.status_bar: ctk.CTkLabel
+        self.rate_label: ctk.CTkLabel
+        self._watched_limiter: Optional[rate_limit.RateLimiter] = None
+
+        # Log de atividades: buffer limitado + ficheiro rotativo (gravado fora da UI thread)
+        self.activity_log = activity_log.ActivityLog(
+            self.LOG_CAPACITY, self.CACHE_DIR / activity_log.LOG_FILE_NAME)
+        # Linhas de texto de cada entrada na caixa de log (uma mensagem pode ter várias)
+        self._log_rendered: Deque[int] = deque()
+        self._log_filter = ""
+        self._log_filter_after_id: Optional[str] = None
+
+        # Pedidos dos workers para a UI (esvaziados uma vez por frame)
+        self.ui = ui_dispatch.UIDispatcher(self, self._show_status, self._append_log_lines)
 
         # Configurar UI
         self._setup_layout()
         self.setup_ui()
-        self.check_git_config()
+        self.ui.start()
+
+        self.scheduler.add_listener(lambda: self.post(self._on_tasks_changed, key="tasks"))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # A verificação do Git roda em segundo plano, depois da janela aparecer
+        self.after_idle(self._on_first_paint)
 
     # ---------------------------------
     # --- Funções de Configuração da UI ---
@@ -280,6 +716,10 @@ class GitHubApp(ctk.CTk):
             fg_color=self.COLOR_SUCCESS, hover_color=self.COLOR_SUCCESS_HOVER
         )
         self.connect_button.pack(fill="x", padx=5, pady=5)
+        self.graphql_var = ctk.BooleanVar(value=False)
+        self.graphql_checkbox = ctk.CTkCheckBox(
+            auth_frame, text="Usar GraphQL (mostra nº de issues)", variable=self.graphql_var)
+        self.graphql_checkbox.pack(anchor="w", padx=5, pady=(0, 5))
 
         # Frame de Configuração Git
         git_config_frame = ctk.CTkFrame(config_frame)
@@ -334,6 +774,10 @@ class GitHubApp(ctk.CTk):
         log_frame.pack(fill="both", expand=True, padx=10, pady=10)
         ctk.CTkLabel(log_frame, text="📜 Log de Atividades",
                      font=self.FONT_BOLD).pack(anchor="w", padx=5)
+        self.log_filter_entry = ctk.CTkEntry(
+            log_frame, placeholder_text="🔍 Filtrar log...")
+        self.log_filter_entry.pack(fill="x", padx=5, pady=(5, 0))
+        self.log_filter_entry.bind("<KeyRelease>", self.on_log_filter_key)
         self.log_textbox = ctk.CTkTextbox(
             log_frame, state="disabled", font=self.FONT_LISTBOX)
         self.log_textbox.pack(fill="both", expand=True, padx=5, pady=5)
@@ -353,13 +797,20 @@ class GitHubApp(ctk.CTk):
             repo_header, text="🔄", width=40, command=self.start_connect_and_load
         )
         self.refresh_repos_button.pack(side="right")
+        self.force_refresh_button = ctk.CTkButton(
+            repo_header, text="⟳ Tudo", width=60, command=self.start_force_refresh,
+            fg_color="gray"
+        )
+        self.force_refresh_button.pack(side="right", padx=(0, 5))
         self.search_entry = ctk.CTkEntry(
             repo_list_frame, placeholder_text="🔍 Buscar repositório...")
         self.search_entry.pack(fill="x", padx=10, pady=5)
-        self.search_entry.bind("<KeyRelease>", self.filter_repositories)
-        self.repo_listbox = Listbox(
+        self.search_entry.bind("<KeyRelease>", self.on_search_key)
+        # Lista virtualizada: só as linhas visíveis existem no Tk
+        self.repo_listbox = VirtualListbox(
             repo_list_frame, bg="#2B2B2B", fg="white", selectbackground="#1F6AA5",
-            borderwidth=0, highlightthickness=0, font=self.FONT_LISTBOX
+            borderwidth=0, highlightthickness=0, font=self.FONT_LISTBOX,
+            formatter=self._format_repo_row
         )
         self.repo_listbox.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         self.repo_listbox.bind("<<ListboxSelect>>", self.on_repo_select)
@@ -390,6 +841,9 @@ class GitHubApp(ctk.CTk):
         self.issue_textbox = ctk.CTkTextbox(
             issue_list_frame, state="disabled", font=self.FONT_LISTBOX)
         self.issue_textbox.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<KeyRelease>"):
+            self.issue_textbox.bind(sequence, self._on_issue_scroll)
+        self.issue_textbox.tag_bind("load_more", "<Button-1>", self.load_more_issues)
 
     def _create_actions_column(self, col: int) -> None:
         """Cria a coluna da direita (Ações e Operações)."""
@@ -403,10 +857,21 @@ class GitHubApp(ctk.CTk):
         ctk.CTkLabel(local_frame, text="💻 Repositório Local",
                      font=self.FONT_BOLD).pack(anchor="w", padx=5)
         self.clone_button = ctk.CTkButton(
-            local_frame, text="⬇️ Clonar Repositório", command=self.start_clone_repo,
+            local_frame, text="⬇️ Clonar Selecionado(s)", command=self.start_clone_repo,
             fg_color=self.COLOR_SECONDARY, hover_color=self.COLOR_SECONDARY_HOVER
         )
         self.clone_button.pack(fill="x", padx=5, pady=2)
+        # Modo do clone: presets + "Personalizado..." (profundidade, filtro, sparse...)
+        self.clone_mode_menu = ctk.CTkOptionMenu(
+            local_frame, values=self.CLONE_MODE_LABELS + [self.CLONE_MODE_CUSTOM],
+            command=self.on_clone_mode_change
+        )
+        self.clone_mode_menu.set(clone_options.PRESETS[clone_options.DEFAULT_PRESET][0])
+        self.clone_mode_menu.pack(fill="x", padx=5, pady=2)
+        self.use_mirror_var = ctk.BooleanVar(value=False)
+        self.use_mirror_checkbox = ctk.CTkCheckBox(
+            local_frame, text="Reaproveitar objetos (espelho local)", variable=self.use_mirror_var)
+        self.use_mirror_checkbox.pack(anchor="w", padx=5, pady=2)
 
         # ALTERADO: Botão de Pull (antigo link_local_button)
         self.link_local_button = ctk.CTkButton(
@@ -421,6 +886,13 @@ class GitHubApp(ctk.CTk):
         )
         self.pull_button.pack(fill="x", padx=5, pady=2)
 
+        # Binários do Git LFS que ficaram como ponteiros (clone "sob demanda")
+        self.fetch_lfs_button = ctk.CTkButton(
+            local_frame, text="📦 Baixar binários LFS", command=self.start_fetch_lfs,
+            fg_color=self.COLOR_INFO, hover_color=self.COLOR_INFO_HOVER
+        )
+        self.fetch_lfs_button.pack(fill="x", padx=5, pady=2)
+
         self.open_terminal_button = ctk.CTkButton(
             local_frame, text=" BTerminal", command=self.open_terminal
         )
@@ -445,6 +917,13 @@ class GitHubApp(ctk.CTk):
         )
         self.create_issue_button.pack(fill="x", padx=5, pady=5)
 
+        # Tarefas em segundo plano
+        self.tasks_button = ctk.CTkButton(
+            actions_frame, text="🧵 Tarefas em curso (0)", command=self.open_task_panel,
+            fg_color="gray"
+        )
+        self.tasks_button.pack(fill="x", padx=15, pady=(0, 10))
+
     def _create_status_bar(self) -> None:
         """Cria a barra de status inferior."""
         self.status_bar = ctk.CTkLabel(
@@ -454,6 +933,11 @@ class GitHubApp(ctk.CTk):
         self.status_bar.grid(row=2, column=0, columnspan=3,
                              padx=0, pady=0, sticky="we")
 
+        # Quota da API (canto direito da barra de status)
+        self.rate_label = ctk.CTkLabel(
+            self, text="", height=30, fg_color="#1e1e1e", corner_radius=0)
+        self.rate_label.grid(row=2, column=2, padx=(0, 10), pady=0, sticky="e")
+
         # ADICIONADO: Define o status inicial usando a nova função
         self.set_status("✓ Pronto. Insira seu token e conecte.")
 
@@ -462,49 +946,215 @@ class GitHubApp(ctk.CTk):
     # ---------------------------------
 
     def set_status(self, message: str, color: Optional[str] = None) -> None:
-        """Atualiza a barra de status E o log de atividades (UI thread)."""
-        # 1. Atualiza a barra de status inferior
-        self.status_bar.configure(text=message)
+        """
+        Atualiza a barra de status E o log de atividades (qualquer thread).
+        A mensagem entra na fila da UI: status seguidos são fundidos e as
+        linhas de log do mesmo frame entram na caixa de uma só vez.
+        """
+        self.ui.status(message)
+
+    def set_progress(self, message: str) -> None:
+        """Atualiza só a barra de status, sem registar no log (progresso frequente)."""
+        self.ui.status(message, log=False)
 
-        # 2. Prepara a mensagem do log com timestamp
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
+    def post(self, func: Any, *args: Any, key: Optional[str] = None) -> None:
+        """Agenda `func(*args)` na UI thread (qualquer thread; ver `ui_dispatch`)."""
+        self.ui.call(func, *args, key=key)
 
-        # 3. Adiciona ao Log de Atividades
+    def _show_status(self, message: str) -> None:
+        """(UI Thread) Mostra a mensagem na barra de status inferior."""
+        self.status_bar.configure(text=message)
+
+    def _append_log_lines(self, lines: List[str]) -> None:
+        """
+        (UI Thread) Guarda as linhas no log de atividades e mostra-as na caixa
+        com um só insert. A caixa só mantém as últimas LOG_TAIL_LINES entradas,
+        e as mais antigas saem inteiras mesmo que tenham várias linhas.
+        """
+        self.activity_log.append(lines)
+        if self._log_filter:
+            lines = [line for line in lines if activity_log.ActivityLog.matches(line, self._log_filter)]
+        if not lines:
+            return
         try:
             self.log_textbox.configure(state="normal")
-            self.log_textbox.insert("end", log_message)
+            self.log_textbox.insert("end", "".join(lines))
+            self._log_rendered.extend(line.count("\n") or 1 for line in lines)
+            removed = 0
+            while len(self._log_rendered) > self.LOG_TAIL_LINES:
+                removed += self._log_rendered.popleft()
+            if removed:
+                self.log_textbox.delete("1.0", f"{removed + 1}.0")
             self.log_textbox.see("end")  # Rola para o final
             self.log_textbox.configure(state="disabled")
         except Exception as e:
             print(f"Erro ao atualizar o log: {e}")  # Segurança
 
-    def run_in_thread(self, target_func: Any, *args: Any) -> None:
-        """Executa uma função em uma thread separada para não travar a UI."""
-        threading.Thread(target=target_func, args=args, daemon=True).start()
+    def on_log_filter_key(self, event: Optional[Any] = None) -> None:
+        """(UI Thread) Agenda o filtro do log (várias teclas seguidas geram uma só busca)."""
+        if self._log_filter_after_id:
+            self.after_cancel(self._log_filter_after_id)
+        self._log_filter_after_id = self.after(self.FILTER_DEBOUNCE_MS, self.filter_log)
+
+    def filter_log(self) -> None:
+        """(UI Thread) Mostra as linhas do histórico em memória que contêm o filtro."""
+        self._log_filter_after_id = None
+        self._log_filter = self.log_filter_entry.get().strip()
+        if self._log_filter:
+            lines = self.activity_log.search(self._log_filter, limit=self.LOG_TAIL_LINES)
+        else:
+            lines = self.activity_log.tail(self.LOG_TAIL_LINES)
+
+        self.log_textbox.configure(state="normal")
+        self.log_textbox.delete("1.0", "end")
+        self.log_textbox.insert("end", "".join(lines))
+        self.log_textbox.see("end")
+        self.log_textbox.configure(state="disabled")
+        self._log_rendered = deque(line.count("\n") or 1 for line in lines)
+
+    def run_in_thread(self, target_func: Any, *args: Any, lane: str = tasks.INTERACTIVE,
+                      priority: int = tasks.PRIORITY_NORMAL, name: Optional[str] = None,
+                      token: Optional[CancelToken] = None) -> tasks.Task:
+        """
+        Executa uma função fora da UI thread, através do agendador de tarefas.
+        `lane` separa cliques, operações longas e trabalho especulativo; o
+        `token` (se houver) permite cancelar a tarefa pelo painel.
+        """
+        return self.scheduler.submit(target_func, *args, lane=lane, priority=priority,
+                                     name=name, token=token)
 
-    def check_git_config(self) -> None:
-        """Verifica e pré-preenche as configurações globais do Git."""
+    def _watch_rate_limit(self, limiter: rate_limit.RateLimiter) -> None:
+        """Mostra a quota deste limitador na barra de status (uma vez por token)."""
+        if limiter is self._watched_limiter:
+            return
+        self._watched_limiter = limiter
+        limiter.add_listener(
+            lambda source: self.post(self._show_rate_limit, source, key="rate_limit"))
+
+    def _show_rate_limit(self, limiter: rate_limit.RateLimiter) -> None:
+        """(UI Thread) Atualiza o indicador de quota (restante e hora da renovação)."""
+        if limiter is not self._watched_limiter:
+            return  # Outro token (sessão antiga)
+        budget = limiter.budget("core")
+        if budget is None or budget.remaining is None:
+            return
+        text = f"⚡ API: {budget.remaining}/{budget.limit}"
+        if budget.reset_at:
+            text += f" · renova às {datetime.fromtimestamp(budget.reset_at).strftime('%H:%M')}"
+        if limiter.blocked_until > time.time():
+            resume = datetime.fromtimestamp(limiter.blocked_until).strftime('%H:%M:%S')
+            text += f" · ⏳ pausa até {resume}"
+        self.rate_label.configure(text=text)
+
+    def _on_tasks_changed(self) -> None:
+        """(UI Thread) Atualiza o contador de tarefas e o painel (se estiver aberto)."""
+        count = len(self.scheduler.active_tasks())
+        self.tasks_button.configure(text=f"🧵 Tarefas em curso ({count})")
+        if self.task_panel is not None and self.task_panel.winfo_exists():
+            self.task_panel.refresh()
+
+    def open_task_panel(self) -> None:
+        """(UI Thread) Abre (ou traz para a frente) o painel de tarefas em curso."""
+        if self.task_panel is not None and self.task_panel.winfo_exists():
+            self.task_panel.focus()
+            return
+        self.task_panel = TaskPanel(self, self.scheduler, self.ui)
+        self.task_panel.auto_refresh()
+
+    def _on_close(self) -> None:
+        """(UI Thread) Cancela as tarefas pendentes e fecha a janela."""
+        self.scheduler.shutdown()
+        self.ui.stop()
+        self.activity_log.close()
+        if TRACE_PATH:
+            count = tracing.TRACER.export(TRACE_PATH)
+            print(f"Trace gravado em {TRACE_PATH} ({count} spans).")
+        self.destroy()
+
+    def export_trace(self) -> None:
+        """(UI Thread) Grava os spans recentes (JSONL ou formato do Chrome)."""
+        path = filedialog.asksaveasfilename(
+            title="Exportar trace", defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json"), ("JSON Lines", "*.jsonl")])
+        if not path:
+            return
+        count = tracing.TRACER.export(Path(path))
+        self.set_status(f"✓ Trace exportado: {count} spans em {path}")
+
+    def _on_first_paint(self) -> None:
+        """(UI Thread) Chamado quando a janela já foi desenhada pela primeira vez."""
+        if PROFILER:
+            PROFILER.mark("primeira janela pintada")
+            print(PROFILER.report())
+        self.run_in_thread(self._check_git_worker, name="Verificar Git")
+        self.after(self.MIRROR_REFRESH_MS, self._schedule_mirror_refresh)
+
+    def _check_git_worker(self) -> None:
+        """(Worker Thread) Verifica o Git e lê as credenciais globais."""
+        problem = probe_git()
+        if problem:
+            self.post(self._on_git_missing, problem)
+            return
         name, email = check_git_credentials()
+        self.post(self.check_git_config, name, email)
+
+    def _on_git_missing(self, problem: str) -> None:
+        """(UI Thread) Avisa que o Git não está disponível e encerra a aplicação."""
+        if problem == "missing":
+            resposta = messagebox.askyesno(
+                "Git não encontrado",
+                "O Git não foi encontrado no seu computador.\n"
+                "Ele é essencial para este aplicativo funcionar.\n\n"
+                "Deseja ir para a página de download do Git agora?",
+                parent=self
+            )
+            if resposta:
+                webbrowser.open_new("https://git-scm.com/downloads")
+        else:
+            messagebox.showerror(
+                "Erro de Git", "O Git parece estar instalado, mas falhou ao executar. Tente reinstalá-lo.",
+                parent=self)
+        print("Execução interrompida. O Git é necessário.")
+        self._on_close()
+
+    def check_git_config(self, name: Optional[str], email: Optional[str]) -> None:
+        """(UI Thread) Pré-preenche as configurações globais do Git."""
         if name:
             self.git_name_entry.insert(0, name)
         if email:
             self.git_email_entry.insert(0, email)
 
+    def on_search_key(self, event: Optional[Any] = None) -> None:
+        """(UI Thread) Agenda o filtro: várias teclas seguidas geram uma só busca."""
+        if self._filter_after_id:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(self.FILTER_DEBOUNCE_MS, self.filter_repositories)
+
     def filter_repositories(self, event: Optional[Any] = None) -> None:
         """Filtra a lista de repositórios baseada no campo de busca."""
-        search_term = self.search_entry.get().lower()
-        self.repo_listbox.delete(0, "end")
-
-        # Recarrega a lista baseada no mapa filtrado
-        for repo_name in sorted(self.repo_map.keys()):
-            if search_term in repo_name.lower():
-                self.repo_listbox.insert("end", repo_name)
+        self._filter_after_id = None
+        search_term = self.search_entry.get()
+        matches = self.repo_search_index.search_names(search_term)
+
+        # Aplica só as diferenças na Listbox (em vez de apagar e reinserir tudo)
+        ops = repo_index.diff_sorted(self._visible_repo_names, matches, self.FILTER_MAX_DIFF_OPS)
+        if ops is None:
+            # Muitas mudanças espalhadas: uma reconstrução única sai mais barata
+            self.repo_listbox.delete(0, "end")
+            if matches:
+                self.repo_listbox.insert("end", *matches)
+        else:
+            for kind, start, stop in ops:
+                if kind == "delete":
+                    self.repo_listbox.delete(start, stop - 1)
+                else:
+                    self.repo_listbox.insert(start, *matches[start:stop])
+        self._visible_repo_names = matches
 
         # Atualiza a exibição do repositório selecionado
         self.update_selected_repo()
 
-    def _get_selected_repo(self) -> Optional[GitHubRepository]:
+    def _get_selected_repo(self) -> Optional[RepoSummary]:
         """
         Retorna o objeto do repositório selecionado.
         Mostra um erro e retorna None se nada estiver selecionado.
@@ -514,6 +1164,12 @@ class GitHubApp(ctk.CTk):
             return None
         return self.current_repo_object
 
+    def _get_selected_repos(self) -> List[RepoSummary]:
+        """Todos os repositórios selecionados na lista (Ctrl/Shift+clique, Ctrl+A)."""
+        return [self.repo_map[name] for name in
+                (self.repo_listbox.get(index) for index in self.repo_listbox.curselection())
+                if name in self.repo_map]
+
     def update_selected_repo(self) -> None:
         """
         Atualiza o `current_repo_object` com base na seleção atual da listbox.
@@ -553,7 +1209,7 @@ class GitHubApp(ctk.CTk):
             messagebox.showerror("Erro", f"Falha ao configurar Git: {e}")
 
     # --- Conectar e Carregar Repos ---
-    def start_connect_and_load(self) -> None:
+    def start_connect_and_load(self, force_refresh: bool = False) -> None:
         """(UI Thread) Inicia a conexão com o GitHub."""
         token = self.token_entry.get().strip()
         if not token:
@@ -562,39 +1218,112 @@ class GitHubApp(ctk.CTk):
             return
         self.set_status("🔄 Conectando ao GitHub...")
         self.connect_button.configure(state="disabled")
-        self.run_in_thread(self.connect_and_load, token)
-
-    def connect_and_load(self, token: str) -> None:
-        """(Worker Thread) Conecta à API e carrega os repositórios."""
+        self.run_in_thread(self.connect_and_load, token, force_refresh, self.graphql_var.get(),
+                           name="Conectar e carregar repositórios")
+
+    def start_force_refresh(self) -> None:
+        """(UI Thread) Ignora o cache local e recarrega todas as páginas."""
+        self.start_connect_and_load(force_refresh=True)
+
+    def _get_repo_cache(self) -> repo_cache.RepoCache:
+        """Abre o cache de repositórios no primeiro uso (e aplica o despejo)."""
+        with self._repo_cache_lock:
+            if self._repo_cache is None:
+                # Outra API (ex: o emulador) não partilha o cache com o GitHub
+                self._repo_cache = repo_cache.RepoCache(
+                    services.repo_cache_path(self.CACHE_DIR, API_BASE_URL))
+                self._repo_cache.evict()
+            return self._repo_cache
+
+    def _require_service(self) -> services.GitHubService:
+        """(Worker Thread) O serviço da sessão atual (erro se ainda não conectou)."""
+        if not self.service:
+            raise github.GithubException(
+                status=401, data={"message": "Não conectado. Conecte-se primeiro."})
+        return self.service
+
+    @tracing.traced()
+    def connect_and_load(self, token: str, force_refresh: bool = False,
+                         use_graphql: bool = False) -> None:
+        """
+        (Worker Thread) Conecta à API e carrega os repositórios.
+        Mostra primeiro o que estiver em cache e depois revalida cada página
+        com ETag/Last-Modified (um 304 não gasta quota de rate limit).
+        Com `use_graphql`, carrega tudo (com nº de issues) pelo endpoint GraphQL.
+        """
         try:
-            self.github_api = Github(token)
-            self.github_user = self.github_api.get_user()  # type: ignore
-
-            if not self.github_user:
-                raise GithubException(
-                    status=401, data={"message": "Não foi possível obter o utilizador autenticado."})
-
-            login = self.github_user.login
-            self.after(
-                0, self.set_status, f"✓ Conectado como: {login}. Carregando repositórios...")
-
-            repos = list(self.github_user.get_repos(sort="updated"))
-            self.after(0, self.update_repo_list, repos)
+            service = services.GitHubService(
+                token, API_BASE_URL, cache=self._get_repo_cache(), issues=self.issue_cache,
+                repos_per_page=self.REPOS_PER_PAGE, repo_fetch_workers=self.REPO_FETCH_WORKERS)
+            self.service = service
+            self.github_api = service.github_api
+            self.rest_client = service.rest_client
+            self._watch_rate_limit(service.limiter)
+            self.issue_cache.clear()
+
+            if use_graphql:
+                self._load_via_graphql(service)
+                return
 
-        except GithubException as e:
-            self.after(
-                0, lambda: messagebox.showerror("Erro", f"Falha na API do GitHub: {str(e)}"))
-            self.after(0, self.set_status, "✗ Erro de conexão.")
+            # 1. Mostra o cache na hora (se conhecermos o dono deste token)
+            cached = service.cached_repos(force_refresh)
+            if cached:
+                self.post(self.update_repo_list, services.repos_from_raw(cached))
+                self.set_status(f"📦 {len(cached)} repositórios do cache. Validando com o GitHub...")
+
+            # 2. Autentica
+            login = service.authenticate()
+            self.github_user = service.user
+            self.set_status(f"✓ Conectado como: {login}. Carregando repositórios...")
+
+            # 3. Revalida as páginas (em paralelo). Sem cache na tela, cada
+            #    página já entra na lista assim que chega.
+            on_page = None
+            if not cached:
+                self.post(self.clear_repo_list)
+                on_page = lambda items: self.post(self.append_repos, services.repos_from_raw(items))
+            loaded = service.load_repos(
+                on_page, lambda received, total: self.set_progress(
+                    f"⬇️ Carregando repositórios: {received}/{total} páginas..."))
+            self.post(self.update_repo_list, loaded.repos)
+            if loaded.unchanged:
+                self.set_status(
+                    f"ℹ️ {loaded.unchanged} de {loaded.pages} páginas sem alterações (servidas do cache).")
+
+        except rate_limit.RateLimitExceeded as e:
+            self.post(messagebox.showwarning, "Limite da API", str(e))
+            self.set_status(f"⏳ {e}")
+        except (github.GithubException, github_rest.RestError, graphql_loader.GraphQLError) as e:
+            self.post(lambda: messagebox.showerror("Erro", f"Falha na API do GitHub: {str(e)}"))
+            self.set_status("✗ Erro de conexão.")
             self.github_user = None  # Reset user on failure
             self.github_api = None  # Reset API on failure
+            self.service = None
         except Exception as e:  # type: ignore
-            self.after(
-                0, lambda: messagebox.showerror("Erro", f"Erro inesperado: {e}"))
-            self.after(0, self.set_status, "✗ Erro de conexão.")
+            self.post(lambda: messagebox.showerror("Erro", f"Erro inesperado: {e}"))
+            self.set_status("✗ Erro de conexão.")
         finally:
-            self.after(
-                0, lambda: self.connect_button.configure(state="normal"))
+            self.post(lambda: self.connect_button.configure(state="normal"))
 
+    def _load_via_graphql(self, service: services.GitHubService) -> None:
+        """(Worker Thread) Carrega repositórios + issues abertas em lotes de 100 (GraphQL)."""
+        self.post(self.clear_repo_list)
+
+        def on_page(page: List[RepoSummary], received: int, total: int) -> None:
+            self.post(self.append_repos, page)
+            self.set_progress(f"⬇️ GraphQL: {received}/{total} repositórios...")
+
+        login, repos = service.load_repos_graphql(on_page=on_page)
+        self.github_user = service.user
+        self.set_status(f"✓ Conectado como: {login} (GraphQL).")
+        self.post(self.update_repo_list, repos)
+
+    def _format_repo_row(self, name: str) -> str:
+        """Texto de uma linha da lista (com nº de issues, quando conhecido)."""
+        repo = self.repo_map.get(name)
+        if repo is not None and repo.open_issues is not None:
+            return f"{name}  ({repo.open_issues} issues)"
+        return name
 
     # funcao grafico
     # --- Gerar Gráfico de Atividade ---
@@ -614,30 +1343,26 @@ class GitHubApp(ctk.CTk):
         self.set_status("📊 Gerando gráfico de atividade...")
         self.plot_button.configure(state="disabled")
         # Passa a lista de repos para a thread
-        self.run_in_thread(self.generate_plot, repos)
-
-    def generate_plot(self, repos: List[Repository]) -> None:
+        self.run_in_thread(self.generate_plot, repos, name="Gerar gráfico")
+
+    @staticmethod
+    def repos_per_month(repos: List[RepoSummary]) -> Any:
+        """Nº de repositórios criados por mês (Series com PeriodIndex; só meses com criação)."""
+        df = pd.DataFrame([repo.created_at for repo in repos], columns=['DataCriacao'])
+        # Converte as datas (texto ISO 8601, em UTC) para objetos datetime
+        datas = pd.to_datetime(df['DataCriacao'], utc=True).dt.tz_convert(None)
+        # Conta por mês ('M' = período mensal); meses sem criação não aparecem
+        return datas.dt.to_period('M').value_counts().sort_index()
+
+    @tracing.traced()
+    def generate_plot(self, repos: List[RepoSummary]) -> None:
         """(Worker Thread) Processa os dados com Pandas e mostra o gráfico com Matplotlib."""
         try:
-            # 1. Extrair dados
-            data = []
-            for repo in repos:
-                data.append([repo.name, repo.created_at])
-
-            # 2. Processar com Pandas
-            df = pd.DataFrame(data, columns=['Nome', 'DataCriacao'])
-            # Converte as datas (que são texto) para objetos datetime
-            df['DataCriacao'] = pd.to_datetime(df['DataCriacao'])
-            
-            # Agrupa os repositórios por Mês e conta quantos há
-            # 'M' significa 'Month' (Mês)
-            repos_por_mes = df.set_index('DataCriacao').resample('M').size()
-            
-            # Remove meses sem criação para um gráfico mais limpo
-            repos_por_mes = repos_por_mes[repos_por_mes > 0]
+            # 1. e 2. Extrair os dados e agrupar por mês (Pandas)
+            repos_por_mes = self.repos_per_month(repos)
 
             if repos_por_mes.empty:
-                 self.after(0, messagebox.showinfo, "Gráfico", "Nenhum dado de criação de repositório encontrado.")
+                 self.post(messagebox.showinfo, "Gráfico", "Nenhum dado de criação de repositório encontrado.")
                  return
 
             # 3. Criar Gráfico com Matplotlib
@@ -661,26 +1386,67 @@ class GitHubApp(ctk.CTk):
             # (Nota: É possível embutir no app, mas é muito mais complexo)
             plt.show()
 
-            self.after(0, self.set_status, "✓ Gráfico gerado com sucesso.")
+            self.set_status("✓ Gráfico gerado com sucesso.")
 
         except Exception as e:
-            self.after(0, messagebox.showerror, "Erro no Gráfico", f"Erro ao gerar gráfico: {e}")
-            self.after(0, self.set_status, "✗ Erro ao gerar gráfico.")
+            self.post(messagebox.showerror, "Erro no Gráfico", f"Erro ao gerar gráfico: {e}")
+            self.set_status("✗ Erro ao gerar gráfico.")
         finally:
-            self.after(0, lambda: self.plot_button.configure(state="normal"))
+            self.post(lambda: self.plot_button.configure(state="normal"))
             
     # --- Atualizar Lista de Repositórios ---
-    def update_repo_list(self, repos: List[Repository]) -> None:
+    def update_repo_list(self, repos: List[RepoSummary]) -> None:
         """(UI Thread) Atualiza a Listbox com os repositórios."""
+        self.repo_map = {repo.name: repo for repo in repos}
+        index = self.repo_search_index
+        # No fim da carga progressiva os nomes são os mesmos: mantém os trigramas já montados
+        if len(index) != len(self.repo_map) or not all(name in index for name in self.repo_map):
+            self.repo_search_index = repo_index.RepoIndex(self.repo_map)
+            self._schedule_index_build()
+
+        self.set_status(f"✓ {len(repos)} repositórios carregados.")
+        self.filter_repositories()  # Aplica filtro de busca se houver
+
+        # A API devolve a lista ordenada por atualização: pré-carrega os primeiros
+        self.prefetch_issues(repos[:self.ISSUE_PREFETCH_TOP])
+
+    def clear_repo_list(self) -> None:
+        """(UI Thread) Esvazia a lista antes de uma carga progressiva."""
         self.repo_listbox.delete(0, "end")
         self.repo_map.clear()
+        self.repo_search_index = repo_index.RepoIndex([])
+        self._visible_repo_names = []
 
+    def append_repos(self, repos: List[RepoSummary]) -> None:
+        """
+        (UI Thread) Acrescenta uma página de repositórios à lista (carga
+        progressiva). Só as linhas novas que passam no filtro entram na
+        Listbox, cada uma na sua posição (sem reordenar nem comparar a lista toda).
+        """
         for repo in repos:
-            self.repo_listbox.insert("end", repo.name)
             self.repo_map[repo.name] = repo
-
-        self.set_status(f"✓ {len(repos)} repositórios carregados.")
-        self.filter_repositories()  # Aplica filtro de busca se houver
+        added = self.repo_search_index.add(repo.name for repo in repos)
+        term = self.search_entry.get().lower()
+        shown = [name for name in added if term in name.lower()]
+        if shown:
+            visible = self._visible_repo_names[:]  # Pode ser uma lista guardada no índice
+            for name in shown:
+                position = bisect.bisect_left(visible, name)
+                visible.insert(position, name)
+                self.repo_listbox.insert(position, name)
+            self._visible_repo_names = visible
+        self._schedule_index_build()
+        self.set_progress(f"⬇️ {len(self.repo_map)} repositórios recebidos...")
+
+    def _schedule_index_build(self) -> None:
+        """(UI Thread) Monta os trigramas da busca em fatias, entre os eventos da janela."""
+        if self._index_after_id is None and self.repo_search_index.pending:
+            self._index_after_id = self.after(self.INDEX_SLICE_GAP_MS, self._build_index_slice)
+
+    def _build_index_slice(self) -> None:
+        self._index_after_id = None
+        if self.repo_search_index.index_pending():
+            self._schedule_index_build()
 
     # --- Criar Repositório ---
     def start_create_repo(self) -> None:
@@ -704,40 +1470,33 @@ class GitHubApp(ctk.CTk):
 
         # <- ADICIONADO add_readme
         self.run_in_thread(self.create_repo, repo_name,
-                           description, is_private, add_readme, self.github_user)
+                           description, is_private, add_readme,
+                           name=f"Criar {repo_name}")
 
     # <- ADICIONADO add_readme
-    def create_repo(self, name: str, description: str, is_private: bool, add_readme: bool, user: AuthenticatedUser) -> None:  # type: ignore
+    def create_repo(self, name: str, description: str, is_private: bool, add_readme: bool) -> None:
         """(Worker Thread) Cria o novo repositório no GitHub."""
         try:
-            user.create_repo(
-                name=name,
-                description=description if description else NotSet,
-                private=is_private,
-                auto_init=add_readme  # <- ADICIONADO
-            )
+            self._require_service().create_repo(
+                name, description, private=is_private, auto_init=add_readme)  # <- ADICIONADO
 
-            self.after(
-                0, self.set_status, f"✓ Repositório '{name}' criado com sucesso!")
-            self.after(0, self.repo_name_entry.delete, 0, "end")
-            self.after(0, self.repo_desc_entry.delete, 0, "end")
-            self.after(
-                0, messagebox.showinfo, "Sucesso", f"Repositório '{name}' criado!")
+            self.set_status(f"✓ Repositório '{name}' criado com sucesso!")
+            self.post(self.repo_name_entry.delete, 0, "end")
+            self.post(self.repo_desc_entry.delete, 0, "end")
+            self.post(messagebox.showinfo, "Sucesso", f"Repositório '{name}' criado!")
 
             # Recarrega repositórios
-            self.after(1000, self.start_connect_and_load)
+            self.post(self.after, 1000, self.start_connect_and_load)
 
-        except GithubException as e:
-            self.after(0, messagebox.showerror,
-                       "Erro", f"Falha ao criar repositório: {str(e)}")
-            self.after(0, self.set_status, "✗ Erro ao criar repositório.")
+        except github.GithubException as e:
+            self.post(messagebox.showerror,
+                      "Erro", f"Falha ao criar repositório: {str(e)}")
+            self.set_status("✗ Erro ao criar repositório.")
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Erro inesperado: {e}")
-            self.after(0, self.set_status, "✗ Erro ao criar repositório.")
+            self.post(messagebox.showerror, "Erro", f"Erro inesperado: {e}")
+            self.set_status("✗ Erro ao criar repositório.")
         finally:
-            self.after(
-                0, lambda: self.create_repo_button.configure(state="normal"))
+            self.post(lambda: self.create_repo_button.configure(state="normal"))
 
     # --- Deletar Repositório ---
     def start_delete_repo(self) -> None:
@@ -754,31 +1513,29 @@ class GitHubApp(ctk.CTk):
 
         if confirm:
             self.set_status(f"🗑️ Excluindo '{repo.name}'...")
-            self.run_in_thread(self.delete_repo, repo)
+            self.run_in_thread(self.delete_repo, repo, name=f"Apagar {repo.name}")
 
-    def delete_repo(self, repo: GitHubRepository) -> None:
+    def _on_repo_deleted(self, repo: RepoSummary) -> None:
+        """(UI Thread) Limpa a seleção se for o repo excluído e recarrega a lista."""
+        if self.current_repo_object == repo:
+            self.current_repo_object = None
+        self.after(1000, self.start_connect_and_load)
+
+    def delete_repo(self, repo: RepoSummary) -> None:
         """(Worker Thread) Exclui o repositório do GitHub."""
         try:
             repo_name = repo.name
-            repo.delete()
-            self.after(
-                0, self.set_status, f"✓ Repositório '{repo_name}' excluído.")
-            self.after(
-                0, messagebox.showinfo, "Sucesso", f"Repositório '{repo_name}' excluído!")
-
-            # Limpa a seleção atual se for o repo excluído
-            if self.current_repo_object == repo:
-                self.current_repo_object = None
-
-            self.after(1000, self.start_connect_and_load)
-
-        except GithubException as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Falha ao excluir: {str(e)}")
-            self.after(0, self.set_status, "✗ Erro ao excluir repositório.")
+            self._require_service().delete_repo(repo.full_name)
+            self.set_status(f"✓ Repositório '{repo_name}' excluído.")
+            self.post(messagebox.showinfo, "Sucesso", f"Repositório '{repo_name}' excluído!")
+
+            self.post(self._on_repo_deleted, repo)
+
+        except github.GithubException as e:
+            self.post(messagebox.showerror, "Erro", f"Falha ao excluir: {str(e)}")
+            self.set_status("✗ Erro ao excluir repositório.")
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Erro inesperado: {e}")
+            self.post(messagebox.showerror, "Erro", f"Erro inesperado: {e}")
 
     # --- Abrir no Navegador ---
     def start_open_repo_in_browser(self) -> None:
@@ -801,46 +1558,228 @@ class GitHubApp(ctk.CTk):
         self.current_repo_object = self.repo_map.get(repo_name)
 
         if self.current_repo_object:
-            self.set_status(f"📋 Carregando tarefas de '{repo_name}'...")
-            self.update_issue_list([])  # Limpa a caixa de issues
-            self.run_in_thread(self.get_issues, self.current_repo_object)
+            entry = self.issue_cache.get(self.current_repo_object.full_name)
+            if entry is not None:
+                # Mostra o cache na hora; se expirou, revalida em segundo plano
+                self._cancel_issue_request()
+                self.update_issue_list(entry.issues)
+                if not self.issue_cache.is_fresh(entry):
+                    self._start_get_issues(self.current_repo_object)
+            else:
+                self.set_status(f"📋 Carregando tarefas de '{repo_name}'...")
+                self.begin_issue_list("⏳ Carregando tarefas...\n")  # Limpa a caixa de issues
+                self._start_get_issues(self.current_repo_object, stream=True)
+            self._prefetch_neighbors(repo_name)
+
+    def _cancel_issue_request(self) -> None:
+        """(UI Thread) Cancela o carregamento de issues em curso (se houver)."""
+        if self._issue_request:
+            self._issue_request.cancel()
+            self._issue_request = None
+
+    def _new_issue_request(self) -> CancelToken:
+        """(UI Thread) Cancela o pedido anterior e cria o token do novo pedido."""
+        self._cancel_issue_request()
+        self._issue_request = CancelToken()
+        return self._issue_request
+
+    def _start_get_issues(self, repo: RepoSummary, stream: bool = False) -> None:
+        """(UI Thread) Agenda o carregamento de issues com prioridade máxima."""
+        token = self._new_issue_request()
+        self.run_in_thread(self.get_issues, repo, token, stream, priority=tasks.PRIORITY_HIGH,
+                           name=f"Issues de {repo.name}", token=token)
+
+    def _reload_issues(self, repo: RepoSummary) -> None:
+        """(UI Thread) Recarrega as issues de `repo` só se ele ainda estiver selecionado."""
+        if self.current_repo_object == repo:
+            self._start_get_issues(repo)
+
+    def _is_stale(self, token: Optional[CancelToken]) -> bool:
+        """(UI Thread) True se o resultado pertence a uma seleção antiga."""
+        return token is not None and (token.cancelled or token is not self._issue_request)
+
+    def _deliver_issues(self, token: Optional[CancelToken], issues: List[IssueSummary],
+                        unchanged: bool) -> None:
+        """(UI Thread) Mostra a lista completa só se o pedido ainda for o atual."""
+        if self._is_stale(token):
+            return  # Resultado de uma seleção antiga: descarta
+        self._issue_request = None
+        if not unchanged:
+            self.update_issue_list(issues)
+
+    def _deliver_issue_page(self, token: Optional[CancelToken], issues: List[IssueSummary]) -> None:
+        """(UI Thread) Acrescenta uma página recebida (carga em streaming)."""
+        if not self._is_stale(token):
+            self.append_issues(issues)
+
+    def _finish_issue_stream(self, token: Optional[CancelToken], repo: RepoSummary,
+                             total: int) -> None:
+        """(UI Thread) Fim da carga em streaming: status e lista vazia."""
+        if self._is_stale(token):
+            return
+        self._issue_request = None
+        if not total:
+            self.begin_issue_list("Nenhuma tarefa aberta encontrada.\n")
+        self.set_status(f"✓ {total} tarefas carregadas de '{repo.name}'.")
+
+    @tracing.traced()
+    def get_issues(self, repo: RepoSummary, token: Optional[CancelToken] = None,
+                   stream: bool = False) -> None:
+        """
+        (Worker Thread) Carrega as issues do repositório selecionado (com cache).
+        Com `stream`, cada página vai para a tela assim que chega; sem ele, a
+        lista só é substituída no fim (e apenas se algo mudou).
+        """
+        try:
+            on_page = None
+            if stream:
+                on_page = lambda page: self.post(self._deliver_issue_page, token, page)
+            issues, unchanged = self._require_service().list_issues(
+                repo.full_name, cancel=token, on_page=on_page)
+            if token and token.cancelled:
+                return
+            if stream:
+                self.post(self._finish_issue_stream, token, repo, len(issues))
+            else:
+                self.post(self._deliver_issues, token, issues, unchanged)
+        except Cancelled:
+            return  # Outra seleção substituiu este pedido
+        except rate_limit.RateLimitExceeded as e:
+            if not (token and token.cancelled):
+                self.set_status(f"⏳ Tarefas de '{repo.name}' não carregadas: {e}")
+        except (github.GithubException, github_rest.RestError) as e:
+            if token and token.cancelled:
+                return  # Erro de um pedido antigo: não incomoda o utilizador
+            self.post(messagebox.showerror,
+                      "Erro", f"Não foi possível carregar as Issues: {str(e)}")
+            self.set_status("✗ Erro ao carregar issues.")
+        except Exception as e:
+            self.post(messagebox.showerror, "Erro", f"Erro inesperado: {e}")
+            self.set_status("✗ Erro ao carregar issues.")
 
-    def get_issues(self, repo: GitHubRepository) -> None:
-        """(Worker Thread) Carrega as issues do repositório selecionado."""
+    def _prefetch_neighbors(self, repo_name: str) -> None:
+        """(UI Thread) Pré-carrega as issues dos repositórios vizinhos na lista."""
+        try:
+            position = self._visible_repo_names.index(repo_name)
+        except ValueError:
+            return
+        first = max(0, position - self.ISSUE_PREFETCH_NEIGHBORS)
+        names = self._visible_repo_names[first:position + self.ISSUE_PREFETCH_NEIGHBORS + 1]
+        self.prefetch_issues([self.repo_map[name] for name in names
+                              if name != repo_name and name in self.repo_map])
+
+    def prefetch_issues(self, repos: List[RepoSummary]) -> None:
+        """Agenda o carregamento em segundo plano das issues que não estão no cache."""
+        if not self.service:
+            return
+        for repo in repos:
+            with self._prefetch_lock:
+                if repo.full_name in self._prefetching or \
+                        self.issue_cache.get_fresh(repo.full_name) is not None:
+                    continue
+                self._prefetching.add(repo.full_name)
+            self.run_in_thread(self._prefetch_worker, repo, lane=tasks.BACKGROUND,
+                               priority=tasks.PRIORITY_LOW, name=f"Pré-carregar {repo.name}")
+
+    def _prefetch_worker(self, repo: RepoSummary) -> None:
+        """(Worker Thread) Carrega as issues de um repositório só para o cache."""
         try:
-            issues = list(repo.get_issues(state="open"))
-            self.after(0, self.update_issue_list, issues)
-        except GithubException as e:
-            self.after(0, messagebox.showerror,
-                       "Erro", f"Não foi possível carregar as Issues: {str(e)}")
-            self.after(0, self.set_status, "✗ Erro ao carregar issues.")
+            self._require_service().list_issues(repo.full_name)
+        except rate_limit.RateLimitExceeded:
+            pass  # Quota guardada para os cliques do utilizador: tenta noutra altura
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Erro inesperado: {e}")
-            self.after(0, self.set_status, "✗ Erro ao carregar issues.")
+            print(f"Pré-carregamento de issues falhou ({repo.full_name}): {e}")
+        finally:
+            with self._prefetch_lock:
+                self._prefetching.discard(repo.full_name)
+
+    def update_issue_list(self, issues: List[IssueSummary]) -> None:
+        """(UI Thread) Substitui a lista de issues (a renderização é feita em lotes)."""
+        self.begin_issue_list("" if issues else "Nenhuma tarefa aberta encontrada.\n")
+        self.append_issues(issues)
+
+        if self.current_repo_object:
+            self.set_status(
+                f"✓ {len(issues)} tarefas carregadas de '{self.current_repo_object.name}'.")
+
+    # --- Renderização das Issues (em lotes, sem travar a UI) ---
+    def begin_issue_list(self, placeholder: str = "") -> None:
+        """(UI Thread) Limpa a caixa de issues; `placeholder` some no primeiro lote."""
+        if self._issue_render_after_id:
+            self.after_cancel(self._issue_render_after_id)
+            self._issue_render_after_id = None
+        self._issue_buffer = []
+        self._issues_rendered = 0
+        self._issue_render_limit = self.ISSUE_RENDER_LIMIT
 
-    def update_issue_list(self, issues: List[Any]) -> None:
-        """(UI Thread) Atualiza a Textbox com a lista de issues."""
         self.issue_textbox.configure(state="normal")
         self.issue_textbox.delete("1.0", "end")
+        if placeholder:
+            self.issue_textbox.insert("end", placeholder, "placeholder")
+        self.issue_textbox.configure(state="disabled")
 
-        if not issues:
-            self.issue_textbox.insert("end", "Nenhuma tarefa aberta encontrada.\n")
-        else:
-            for issue in issues:
-                text = f"#{issue.number} - {issue.title}\n"
-                text += f"  Por: {issue.user.login} | Criado: {issue.created_at.strftime('%d/%m/%Y')}\n"
-                if issue.labels:
-                    labels = ", ".join([l.name for l in issue.labels])
-                    text += f"  Labels: {labels}\n"
-                text += "  " + "-" * 60 + "\n\n"
-                self.issue_textbox.insert("end", text)
+    def append_issues(self, issues: List[IssueSummary]) -> None:
+        """(UI Thread) Acrescenta issues ao fim da lista (ex: uma página que chegou)."""
+        self._issue_buffer.extend(issues)
+        if self._issue_render_after_id is None:
+            self._issue_render_after_id = self.after(1, self._render_issue_batch)
+
+    def _format_issue(self, issue: IssueSummary) -> str:
+        created = datetime.fromisoformat(issue.created_at).strftime('%d/%m/%Y')
+        text = f"#{issue.number} - {issue.title}\n"
+        text += f"  Por: {issue.user_login} | Criado: {created}\n"
+        if issue.labels:
+            labels = ", ".join(issue.labels)
+            text += f"  Labels: {labels}\n"
+        text += "  " + "-" * 60 + "\n\n"
+        return text
+
+    def _render_issue_batch(self) -> None:
+        """
+        (UI Thread) Insere o próximo lote de issues com uma única chamada ao Tk.
+        Cada lote é pequeno (ISSUE_RENDER_BATCH) para não segurar o loop
+        principal; o resto é agendado para o próximo ciclo.
+        """
+        self._issue_render_after_id = None
+        target = min(len(self._issue_buffer), self._issue_render_limit)
+        end = min(target, self._issues_rendered + self.ISSUE_RENDER_BATCH)
+
+        textbox = self.issue_textbox
+        textbox.configure(state="normal")
+        for tag in ("placeholder", "load_more"):
+            ranges = textbox.tag_ranges(tag)
+            if ranges:
+                textbox.delete(ranges[0], ranges[-1])
+        if end > self._issues_rendered:
+            batch = self._issue_buffer[self._issues_rendered:end]
+            textbox.insert("end", "".join(self._format_issue(issue) for issue in batch))
+            self._issues_rendered = end
+
+        remaining = len(self._issue_buffer) - self._issues_rendered
+        if remaining and self._issues_rendered >= self._issue_render_limit:
+            textbox.insert(
+                "end", f"⬇️ Mais {remaining} tarefas: role até aqui ou clique para carregar\n",
+                "load_more")
+        textbox.configure(state="disabled")
+
+        if self._issues_rendered < target:
+            self._issue_render_after_id = self.after(1, self._render_issue_batch)
+
+    def load_more_issues(self, event: Optional[Any] = None) -> None:
+        """(UI Thread) Mostra mais ISSUE_RENDER_LIMIT issues das já recebidas."""
+        if self._issues_rendered >= len(self._issue_buffer):
+            return
+        self._issue_render_limit = self._issues_rendered + self.ISSUE_RENDER_LIMIT
+        if self._issue_render_after_id is None:
+            self._issue_render_after_id = self.after(1, self._render_issue_batch)
 
-        self.issue_textbox.configure(state="disabled")
+    def _on_issue_scroll(self, event: Optional[Any] = None) -> None:
+        """(UI Thread) Ao chegar perto do fim da caixa, carrega mais issues."""
+        self.after_idle(self._check_issue_scroll)
 
-        if self.current_repo_object:
-            self.set_status(
-                f"✓ {len(issues)} tarefas carregadas de '{self.current_repo_object.name}'.")
+    def _check_issue_scroll(self) -> None:
+        if self.issue_textbox.yview()[1] >= 0.98:
+            self.load_more_issues()
 
     # --- Criar Issue ---
     def start_create_issue(self) -> None:
@@ -858,35 +1797,102 @@ class GitHubApp(ctk.CTk):
 
         self.set_status(f"✏️ Criando tarefa '{title}'...")
         self.create_issue_button.configure(state="disabled")
-        self.run_in_thread(self.create_issue, repo, title, body)
+        self.run_in_thread(self.create_issue, repo, title, body, name=f"Criar tarefa em {repo.name}")
 
-    def create_issue(self, repo: GitHubRepository, title: str, body: str) -> None:
+    def create_issue(self, repo: RepoSummary, title: str, body: str) -> None:
         """(Worker Thread) Cria a nova issue no repositório."""
         try:
-            repo.create_issue(title=title, body=body if body else NotSet)
-            self.after(0, self.set_status, f"✓ Tarefa '{title}' criada!")
-            self.after(0, self.issue_title_entry.delete, 0, "end")
-            self.after(0, self.issue_body_text.delete, "1.0", "end")
-            self.after(
-                0, messagebox.showinfo, "Sucesso", f"Tarefa '{title}' criada!")
-
-            # Recarrega issues
-            self.after(500, self.get_issues, repo)
-
-        except GithubException as e:
-            self.after(0, messagebox.showerror,
-                       "Erro", f"Falha ao criar tarefa: {str(e)}")
-            self.after(0, self.set_status, "✗ Erro ao criar tarefa.")
+            self._require_service().create_issue(repo.full_name, title, body)
+            self.set_status(f"✓ Tarefa '{title}' criada!")
+            self.post(self.issue_title_entry.delete, 0, "end")
+            self.post(self.issue_body_text.delete, "1.0", "end")
+            self.post(messagebox.showinfo, "Sucesso", f"Tarefa '{title}' criada!")
+
+            # Recarrega issues (o serviço já invalidou a entrada em cache)
+            self.post(self.after, 500, self._reload_issues, repo)
+
+        except github.GithubException as e:
+            self.post(messagebox.showerror,
+                      "Erro", f"Falha ao criar tarefa: {str(e)}")
+            self.set_status("✗ Erro ao criar tarefa.")
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Erro inesperado: {e}")
+            self.post(messagebox.showerror, "Erro", f"Erro inesperado: {e}")
         finally:
-            self.after(
-                0, lambda: self.create_issue_button.configure(state="normal"))
+            self.post(lambda: self.create_issue_button.configure(state="normal"))
+
+    # --- Progresso e pastas das operações git ---
+    def _git_progress(self, prefix: str) -> git_progress.OnProgress:
+        """
+        (Worker Thread) Callback de progresso do git para a tarefa atual: a
+        fase, MB/s e ETA vão para a barra de status (sem log) e para a linha
+        da tarefa no painel. Já chega limitado a poucas chamadas por segundo.
+        """
+        task = tasks.current_task()
+
+        def on_progress(snapshot: git_progress.ProgressSnapshot) -> None:
+            text = snapshot.text()
+            if task is not None:
+                task.progress = text
+            self.set_progress(f"{prefix} {text}")
+        return on_progress
+
+    def _claim_path(self, path: Any) -> bool:
+        """
+        (UI Thread) Reserva a pasta para uma operação git. Se já há outra na
+        mesma pasta (ou numa pasta que a contém), não começa trabalho em dobro.
+        """
+        path = Path(path).resolve()
+        busy = next((other for other in self._busy_paths
+                     if path.is_relative_to(other) or other.is_relative_to(path)), None)
+        if busy is not None:
+            self.set_status(f"⏳ Já há uma operação git em curso em {busy} "
+                            "(acompanhe em 🧵 Tarefas em curso).")
+            return False
+        self._busy_paths.add(path)
+        return True
+
+    def _release_path(self, path: Any) -> None:
+        """(UI Thread) Liberta a pasta reservada por `_claim_path`."""
+        self._busy_paths.discard(Path(path).resolve())
 
     # --- Clonar Repositório ---
+    def _get_mirror_store(self) -> Optional[mirror_store.MirrorStore]:
+        """Espelhos locais, se a opção estiver ligada (criados no primeiro uso)."""
+        if not self.use_mirror_var.get():
+            return None
+        if self._mirror_store is None:
+            self._mirror_store = mirror_store.MirrorStore(
+                self.CACHE_DIR / mirror_store.MIRRORS_DIR_NAME, self.MIRROR_QUOTA_BYTES)
+        return self._mirror_store
+
+    def _schedule_mirror_refresh(self) -> None:
+        """(UI Thread) De tempos a tempos, atualiza os espelhos antigos em segundo plano."""
+        if self._mirror_store is not None:
+            self.run_in_thread(self._mirror_store.refresh_stale, lane=tasks.BACKGROUND,
+                               priority=tasks.PRIORITY_LOW, name="Atualizar espelhos")
+        self.after(self.MIRROR_REFRESH_MS, self._schedule_mirror_refresh)
+
+    def on_clone_mode_change(self, label: str) -> None:
+        """(UI Thread) Troca o modo dos próximos clones (preset ou personalizado)."""
+        if label == self.CLONE_MODE_CUSTOM:
+            options = CloneOptionsDialog(self, self.clone_options).get_choice()
+            if options is not None:
+                self.clone_options = options
+        else:
+            self.clone_options = next(
+                clone_options.preset(name) for name, (preset_label, _) in clone_options.PRESETS.items()
+                if preset_label == label)
+        # Mostra o preset equivalente (ou "Personalizado...") e o que o modo faz
+        name = clone_options.preset_name(self.clone_options)
+        self.clone_mode_menu.set(clone_options.PRESETS[name][0] if name else self.CLONE_MODE_CUSTOM)
+        self.set_status(f"⚙️ Modo do clone: {self.clone_options.describe()}")
+
     def start_clone_repo(self) -> None:
-        """(UI Thread) Inicia o clone de um repositório."""
+        """(UI Thread) Inicia o clone do repositório selecionado (ou dos vários, em lote)."""
+        selected = self._get_selected_repos()
+        if len(selected) > 1:
+            self.start_bulk_clone(selected)
+            return
         repo = self._get_selected_repo()
         if not repo:
             return
@@ -896,43 +1902,104 @@ class GitHubApp(ctk.CTk):
         if not local_path_str:
             return
 
+        if not self._claim_path(Path(local_path_str) / repo.name):
+            return
         self.set_status(f"⬇️ Clonando '{repo.name}'...")
         self.clone_button.configure(state="disabled")
-        self.run_in_thread(self.clone_repo, repo, Path(local_path_str))
+        self.run_in_thread(self.clone_repo, repo, Path(local_path_str), self.clone_options,
+                           self._get_mirror_store(), lane=tasks.BULK, name=f"Clonar {repo.name}")
 
-    def clone_repo(self, repo: GitHubRepository, local_path: Path) -> None:
+    @tracing.traced()
+    def clone_repo(self, repo: RepoSummary, local_path: Path,
+                   options: Optional[clone_options.CloneOptions] = None,
+                   mirrors: Optional[mirror_store.MirrorStore] = None) -> None:
         """(Worker Thread) Clona o repositório e pergunta se quer abrir no IDE."""
         try:
-            destination = local_path / repo.name
-
-            if destination.exists():
-                self.after(
-                    0, messagebox.showerror, "Erro", f"A pasta '{repo.name}' já existe em {local_path}")
-                return
-
-            self.after(
-                0, self.set_status, f"⬇️ Clonando para {destination}...")
-            git.Repo.clone_from(repo.clone_url, str(destination))
-
-            self.after(
-                0, self.set_status, f"✓ Repositório clonado em: {destination}")
-            self.after(0, messagebox.showinfo, "Sucesso",
-                       f"Repositório clonado com sucesso!\n\nLocalização: {destination}")
+            destination = services.clone_repo(repo.clone_url, local_path / repo.name,
+                                              report=self.set_status, options=options,
+                                              mirrors=mirrors,
+                                              on_progress=self._git_progress(f"⬇️ {repo.name}:"))
+
+            self.set_status(f"✓ Repositório clonado em: {destination}")
+            if mirrors is None:
+                downloaded = clone_options.downloaded_bytes(destination)
+                full_kb = None if options is None or options.is_full else repo.size_kb
+                self.set_status(f"💾 {clone_options.savings_text(downloaded, full_kb)}")
+            self.post(messagebox.showinfo, "Sucesso",
+                      f"Repositório clonado com sucesso!\n\nLocalização: {destination}")
 
             # Pergunta se quer abrir no IDE
-            self.after(100, self.prompt_open_ide, str(destination))
+            self.post(self.after, 100, self.prompt_open_ide, str(destination))
 
+        except services.ServiceError as e:
+            self.post(messagebox.showerror, "Erro", str(e))
         except git.GitCommandError as e:
-            self.after(
-                0, messagebox.showerror, "Erro de Git", f"Falha ao clonar:\n{e}")
-            self.after(0, self.set_status, "✗ Erro ao clonar repositório.")
+            self.post(messagebox.showerror, "Erro de Git", f"Falha ao clonar:\n{e}")
+            self.set_status("✗ Erro ao clonar repositório.")
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Erro inesperado: {e}")
-            self.after(0, self.set_status, "✗ Erro ao clonar.")
+            self.post(messagebox.showerror, "Erro", f"Erro inesperado: {e}")
+            self.set_status("✗ Erro ao clonar.")
         finally:
-            self.after(
-                0, lambda: self.clone_button.configure(state="normal"))
+            self.post(lambda: self.clone_button.configure(state="normal"))
+            self.post(self._release_path, local_path / repo.name)
+
+    # --- Clone em lote ---
+    def start_bulk_clone(self, repos: List[RepoSummary]) -> None:
+        """(UI Thread) Pergunta as opções e clona vários repositórios em paralelo."""
+        choice = BulkCloneDialog(self, len(repos), self._bulk_clone_jobs).get_choice()
+        if not choice:
+            return
+        dest, jobs, if_exists = choice
+        self._bulk_clone_jobs = jobs
+        if not self._claim_path(dest):
+            return
+        self.set_status(f"⬇️ Clonando {len(repos)} repositórios ({jobs} em paralelo)...")
+        self.clone_button.configure(state="disabled")
+        # O mesmo token vai para a tarefa: cancelar no painel para os clones que faltam
+        token = CancelToken()
+        self.run_in_thread(self.bulk_clone_repos, repos, dest, jobs, if_exists, token,
+                           self.clone_options, self._get_mirror_store(),
+                           lane=tasks.BULK, name=f"Clonar {len(repos)} repositórios", token=token)
+
+    @tracing.traced()
+    def bulk_clone_repos(self, repos: List[RepoSummary], dest: Path, jobs: int,
+                         if_exists: str, token: CancelToken,
+                         options: Optional[clone_options.CloneOptions] = None,
+                         mirrors: Optional[mirror_store.MirrorStore] = None) -> None:
+        """(Worker Thread) Clona em paralelo; progresso por repositório e resumo no fim."""
+        task = tasks.current_task()
+
+        def on_start(repo: RepoSummary, stats: bulk_clone.BulkCloneStats) -> None:
+            self.set_progress(f"{stats.progress_text()} · {repo.full_name}")
+
+        def on_progress(repo: RepoSummary, snapshot: git_progress.ProgressSnapshot,
+                        stats: bulk_clone.BulkCloneStats) -> None:
+            if task is not None:
+                task.progress = stats.live_text()
+            self.set_progress(f"{stats.progress_text()} · {repo.name}: {snapshot.text()}")
+
+        def on_result(result: bulk_clone.CloneResult, stats: bulk_clone.BulkCloneStats) -> None:
+            if result.status == bulk_clone.FAILED:
+                self.set_status(f"✗ {result.full_name}: {result.error}")
+            elif result.status != bulk_clone.CANCELLED:
+                self.set_status(f"✓ {result.full_name} {result.status} "
+                                f"({result.bytes / 1024 ** 2:.1f} MB, {result.seconds:.1f}s)")
+            self.set_progress(stats.progress_text())
+
+        try:
+            stats = bulk_clone.clone_many(repos, dest, jobs, if_exists, on_start=on_start,
+                                          on_result=on_result, token=token, options=options,
+                                          mirrors=mirrors, on_progress=on_progress)
+            failed = stats.count(bulk_clone.FAILED)
+            self.set_status(f"{'✗' if failed else '✓'} Clone em lote: {stats.summary().splitlines()[0]}")
+            show = messagebox.showwarning if failed else messagebox.showinfo
+            self.post(show, "Clone em lote", f"Destino: {dest}\n\n{stats.summary()}")
+        except Exception as e:
+            self.post(messagebox.showerror, "Erro", f"Erro no clone em lote: {e}")
+            self.set_status("✗ Erro no clone em lote.")
+        finally:
+            self.post(lambda: self.clone_button.configure(state="normal"))
+            self.post(self._release_path, dest)
 
     # --- Conectar Pasta Local e Fazer Push ---
     def start_link_local_repo(self) -> None:
@@ -947,81 +2014,73 @@ class GitHubApp(ctk.CTk):
             self.set_status("Operação cancelada.")
             return
 
+        if not self._claim_path(local_path):
+            return
         self.current_local_path = local_path
-        self.set_status(f"🔗 Conectando e enviando pasta local para '{repo.name}'...")
+        self.set_status(f"🔎 Analisando '{local_path}' (git status)...")
         # ALTERADO: Desativa o botão de Push (antigo pull_button)
         self.pull_button.configure(state="disabled")
-        self.run_in_thread(self.link_local_repo, repo, local_path)
+        self.run_in_thread(self.scan_local_repo, repo, local_path,
+                           lane=tasks.BULK, name=f"Analisar {Path(local_path).name}")
 
-    def link_local_repo(self, repo_remote: GitHubRepository, local_path: str) -> None:
+    @tracing.traced()
+    def scan_local_repo(self, repo_remote: RepoSummary, local_path: str) -> None:
+        """(Worker Thread) Uma passagem de `git status`; a revisão abre na UI thread."""
+        try:
+            plan = staging.scan(local_path)
+            lfs_available = lfs.version() is not None  # Subprocesso: fora da UI thread
+        except Exception as e:
+            self.post(messagebox.showerror, "Erro", f"Falha ao analisar a pasta:\n{e}")
+            self.set_status("✗ Erro ao analisar a pasta local.")
+            self.post(lambda: self.pull_button.configure(state="normal"))
+            self.post(self._release_path, local_path)
+            return
+        self.set_status(f"📋 {plan.summary().splitlines()[0]}")
+        self.post(self._review_push, repo_remote, local_path, plan, lfs_available)
+
+    def _review_push(self, repo_remote: RepoSummary, local_path: str,
+                     plan: staging.StagePlan, lfs_available: bool = False) -> None:
+        """(UI Thread) Mostra o resumo do push e, se confirmado, envia."""
+        choice = PushReviewDialog(self, repo_remote.name, plan, lfs_available).get_choice()
+        if not choice:
+            staging.discard(plan)  # Não deixa um `git init` numa pasta que não era repositório
+            self.set_status("Operação cancelada.")
+            self.pull_button.configure(state="normal")
+            self._release_path(local_path)
+            return
+        gitignore, exclude, lfs_options = choice
+        self.set_status(f"🔗 Conectando e enviando pasta local para '{repo_remote.name}'...")
+        self.run_in_thread(self.link_local_repo, repo_remote, local_path, plan, gitignore,
+                           tuple(exclude), lfs_options,
+                           lane=tasks.BULK, name=f"Push para {repo_remote.name}")
+
+    @tracing.traced()
+    def link_local_repo(self, repo_remote: RepoSummary, local_path: str,
+                        plan: Optional[staging.StagePlan] = None, gitignore: bool = False,
+                        exclude: Tuple[str, ...] = (),
+                        lfs_options: Optional[lfs.LfsOptions] = None) -> None:
         """(Worker Thread) Conecta a pasta local ao repositório e faz push."""
-        branch_name: str = "main"
-
         try:
-            repo_local = git.Repo.init(local_path)
-            origin_url = repo_remote.clone_url
-
-            # Configura remote origin
-            if "origin" in [r.name for r in repo_local.remotes]:
-                origin = repo_local.remotes.origin
-                origin.set_url(origin_url)
-            else:
-                origin = repo_local.create_remote("origin", origin_url)
-
-            # Adiciona todos os arquivos
-            self.after(
-                0, self.set_status, "📝 Adicionando arquivos (git add)...")
-            repo_local.git.add(all=True)
-
-            # Commit (apenas se houver mudanças)
-            if repo_local.is_dirty(untracked_files=True):
-                self.after(0, self.set_status, "💾 Criando commit...")
-                repo_local.index.commit("Commit via Gestor GitHub")
-            else:
-                self.after(
-                    0, self.set_status, "ℹ️ Nenhuma mudança para commitar. Prosseguindo...")
-
-            # Determina o branch atual
-            try:
-                branch_name = repo_local.active_branch.name
-            except TypeError:
-                # Se não houver branch (repo novo), cria 'main'
-                repo_local.git.branch("-M", branch_name)
-
-            # Push
-            self.after(
-                0, self.set_status, f"⬆️ Enviando branch '{branch_name}' para o GitHub...")
-            repo_local.git.push("--set-upstream", "origin", branch_name)
-
-            self.after(
-                0, self.set_status, "✓ Sucesso! Pasta local conectada e enviada.")
-            self.after(0, messagebox.showinfo, "Sucesso",
-                       "Seus arquivos foram enviados para o GitHub com sucesso!")
-
+            services.push_local(local_path, repo_remote.clone_url, report=self.set_status,
+                                on_progress=self._git_progress("⬆️ Push:"), plan=plan,
+                                exclude=exclude, gitignore=gitignore, lfs_options=lfs_options)
+            self.set_status("✓ Sucesso! Pasta local conectada e enviada.")
+            self.post(messagebox.showinfo, "Sucesso",
+                      "Seus arquivos foram enviados para o GitHub com sucesso!")
+
+        except services.ServiceError as e:
+            self.post(messagebox.showerror, "Erro", str(e))
+            self.set_status(f"✗ {e}")
         except git.GitCommandError as e:
-            # Tenta lidar com o erro comum 'main' vs 'master'
-            if "src refspec main does not match any" in str(e) and branch_name == "main":
-                self.after(
-                    0, self.set_status, "ℹ️ 'main' falhou, tentando 'master'...")
-                repo_local = git.Repo(local_path)
-                repo_local.git.branch("-M", "master")
-                repo_local.git.push("--set-upstream", "origin", "master")
-                self.after(
-                    0, self.set_status, "✓ Sucesso! Pasta local conectada e enviada.")
-                self.after(0, messagebox.showinfo, "Sucesso",
-                           "Seus arquivos foram enviados para o GitHub com sucesso!")
-            else:
-                self.after(
-                    0, messagebox.showerror, "Erro de Git", f"Um comando Git falhou:\n{e}")
-                self.after(0, self.set_status,
-                           "✗ Erro durante operação do Git.")
+            self.post(messagebox.showerror, "Erro de Git", f"Um comando Git falhou:\n{e}")
+            self.set_status("✗ Erro durante operação do Git.")
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Ocorreu um erro inesperado:\n{e}")
-            self.after(0, self.set_status, "✗ Erro inesperado.")
+            self.post(messagebox.showerror, "Erro", f"Ocorreu um erro inesperado:\n{e}")
+            self.set_status("✗ Erro inesperado.")
         finally:
             # ALTERADO: Reativa o botão de Push (antigo pull_button)
-            self.after(0, lambda: self.pull_button.configure(state="normal"))
+            self.post(lambda: self.pull_button.configure(state="normal"))
+            self.post(self._release_path, local_path)
 
     # --- Pull (Atualizar Local) ---
     def start_pull_repo(self) -> None:
@@ -1031,45 +2090,78 @@ class GitHubApp(ctk.CTk):
         if not local_path:
             return
 
+        if not self._claim_path(local_path):
+            return
         self.set_status("⬇️ Atualizando repositório local...")
         # ALTERADO: Desativa o botão de Pull (antigo link_local_button)
         self.link_local_button.configure(state="disabled")
-        self.run_in_thread(self.pull_repo, local_path)
+        self.run_in_thread(self.pull_repo, local_path, lane=tasks.BULK, name="Pull")
 
+    @tracing.traced()
     def pull_repo(self, local_path: str) -> None:
         """(Worker Thread) Faz 'pull' do repositório remoto."""
         try:
-            repo = git.Repo(local_path)
-            if not repo.remotes:
-                self.after(
-                    0, messagebox.showerror, "Erro", "Nenhum remote configurado neste repositório.")
-                return
+            services.pull_repo(local_path, report=self.set_status,
+                               on_progress=self._git_progress("⬇️ Pull:"))
 
-            origin = repo.remotes.origin
-            self.after(0, self.set_status, "⬇️ Baixando atualizações...")
-            origin.pull()
-
-            self.after(
-                0, self.set_status, "✓ Repositório atualizado com sucesso!")
-            self.after(0, messagebox.showinfo, "Sucesso",
-                       "Repositório local atualizado com as últimas mudanças!")
+            self.set_status("✓ Repositório atualizado com sucesso!")
+            self.post(messagebox.showinfo, "Sucesso",
+                      "Repositório local atualizado com as últimas mudanças!")
 
+        except services.ServiceError as e:
+            self.post(messagebox.showerror, "Erro", str(e))
         except git.GitCommandError as e:
-            self.after(
-                0, messagebox.showerror, "Erro de Git", f"Falha ao fazer pull:\n{e}")
-            self.after(0, self.set_status, "✗ Erro ao atualizar repositório.")
+            self.post(messagebox.showerror, "Erro de Git", f"Falha ao fazer pull:\n{e}")
+            self.set_status("✗ Erro ao atualizar repositório.")
         except git.InvalidGitRepositoryError:
-            self.after(0, messagebox.showerror,
-                       "Erro", "A pasta selecionada não é um repositório Git válido.")
-            self.after(0, self.set_status, "✗ Repositório inválido.")
+            self.post(messagebox.showerror,
+                      "Erro", "A pasta selecionada não é um repositório Git válido.")
+            self.set_status("✗ Repositório inválido.")
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Erro inesperado: {e}")
-            self.after(0, self.set_status, "✗ Erro ao atualizar.")
+            self.post(messagebox.showerror, "Erro", f"Erro inesperado: {e}")
+            self.set_status("✗ Erro ao atualizar.")
         finally:
             # ALTERADO: Reativa o botão de Pull (antigo link_local_button)
-            self.after(
-                0, lambda: self.link_local_button.configure(state="normal"))
+            self.post(lambda: self.link_local_button.configure(state="normal"))
+            self.post(self._release_path, local_path)
+
+    # --- Git LFS sob demanda ---
+    def start_fetch_lfs(self) -> None:
+        """(UI Thread) Baixa os binários LFS de um repositório clonado sem eles."""
+        local_path = filedialog.askdirectory(
+            title="Selecione o Repositório Local para Baixar os Binários LFS")
+        if not local_path:
+            return
+
+        if not self._claim_path(local_path):
+            return
+        self.set_status("📦 Procurando ficheiros do Git LFS por baixar...")
+        self.fetch_lfs_button.configure(state="disabled")
+        self.run_in_thread(self.fetch_lfs, local_path, lane=tasks.BULK,
+                           name=f"LFS {Path(local_path).name}")
+
+    @tracing.traced()
+    def fetch_lfs(self, local_path: str) -> None:
+        """(Worker Thread) `git lfs pull` com transferências em paralelo."""
+        try:
+            count = services.fetch_lfs(local_path, report=self.set_status)
+            self.set_status(f"✓ {count} ficheiros do Git LFS baixados.")
+        except services.ServiceError as e:
+            self.post(messagebox.showerror, "Erro", str(e))
+            self.set_status(f"✗ {e}")
+        except git.GitCommandError as e:
+            self.post(messagebox.showerror, "Erro de Git", f"Falha ao baixar do Git LFS:\n{e}")
+            self.set_status("✗ Erro ao baixar os binários LFS.")
+        except git.InvalidGitRepositoryError:
+            self.post(messagebox.showerror,
+                      "Erro", "A pasta selecionada não é um repositório Git válido.")
+            self.set_status("✗ Repositório inválido.")
+        except Exception as e:
+            self.post(messagebox.showerror, "Erro", f"Erro inesperado: {e}")
+            self.set_status("✗ Erro ao baixar os binários LFS.")
+        finally:
+            self.post(lambda: self.fetch_lfs_button.configure(state="normal"))
+            self.post(self._release_path, local_path)
 
     # REMOVIDO: Funções de Importar (start_import_local_folder, import_local_folder, start_import_local_file, import_local_file)
 
@@ -1084,7 +2176,7 @@ class GitHubApp(ctk.CTk):
 
     def open_in_ide(self, path: str, ide_choice: str) -> None:
         """(Worker Thread) Tenta abrir a pasta do projeto no IDE escolhido."""
-        self.after(0, self.set_status, f"Abrindo {path} em {ide_choice}...")
+        self.set_status(f"Abrindo {path} em {ide_choice}...")
 
         command_str: str = ""
 
@@ -1107,12 +2199,11 @@ class GitHubApp(ctk.CTk):
                     command, cwd=path, shell=shell_needed, startupinfo=_get_startup_info())
 
         except FileNotFoundError:
-            self.after(0, messagebox.showerror, "Erro",
-                       f"Não foi possível encontrar o comando para '{command_str}'.\n"
-                       f"Certifique-se de que o IDE está instalado e o seu comando ('{command_str}') está no PATH do sistema.")
+            self.post(messagebox.showerror, "Erro",
+                      f"Não foi possível encontrar o comando para '{command_str}'.\n"
+                      f"Certifique-se de que o IDE está instalado e o seu comando ('{command_str}') está no PATH do sistema.")
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Falha ao abrir o IDE: {e}")
+            self.post(messagebox.showerror, "Erro", f"Falha ao abrir o IDE: {e}")
 
     # --- Abrir Terminal ---
     def open_terminal(self) -> None:
@@ -1142,14 +2233,12 @@ class GitHubApp(ctk.CTk):
                 if git_bash_path:
                     subprocess.Popen(
                         [str(git_bash_path), "--cd=" + path_to_open], startupinfo=_get_startup_info())
-                    self.after(
-                        0, self.set_status, f"✓ Git Bash aberto em: {path_to_open}")
+                    self.set_status(f"✓ Git Bash aberto em: {path_to_open}")
                 else:
                     # Fallback para cmd se Git Bash não for encontrado
                     subprocess.Popen(["cmd.exe"], cwd=path_to_open,
                                      startupinfo=_get_startup_info())
-                    self.after(
-                        0, self.set_status, f"✓ Prompt de Comando aberto em: {path_to_open}")
+                    self.set_status(f"✓ Prompt de Comando aberto em: {path_to_open}")
             else:  # Linux/macOS
                 terminals = [
                     ["x-terminal-emulator", "-e", f"cd {path_to_open} && bash"],
@@ -1168,15 +2257,13 @@ class GitHubApp(ctk.CTk):
                         continue
 
                 if opened:
-                    self.after(
-                        0, self.set_status, f"✓ Terminal aberto em: {path_to_open}")
+                    self.set_status(f"✓ Terminal aberto em: {path_to_open}")
                 else:
-                    self.after(0, messagebox.showerror,
-                               "Erro", "Não foi possível abrir um terminal. Tente abrir manualmente.")
+                    self.post(messagebox.showerror,
+                              "Erro", "Não foi possível abrir um terminal. Tente abrir manualmente.")
         except Exception as e:
-            self.after(
-                0, messagebox.showerror, "Erro", f"Falha ao abrir o terminal: {e}")
-            self.after(0, self.set_status, "✗ Erro ao abrir terminal.")
+            self.post(messagebox.showerror, "Erro", f"Falha ao abrir o terminal: {e}")
+            self.set_status("✗ Erro ao abrir terminal.")
 
     def find_git_bash(self) -> Optional[Path]:
         """Tenta encontrar o executável do Git Bash no Windows (usando Pathlib)."""
@@ -1210,5 +2297,9 @@ class GitHubApp(ctk.CTk):
 
 # Ponto de entrada da aplicação
 if __name__ == "__main__":
+    if PROFILER:
+        PROFILER.mark("módulos iniciais importados")
     app = GitHubApp()
+    if PROFILER:
+        PROFILER.mark("janela criada")
     app.mainloop()
@@ -0,0 +1,124 @@
+"""
+Benchmark (e verificação) do clone direto contra o clone pelo espelho local.
+
+Cria um "origin" bare no disco com o branch padrão `main` (como no GitHub),
+clona-o direto e pelo `MirrorStore` (o primeiro clone cria o espelho, o
+segundo reaproveita-o) e confere que cada clone tem o branch padrão com
+todos os ficheiros. Um clone vazio falha o benchmark (RuntimeError), tal
+como um clone falhado (com progresso) que perca a linha "fatal:" do git.
+Cada medição é repetida `--repeat` vezes (com um espelho novo em cada) e
+fica o melhor tempo: um clone isolado varia quase 2x com o disco.
+
+Uso:
+    python benchmarks/bench_clone.py [--files 200 2000] [--repeat 3] [--json]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bulk_clone  # noqa: E402
+import mirror_store  # noqa: E402
+import services  # noqa: E402
+
+DEFAULT_BRANCH = "main"
+DEFAULT_REPEAT = 3
+_GIT_ENV = dict(os.environ, GIT_AUTHOR_NAME="bench", GIT_AUTHOR_EMAIL="bench@example.com",
+                GIT_COMMITTER_NAME="bench", GIT_COMMITTER_EMAIL="bench@example.com")
+
+
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, env=_GIT_ENV, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def make_origin(root: Path, files: int) -> Path:
+    """Repositório bare com `files` ficheiros no branch `main`."""
+    work = root / "work"
+    work.mkdir()
+    _git("init", "-q", "-b", DEFAULT_BRANCH, cwd=work)
+    for index in range(files):
+        (work / f"mod_{index:05d}.py").write_text(f"VALUE = {index}\n" * 20, encoding="utf-8")
+    _git("add", "-A", cwd=work)
+    _git("commit", "-q", "-m", "inicial", cwd=work)
+    origin = root / "origin.git"
+    _git("clone", "-q", "--bare", str(work), str(origin), cwd=root)
+    return origin
+
+
+def check_clone(path: Path, files: int) -> None:
+    """O clone está no branch padrão e com os ficheiros? (senão, RuntimeError)"""
+    branch = _git("symbolic-ref", "--short", "HEAD", cwd=path).strip()
+    count = len(list(path.glob("mod_*.py")))
+    if branch != DEFAULT_BRANCH or count != files:
+        raise RuntimeError(f"Clone incompleto em {path}: branch {branch!r}, "
+                           f"{count}/{files} ficheiros")
+
+
+def check_clone_error(root: Path) -> None:
+    """Um clone falhado com progresso ainda traz o "fatal:" do git? (senão, RuntimeError)"""
+    updates: List[Any] = []
+    try:
+        services.clone_repo(str(root / "nao-existe"), root / "falhado", on_progress=updates.append)
+    except services.git.GitCommandError as e:
+        message = bulk_clone.short_error(e)
+        if not message.startswith("fatal:"):
+            raise RuntimeError(f"Clone falhado sem a mensagem do git: {message!r}") from e
+    else:
+        raise RuntimeError("O clone de um repositório inexistente não falhou")
+
+
+def bench_size(files: int, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    root = Path(tempfile.mkdtemp(prefix="bench-clone-"))
+    try:
+        origin = make_origin(root, files)
+        check_clone_error(root)
+        timings: Dict[str, float] = {}
+        for attempt in range(repeat):
+            store = mirror_store.MirrorStore(root / f"mirrors-{attempt}")
+            for name, mirrors in (("direct", None), ("mirror_first", store), ("mirror_warm", store)):
+                destination = root / f"{name}-{attempt}"
+                start = perf_counter()
+                services.clone_repo(str(origin), destination, mirrors=mirrors)
+                elapsed = perf_counter() - start
+                check_clone(destination, files)
+                timings[name] = min(elapsed, timings.get(name, elapsed))
+        return {
+            "files": files,
+            "direct_ms": 1000 * timings["direct"],
+            "mirror_first_ms": 1000 * timings["mirror_first"],
+            "mirror_warm_ms": 1000 * timings["mirror_warm"],
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="medições por tamanho; fica a melhor (padrão: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = [bench_size(files, args.repeat) for files in args.files]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'ficheiros':>9} | {'direto (ms)':>12} | {'espelho 1º (ms)':>15} | {'espelho 2º (ms)':>15}")
+    for r in results:
+        print(f"{r['files']:>9} | {r['direct_ms']:>12.1f} | {r['mirror_first_ms']:>15.1f} "
+              f"| {r['mirror_warm_ms']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark de memória do `repo_map`: objetos Repository do PyGithub contra
+os resumos compactos (RepoSummary) que a interface usa. Cada mapa é
+construído `--repeat` vezes e ficam os melhores tempos de construção e GC.
+
+Uso:
+    python benchmarks/bench_memory.py [--sizes 1000 10000] [--repeat 3] [--json]
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from repo_models import RepoSummary  # noqa: E402
+from synthetic import synthetic_repos  # noqa: E402
+
+DEFAULT_REPEAT = 3
+
+
+def measure(build: Callable[[], Dict[str, Any]], repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """
+    Mede a memória retida pelo mapa construído e o tempo de construção e GC.
+    Os tempos são os melhores de `repeat` construções (uma só varia ~50%).
+    """
+    best = {"mb": 0.0, "build_ms": float("inf"), "gc_ms": float("inf")}
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        start = perf_counter()
+        repo_map = build()
+        elapsed = perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        gc_start = perf_counter()
+        gc.collect()
+        gc_time = perf_counter() - gc_start
+        del repo_map
+        best["mb"] = max(best["mb"], current / (1024 * 1024))
+        best["build_ms"] = min(best["build_ms"], elapsed * 1000)
+        best["gc_ms"] = min(best["gc_ms"], gc_time * 1000)
+    return best
+
+
+def bench_size(count: int, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    import github  # type: ignore
+
+    # O JSON chega de uma resposta HTTP: cada repositório tem a sua cópia
+    raw = synthetic_repos(count)
+    payload = json.dumps(raw)
+    client = github.Github()
+
+    def full_objects() -> Dict[str, Any]:
+        repos = json.loads(payload)
+        return {item["name"]: client.create_from_raw_data(github.Repository.Repository, item)
+                for item in repos}
+
+    def summaries() -> Dict[str, Any]:
+        repos = json.loads(payload)
+        return {item["name"]: RepoSummary.from_raw(item) for item in repos}
+
+    full = measure(full_objects, repeat)
+    compact = measure(summaries, repeat)
+    return {
+        "repos": count,
+        "repository_mb": full["mb"],
+        "summary_mb": compact["mb"],
+        "repository_gc_ms": full["gc_ms"],
+        "summary_gc_ms": compact["gc_ms"],
+        "repository_build_ms": full["build_ms"],
+        "summary_build_ms": compact["build_ms"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="construções por mapa; ficam os melhores tempos (padrão: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = [bench_size(size, args.repeat) for size in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'repos':>7} | {'Repository (MB)':>15} | {'RepoSummary (MB)':>16} | {'GC full/resumo (ms)':>20}")
+    for r in results:
+        print(f"{r['repos']:>7} | {r['repository_mb']:>15.1f} | {r['summary_mb']:>16.2f} "
+              f"| {r['repository_gc_ms']:>9.1f} / {r['summary_gc_ms']:<8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Micro-benchmark do filtro de repositórios (latência por tecla).
+
+Compara o filtro antigo (ordenar + minúsculas + varredura + apagar e
+reinserir a lista inteira) com o RepoIndex (trigramas + resultados
+anteriores) + diff da Listbox. O tempo de cada tecla inclui aplicar as
+mudanças numa Listbox: um `tk.Listbox` de verdade com display (o widget que
+o filtro antigo reconstruía), ou uma lista em memória sem ele. As linhas
+tocadas contam as removidas mais as inseridas.
+
+Uso:
+    python benchmarks/bench_search.py [--sizes 1000 10000 50000] [--json]
+    xvfb-run python benchmarks/bench_search.py --real-tk
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from headless import FakeListbox, display_available  # noqa: E402
+from repo_index import MAX_DIFF_OPS, RepoIndex, diff_sorted  # noqa: E402
+from synthetic import synthetic_names  # noqa: E402
+
+# Sequência de teclas: digita, apaga, cola outro termo e limpa
+KEYSTROKES = ["s", "se", "ser", "serv", "servi", "servic", "service",
+              "servic", "servi", "serv", "api-gate", "api-gatew", "", "x"]
+
+
+def legacy_filter(names: List[str], term: str) -> List[str]:
+    """O filtro antigo: ordena e varre todos os nomes a cada tecla."""
+    return [name for name in sorted(names) if term.lower() in name.lower()]
+
+
+def apply_diff(listbox: Any, visible: List[str], matches: List[str]) -> int:
+    """Aplica só as diferenças (como o `filter_repositories`). Devolve as linhas tocadas."""
+    ops = diff_sorted(visible, matches, MAX_DIFF_OPS)
+    if ops is None:
+        listbox.delete(0, "end")
+        if matches:
+            listbox.insert("end", *matches)
+        return len(visible) + len(matches)
+    rows = 0
+    for kind, start, stop in ops:
+        if kind == "delete":
+            listbox.delete(start, stop - 1)
+        else:
+            listbox.insert(start, *matches[start:stop])
+        rows += stop - start
+    return rows
+
+
+def _listbox(root: Any) -> Any:
+    if root is None:
+        return FakeListbox()
+    import tkinter as tk
+
+    return tk.Listbox(root)
+
+
+def bench_size(count: int, real_tk: Optional[bool] = None) -> Dict[str, Any]:
+    names = synthetic_names(count)
+    real = display_available() if real_tk is None else real_tk
+    root = None
+    if real:
+        import tkinter as tk
+
+        root = tk.Tk()
+        root.withdraw()
+    try:
+        legacy: List[float] = []
+        legacy_rows = 0
+        listbox = _listbox(root)
+        visible: List[str] = []
+        for term in KEYSTROKES:
+            start = perf_counter()
+            matches = legacy_filter(names, term)
+            listbox.delete(0, "end")
+            if matches:
+                listbox.insert("end", *matches)
+            legacy.append(perf_counter() - start)
+            legacy_rows += len(visible) + len(matches)
+            visible = matches
+
+        build_start = perf_counter()
+        index = RepoIndex(names)
+        build = perf_counter() - build_start
+        grams_start = perf_counter()
+        while index.index_pending():
+            pass
+        grams = perf_counter() - grams_start
+
+        indexed: List[float] = []
+        diff_rows = 0
+        listbox = _listbox(root)
+        visible = []
+        for term in KEYSTROKES:
+            start = perf_counter()
+            matches = index.search_names(term)
+            diff_rows += apply_diff(listbox, visible, matches)
+            indexed.append(perf_counter() - start)
+            visible = matches
+    finally:
+        if root is not None:
+            root.destroy()
+
+    return {
+        "repos": count,
+        "keystrokes": len(KEYSTROKES),
+        "listbox": "tk" if real else "simulada",
+        "legacy_ms_mean": 1000 * sum(legacy) / len(legacy),
+        "legacy_ms_max": 1000 * max(legacy),
+        "legacy_rows_touched": legacy_rows,
+        "index_build_ms": 1000 * build,
+        "index_grams_ms": 1000 * grams,  # Em fatias no app (fora das teclas)
+        "index_ms_mean": 1000 * sum(indexed) / len(indexed),
+        "index_ms_max": 1000 * max(indexed),
+        "index_rows_touched": diff_rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    tk_mode = parser.add_mutually_exclusive_group()
+    tk_mode.add_argument("--real-tk", dest="real_tk", action="store_true", default=None)
+    tk_mode.add_argument("--mock-tk", dest="real_tk", action="store_false")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    results = [bench_size(size, args.real_tk) for size in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'repos':>7} | {'antigo média/máx (ms)':>22} | {'índice média/máx (ms)':>22} "
+          f"| {'linhas antigo/diff':>20}")
+    for r in results:
+        print(f"{r['repos']:>7} | {r['legacy_ms_mean']:>10.2f} / {r['legacy_ms_max']:<9.2f} "
+              f"| {r['index_ms_mean']:>10.2f} / {r['index_ms_max']:<9.2f} "
+              f"| {r['legacy_rows_touched']:>9} / {r['index_rows_touched']:<8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Benchmark dos caminhos da UI do app, sem janela (ver `headless.py`).
+
+Mede, com dados sintéticos:
+- `update_repo_list` (lista inteira; à parte, o trabalho em fatias que ele
+  agenda) e a carga progressiva por páginas;
+- `filter_repositories` por tecla (média, p95 e máximo);
+- `update_issue_list`: primeiro lote na tela e renderização até ao limite;
+- `generate_plot`: agregação (Pandas) e desenho (Matplotlib, backend Agg),
+  depois de um gráfico de aquecimento; fica o melhor de `PLOT_REPEAT` vezes.
+
+Uso:
+    python benchmarks/bench_ui.py [--repos 1000 10000 50000] [--issues 100 10000] [--json]
+    xvfb-run python benchmarks/bench_ui.py --real-tk   # com o Tk de verdade
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_search import KEYSTROKES  # noqa: E402
+from headless import HeadlessApp  # noqa: E402
+from repo_models import IssueSummary, RepoSummary  # noqa: E402
+from synthetic import synthetic_issue_json, synthetic_repos  # noqa: E402
+
+PAGE_SIZE = 100  # Tamanho das páginas na carga progressiva (como o REPOS_PER_PAGE)
+# Medições do gráfico; fica a melhor (uma só variava ~40% entre execuções)
+PLOT_REPEAT = 3
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_repo_list(count: int, real_tk: Optional[bool] = None) -> Dict[str, Any]:
+    repos = [RepoSummary.from_raw(raw) for raw in synthetic_repos(count)]
+    headless = HeadlessApp(real_tk)
+    app = headless.app
+    try:
+        start = perf_counter()
+        app.update_repo_list(repos)
+        full = perf_counter() - start
+        # Trigramas da busca (e, no Tk real, a renderização): fatias em after()
+        start = perf_counter()
+        headless.drain()
+        idle = perf_counter() - start
+
+        # Carga progressiva: cada página que chega entra na lista
+        app.clear_repo_list()
+        pages: List[float] = []
+        for offset in range(0, count, PAGE_SIZE):
+            start = perf_counter()
+            app.append_repos(repos[offset:offset + PAGE_SIZE])
+            headless.drain()
+            pages.append(perf_counter() - start)
+
+        keystrokes: List[float] = []
+        for term in KEYSTROKES:
+            headless.search_entry.text = term
+            start = perf_counter()
+            app.filter_repositories()
+            headless.drain()
+            keystrokes.append(perf_counter() - start)
+    finally:
+        headless.close()
+
+    return {
+        "repos": count,
+        "update_repo_list_ms": _ms(full),
+        "update_repo_list_idle_ms": _ms(idle),
+        "progressive_total_ms": _ms(sum(pages)),
+        "progressive_page_max_ms": _ms(max(pages)),
+        "filter_ms_mean": _ms(sum(keystrokes) / len(keystrokes)),
+        "filter_ms_p95": _ms(_percentile(keystrokes, 0.95)),
+        "filter_ms_max": _ms(max(keystrokes)),
+    }
+
+
+def bench_issue_list(count: int, real_tk: Optional[bool] = None) -> Dict[str, Any]:
+    issues = [IssueSummary.from_raw(synthetic_issue_json("octo-org/bench", number))
+              for number in range(count, 0, -1)]
+    headless = HeadlessApp(real_tk)
+    app = headless.app
+    try:
+        start = perf_counter()
+        app.update_issue_list(issues)
+        # Primeiro lote: o que o utilizador vê no primeiro frame
+        app._render_issue_batch()
+        first_batch = perf_counter() - start
+        headless.drain()
+        visible = perf_counter() - start
+        rendered = app._issues_rendered
+
+        # Rolar até ao fim: carrega tudo o que foi recebido
+        start = perf_counter()
+        while app._issues_rendered < len(issues):
+            app.load_more_issues()
+            headless.drain()
+        rest = perf_counter() - start
+    finally:
+        headless.close()
+
+    return {
+        "issues": count,
+        "first_batch_ms": _ms(first_batch),
+        "render_visible_ms": _ms(visible),
+        "rendered_initially": rendered,
+        "render_rest_ms": _ms(rest),
+    }
+
+
+def bench_plot(count: int, repeat: int = PLOT_REPEAT) -> Dict[str, Any]:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from app import GitHubApp
+
+    repos = [RepoSummary.from_raw(raw) for raw in synthetic_repos(count)]
+    GitHubApp.repos_per_month(repos[:10])  # Aquece (import e caches do Pandas)
+    aggregate = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        months = GitHubApp.repos_per_month(repos)
+        aggregate = min(aggregate, perf_counter() - start)
+
+    headless = HeadlessApp(real_tk=False)
+    headless.app.plot_button = type("Button", (), {"configure": lambda self, **kw: None})()
+    original_show = plt.show
+    # No Agg, show() não desenha: força o desenho completo da figura
+    plt.show = lambda *args, **kwargs: plt.gcf().canvas.draw()
+    try:
+        # Aquece: o primeiro desenho carrega fontes e caches do Matplotlib
+        headless.app.generate_plot(repos[:10])
+        plt.close("all")
+        total = float("inf")
+        for _ in range(repeat):
+            start = perf_counter()
+            headless.app.generate_plot(repos)
+            total = min(total, perf_counter() - start)
+            plt.close("all")
+    finally:
+        plt.show = original_show
+        plt.close("all")
+        headless.close()
+
+    return {
+        "repos": count,
+        "months": len(months),
+        "plot_aggregate_ms": _ms(aggregate),
+        "plot_total_ms": _ms(total),
+        "plot_render_ms": _ms(max(0.0, total - aggregate)),
+    }
+
+
+def run(repo_sizes: List[int], issue_sizes: List[int],
+        real_tk: Optional[bool] = None) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        "repo_list": [bench_repo_list(size, real_tk) for size in repo_sizes],
+        "issue_list": [bench_issue_list(size, real_tk) for size in issue_sizes],
+        "plot": [bench_plot(size) for size in repo_sizes],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repos", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--issues", type=int, nargs="+", default=[100, 10000])
+    tk_mode = parser.add_mutually_exclusive_group()
+    tk_mode.add_argument("--real-tk", dest="real_tk", action="store_true", default=None,
+                         help="usa o Tk de verdade (precisa de DISPLAY, ex: xvfb-run)")
+    tk_mode.add_argument("--mock-tk", dest="real_tk", action="store_false",
+                         help="usa widgets simulados mesmo com display")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    results = run(args.repos, args.issues, args.real_tk)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'repos':>7} | {'update (ms)':>11} | {'progressiva (ms)':>16} | {'tecla média/p95 (ms)':>21}"
+          f" | {'gráfico agreg./total (ms)':>25}")
+    for r, p in zip(results["repo_list"], results["plot"]):
+        print(f"{r['repos']:>7} | {r['update_repo_list_ms']:>11.1f} | {r['progressive_total_ms']:>16.1f} "
+              f"| {r['filter_ms_mean']:>9.2f} / {r['filter_ms_p95']:<9.2f} "
+              f"| {p['plot_aggregate_ms']:>10.1f} / {p['plot_total_ms']:<12.1f}")
+    print()
+    print(f"{'issues':>7} | {'1º lote (ms)':>12} | {'visíveis (ms)':>13} | {'resto (ms)':>10}")
+    for r in results["issue_list"]:
+        print(f"{r['issues']:>7} | {r['first_batch_ms']:>12.2f} | {r['render_visible_ms']:>13.2f} "
+              f"| {r['render_rest_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+`GitHubApp` sem janela, para medir os caminhos da UI nos benchmarks.
+
+Dois modos:
+
+- Tk simulado (padrão sem display): Listbox/Textbox/Entry de mentira, em
+  Python puro, e um `after()` que só enfileira. Mede o custo do código do
+  app, não o do Tk; corre em qualquer CI.
+- Tk real (com `DISPLAY`, ex: `xvfb-run`): a `VirtualListbox` e um `tk.Text`
+  de verdade numa janela escondida; o tempo inclui o trabalho do Tk.
+
+Em ambos, `drain()` corre os `after()` pendentes (ex: os lotes de issues)
+até não sobrar nada, como o loop principal faria.
+"""
+import os
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+def display_available() -> bool:
+    return bool(os.environ.get("DISPLAY"))
+
+
+class FakeScheduler:
+    """`after`/`after_cancel`/`after_idle` que só enfileiram; `drain()` executa."""
+
+    def __init__(self) -> None:
+        self._pending: Deque[Tuple[str, Callable[..., Any], Tuple[Any, ...]]] = deque()
+        self._cancelled: set = set()
+        self._ids = 0
+
+    def after(self, ms: int, func: Optional[Callable[..., Any]] = None, *args: Any) -> str:
+        self._ids += 1
+        after_id = f"after#{self._ids}"
+        if func is not None:
+            self._pending.append((after_id, func, args))
+        return after_id
+
+    def after_idle(self, func: Callable[..., Any], *args: Any) -> str:
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id: str) -> None:
+        self._cancelled.add(after_id)
+
+    def drain(self) -> int:
+        """Executa os callbacks pendentes (e os que eles agendarem). Devolve quantos."""
+        count = 0
+        while self._pending:
+            after_id, func, args = self._pending.popleft()
+            if after_id in self._cancelled:
+                self._cancelled.discard(after_id)
+                continue
+            func(*args)
+            count += 1
+        return count
+
+
+class FakeEntry:
+    def __init__(self, text: str = "") -> None:
+        self.text = text
+
+    def get(self) -> str:
+        return self.text
+
+
+class FakeListbox:
+    """Listbox em memória com a API que o app usa."""
+
+    def __init__(self) -> None:
+        self.items: List[str] = []
+        self.selected: Optional[int] = None
+
+    def size(self) -> int:
+        return len(self.items)
+
+    def _resolve(self, index: Any) -> int:
+        return len(self.items) - 1 if index == "end" else int(index)
+
+    def get(self, index: Any) -> str:
+        return self.items[self._resolve(index)]
+
+    def insert(self, index: Any, *items: str) -> None:
+        position = len(self.items) if index == "end" else int(index)
+        self.items[position:position] = items
+
+    def delete(self, first: Any, last: Any = None) -> None:
+        start = self._resolve(first)
+        stop = start + 1 if last is None else self._resolve(last) + 1
+        del self.items[start:stop]
+
+    def curselection(self) -> Tuple[int, ...]:
+        return () if self.selected is None else (self.selected,)
+
+
+class FakeTextbox:
+    """Textbox em memória: segmentos (texto, tag); os índices de tag são posições."""
+
+    def __init__(self) -> None:
+        self.segments: List[Tuple[str, Optional[str]]] = []
+        self.options: Dict[str, Any] = {}
+
+    def configure(self, **options: Any) -> None:
+        self.options.update(options)
+
+    def insert(self, index: str, text: str, tag: Optional[str] = None) -> None:
+        self.segments.append((text, tag))
+
+    def delete(self, first: Any, last: Any = None) -> None:
+        if first == "1.0":
+            self.segments.clear()
+        else:
+            del self.segments[int(first):int(last)]
+
+    def tag_ranges(self, tag: str) -> Tuple[int, ...]:
+        positions = [i for i, (_, segment_tag) in enumerate(self.segments) if segment_tag == tag]
+        return (positions[0], positions[-1] + 1) if positions else ()
+
+    def yview(self) -> Tuple[float, float]:
+        return 0.0, 1.0
+
+    def text(self) -> str:
+        return "".join(text for text, _ in self.segments)
+
+
+class HeadlessApp:
+    """Um `GitHubApp` criado sem `__init__`, com widgets reais (Tk) ou simulados."""
+
+    def __init__(self, real_tk: Optional[bool] = None) -> None:
+        from app import GitHubApp  # Importa aqui: o app lê sys.argv ao carregar
+        import repo_index
+
+        self.real_tk = display_available() if real_tk is None else real_tk
+        app = GitHubApp.__new__(GitHubApp)
+        self.app = app
+        self.root: Any = None
+
+        if self.real_tk:
+            import tkinter as tk
+            from virtual_list import VirtualListbox
+
+            self.root = tk.Tk()
+            self.root.withdraw()
+            app.repo_listbox = VirtualListbox(self.root)
+            app.repo_listbox.pack(fill="both", expand=True)
+            app.issue_textbox = tk.Text(self.root)
+            app.after = self.root.after
+            app.after_idle = self.root.after_idle
+            app.after_cancel = self.root.after_cancel
+        else:
+            self.scheduler = FakeScheduler()
+            app.repo_listbox = FakeListbox()
+            app.issue_textbox = FakeTextbox()
+            app.after = self.scheduler.after
+            app.after_idle = self.scheduler.after_idle
+            app.after_cancel = self.scheduler.after_cancel
+
+        app.search_entry = self.search_entry = FakeEntry()
+        app.repo_map = {}
+        app.repo_search_index = repo_index.RepoIndex([])
+        app._visible_repo_names = []
+        app._filter_after_id = None
+        app._index_after_id = None
+        app.current_repo_object = None
+        app._issue_buffer = []
+        app._issues_rendered = 0
+        app._issue_render_limit = GitHubApp.ISSUE_RENDER_LIMIT
+        app._issue_render_after_id = None
+        # Sem workers nem barra de status: o que iria para outra thread é ignorado
+        app.set_status = lambda *args, **kwargs: None
+        app.set_progress = lambda *args, **kwargs: None
+        app.prefetch_issues = lambda *args, **kwargs: None
+        app.post = lambda func, *args, **kwargs: func(*args)
+
+    def drain(self) -> None:
+        """Corre o que o app agendou com `after()` até a fila esvaziar."""
+        if self.real_tk:
+            while self.app._issue_render_after_id is not None:
+                self.root.update()
+            self.root.update()
+        else:
+            self.scheduler.drain()
+
+    def close(self) -> None:
+        if self.root is not None:
+            self.root.destroy()
+            self.root = None
@@ -0,0 +1,159 @@
+"""
+Corre todos os benchmarks e grava um JSON comparável entre commits.
+
+O resultado traz os metadados (commit, Python, modo do Tk) e as métricas de
+cada suite. Com `--compare`, cada métrica de tempo/memória é comparada com a
+mesma métrica (mesma suite e tamanho) de um resultado anterior; uma piora
+acima de `--threshold` (fração) conta como regressão e o código de saída é 1.
+Nas métricas de tempo, uma piora menor que `--min-delta-ms` é ruído e não
+conta, por maior que seja a fração (ex: 0,25 -> 1,74 ms).
+
+Uso:
+    python benchmarks/run_all.py --output resultados/base.json
+    python benchmarks/run_all.py --output novo.json --compare resultados/base.json
+    python benchmarks/run_all.py --quick               # tamanhos pequenos (CI)
+    xvfb-run python benchmarks/run_all.py --real-tk    # com o Tk de verdade
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bench_clone  # noqa: E402
+import bench_memory  # noqa: E402
+import bench_search  # noqa: E402
+import bench_ui  # noqa: E402
+from headless import display_available  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+REPO_SIZES = [1000, 10000, 50000]
+ISSUE_SIZES = [100, 10000]
+CLONE_SIZES = [200, 2000]  # Ficheiros no repositório clonado
+QUICK_REPO_SIZES = [1000]
+QUICK_ISSUE_SIZES = [100]
+QUICK_CLONE_SIZES = [200]
+DEFAULT_THRESHOLD = 0.25  # 25% mais lento/pesado = regressão
+# Pioras de tempo menores que isto (ms) são ruído de medição: não contam como regressão
+DEFAULT_MIN_DELTA_MS = 5.0
+
+# Campos que identificam o tamanho de cada linha de resultado
+_SIZE_KEYS = ("repos", "issues", "files")
+# Sufixos das métricas comparadas (quanto maior, pior)
+_METRIC_SUFFIXES = ("_ms", "_ms_mean", "_ms_p95", "_ms_max", "_mb")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run(repo_sizes: List[int], issue_sizes: List[int],
+        real_tk: Optional[bool] = None, clone_sizes: Optional[List[int]] = None) -> Dict[str, Any]:
+    real = display_available() if real_tk is None else real_tk
+    suites: Dict[str, List[Dict[str, Any]]] = {}
+    print("• filtro (índice)...", file=sys.stderr)
+    suites["search"] = [bench_search.bench_size(size) for size in repo_sizes]
+    print("• memória do repo_map...", file=sys.stderr)
+    suites["memory"] = [bench_memory.bench_size(size) for size in repo_sizes]
+    print("• caminhos da UI...", file=sys.stderr)
+    suites.update(bench_ui.run(repo_sizes, issue_sizes, real))
+    print("• clone direto e pelo espelho local...", file=sys.stderr)
+    suites["clone"] = [bench_clone.bench_size(files) for files in clone_sizes or CLONE_SIZES]
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tk": "real" if real else "simulado",
+        },
+        "suites": suites,
+    }
+
+
+def _metrics(result: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+    """(nome único, valor) de cada métrica comparável: suite[tamanho].métrica."""
+    for suite, rows in result["suites"].items():
+        for row in rows:
+            size = ",".join(f"{key}={row[key]}" for key in _SIZE_KEYS if key in row)
+            for name, value in row.items():
+                if name.endswith(_METRIC_SUFFIXES) and isinstance(value, (int, float)):
+                    yield f"{suite}[{size}].{name}", float(value)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[Tuple[str, float, float, float]]:
+    """
+    Métricas que pioraram mais que `threshold`: (nome, antes, agora, variação).
+    As de tempo também têm de piorar pelo menos `min_delta_ms` em valor absoluto.
+    """
+    before = dict(_metrics(baseline))
+    regressions = []
+    for name, value in _metrics(current):
+        old = before.get(name)
+        if old is None or old <= 0:
+            continue
+        if not name.endswith("_mb") and value - old < min_delta_ms:
+            continue
+        change = (value - old) / old
+        if change > threshold:
+            regressions.append((name, old, value, change))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", type=Path, help="ficheiro JSON do resultado (senão: stdout)")
+    parser.add_argument("--compare", type=Path, help="resultado anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="piora tolerada, em fração (padrão: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="piora mínima, em ms, para um tempo contar (padrão: %(default)s)")
+    parser.add_argument("--repos", type=int, nargs="+", help=f"padrão: {REPO_SIZES}")
+    parser.add_argument("--issues", type=int, nargs="+", help=f"padrão: {ISSUE_SIZES}")
+    parser.add_argument("--quick", action="store_true", help="só os tamanhos pequenos")
+    tk_mode = parser.add_mutually_exclusive_group()
+    tk_mode.add_argument("--real-tk", dest="real_tk", action="store_true", default=None)
+    tk_mode.add_argument("--mock-tk", dest="real_tk", action="store_false")
+    args = parser.parse_args()
+
+    repo_sizes = args.repos or (QUICK_REPO_SIZES if args.quick else REPO_SIZES)
+    issue_sizes = args.issues or (QUICK_ISSUE_SIZES if args.quick else ISSUE_SIZES)
+    clone_sizes = QUICK_CLONE_SIZES if args.quick else CLONE_SIZES
+    result = run(repo_sizes, issue_sizes, args.real_tk, clone_sizes)
+
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"✓ Resultado gravado em {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.threshold, args.min_delta_ms)
+        commit = baseline.get("meta", {}).get("commit") or args.compare.name
+        if not regressions:
+            print(f"✓ Sem regressões acima de {args.threshold:.0%} em relação a {commit}.",
+                  file=sys.stderr)
+            return
+        print(f"✗ {len(regressions)} regressões em relação a {commit}:", file=sys.stderr)
+        for name, old, value, change in regressions:
+            print(f"    {name}: {old:.2f} -> {value:.2f} (+{change:.0%})", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
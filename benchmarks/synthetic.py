@@ -0,0 +1,134 @@
+"""
+Geradores de dados sintéticos para os benchmarks (nomes e JSON de repositórios
+e issues).
+
+O JSON imita o formato de `/user/repos` e `/repos/{repo}/issues` da API REST do
+GitHub, com os mesmos campos e tamanhos aproximados, para que as medições de
+memória sejam realistas. Também alimentam o emulador (`github_emulator.py`).
+"""
+import random
+import string
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+WORDS = ["api", "service", "web", "app", "core", "lib", "tools", "infra", "data",
+         "gateway", "auth", "billing", "docs", "mobile", "sdk", "worker", "ui", "bot"]
+
+_URL_FIELDS = [
+    "forks_url", "keys_url", "collaborators_url", "teams_url", "hooks_url",
+    "issue_events_url", "events_url", "assignees_url", "branches_url", "tags_url",
+    "blobs_url", "git_tags_url", "git_refs_url", "trees_url", "statuses_url",
+    "languages_url", "stargazers_url", "contributors_url", "subscribers_url",
+    "subscription_url", "commits_url", "git_commits_url", "comments_url",
+    "issue_comment_url", "contents_url", "compare_url", "merges_url", "archive_url",
+    "downloads_url", "issues_url", "pulls_url", "milestones_url", "notifications_url",
+    "labels_url", "releases_url", "deployments_url",
+]
+
+
+def synthetic_names(count: int, seed: int = 42) -> List[str]:
+    """Gera nomes de repositórios parecidos com os reais (ex: 'billing-api-3f2a')."""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        parts = rng.sample(WORDS, rng.randint(1, 3))
+        suffix = "".join(rng.choices(string.ascii_lowercase + string.digits, k=4))
+        names.add("-".join(parts) + "-" + suffix)
+    return sorted(names)
+
+
+def synthetic_repo_json(index: int, name: str, owner: str = "octo-org",
+                        seed: int = 42, api_url: str = "https://api.github.com") -> Dict[str, Any]:
+    """JSON de um repositório no mesmo formato (e tamanho) que a API devolve."""
+    rng = random.Random(seed * 1_000_003 + index)
+    created = datetime(2015, 1, 1, tzinfo=timezone.utc) + timedelta(days=rng.randint(0, 3650))
+    pushed = created + timedelta(days=rng.randint(0, 600))
+    full_name = f"{owner}/{name}"
+    api = f"{api_url}/repos/{full_name}"
+    owner_json = {
+        "login": owner, "id": 1000, "node_id": "MDEyOk9yZ2FuaXphdGlvbjEwMDA=",
+        "avatar_url": "https://avatars.githubusercontent.com/u/1000?v=4",
+        "url": f"{api_url}/users/{owner}",
+        "html_url": f"https://github.com/{owner}", "type": "Organization", "site_admin": False,
+    }
+    repo: Dict[str, Any] = {
+        "id": 100000 + index,
+        "node_id": f"R_kgDO{index:08d}",
+        "name": name,
+        "full_name": full_name,
+        "private": rng.random() < 0.4,
+        "owner": owner_json,
+        "html_url": f"https://github.com/{full_name}",
+        "description": f"Repositório sintético {name}",
+        "fork": False,
+        "url": api,
+        "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "updated_at": pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "pushed_at": pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "git_url": f"git://github.com/{full_name}.git",
+        "ssh_url": f"git@github.com:{full_name}.git",
+        "clone_url": f"https://github.com/{full_name}.git",
+        "svn_url": f"https://github.com/{full_name}",
+        "homepage": None,
+        "size": rng.randint(10, 500_000),
+        "stargazers_count": rng.randint(0, 50),
+        "watchers_count": rng.randint(0, 50),
+        "language": rng.choice(["Python", "Go", "TypeScript", "Java", None]),
+        "has_issues": True, "has_projects": True, "has_downloads": True,
+        "has_wiki": False, "has_pages": False, "has_discussions": False,
+        "forks_count": rng.randint(0, 10),
+        "archived": False, "disabled": False,
+        "open_issues_count": rng.randint(0, 200),
+        "license": None,
+        "topics": [],
+        "visibility": "private",
+        "default_branch": "main",
+        "permissions": {"admin": True, "maintain": True, "push": True, "triage": True, "pull": True},
+    }
+    for field in _URL_FIELDS:
+        repo[field] = f"{api}/{field[:-4]}{{/id}}"
+    return repo
+
+
+def synthetic_repos(count: int, owner: str = "octo-org", seed: int = 42) -> List[Dict[str, Any]]:
+    """Lista de `count` repositórios sintéticos (JSON cru)."""
+    return [synthetic_repo_json(index, name, owner, seed)
+            for index, name in enumerate(synthetic_names(count, seed))]
+
+
+ISSUE_WORDS = ["corrigir", "erro", "adicionar", "suporte", "melhorar", "testes", "login",
+               "cache", "lentidão", "documentação", "build", "falha", "página", "exportar"]
+LABELS = ["bug", "enhancement", "documentation", "good first issue", "performance"]
+
+
+def synthetic_issue_json(repo_full_name: str, number: int, seed: int = 42,
+                         api_url: str = "https://api.github.com") -> Dict[str, Any]:
+    """JSON de uma issue aberta no formato de `/repos/{repo}/issues`."""
+    rng = random.Random(f"{seed}:{repo_full_name}:{number}")
+    created = datetime(2020, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randint(0, 2_000_000))
+    login = rng.choice(["octocat", "hubot", "monalisa", "dependabot[bot]", "mona"])
+    api = f"{api_url}/repos/{repo_full_name}/issues/{number}"
+    return {
+        "id": rng.randint(1, 2**31),
+        "node_id": f"I_kwDO{number:08d}",
+        "url": api,
+        "repository_url": f"{api_url}/repos/{repo_full_name}",
+        "comments_url": f"{api}/comments",
+        "events_url": f"{api}/events",
+        "html_url": f"https://github.com/{repo_full_name}/issues/{number}",
+        "number": number,
+        "state": "open",
+        "title": " ".join(rng.sample(ISSUE_WORDS, rng.randint(2, 5))).capitalize(),
+        "body": "Descrição sintética. " * rng.randint(1, 20),
+        "user": {"login": login, "id": rng.randint(1, 10**6), "type": "User",
+                 "url": f"{api_url}/users/{login}"},
+        "labels": [{"name": name, "color": "ededed", "default": False}
+                   for name in rng.sample(LABELS, rng.randint(0, 2))],
+        "assignees": [],
+        "comments": rng.randint(0, 30),
+        "locked": False,
+        "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "updated_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "closed_at": None,
+        "author_association": "MEMBER",
+    }
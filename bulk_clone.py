@@ -0,0 +1,345 @@
+"""
+Clone em lote: vários `git clone` em paralelo para uma pasta de destino.
+
+Usado pela janela (seleção múltipla na lista) e pelo `python -m cli clone`.
+Cada repositório gera um `CloneResult` assim que termina; `BulkCloneStats`
+soma tudo (MB/s, repositórios/min) para o progresso e o resumo final; o
+progresso do git de cada clone em curso (`git_progress`) entra no débito ao
+vivo e em `BulkCloneStats.live_text()`.
+
+Limites:
+- rede: no máximo `jobs` clones ao mesmo tempo (até `MAX_JOBS`);
+- disco: antes de cada clone, o tamanho estimado (o `size` da API) fica
+  reservado; se o espaço livre menos as reservas não chega, o clone espera
+  que outro termine (ou falha, se não houver nenhum em curso).
+"""
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import clone_options
+import git_progress
+import services
+from clone_options import CloneOptions
+from git_progress import ProgressSnapshot
+from mirror_store import MirrorStore
+from repo_models import RepoSummary
+from tasks import Cancelled, CancelToken
+
+DEFAULT_JOBS = 4
+MAX_JOBS = 16
+# Espaço livre que nunca é usado pelos clones
+DISK_RESERVE_BYTES = 1024 ** 3
+# O clone ocupa o pack (.git) e a cópia de trabalho: ~2x o tamanho da API
+CHECKOUT_FACTOR = 2
+
+# O que fazer quando a pasta de destino já existe
+IF_EXISTS_SKIP = "skip"
+IF_EXISTS_UPDATE = "update"  # git pull
+IF_EXISTS_FAIL = "fail"
+IF_EXISTS_POLICIES = (IF_EXISTS_SKIP, IF_EXISTS_UPDATE, IF_EXISTS_FAIL)
+
+CLONED = "clonado"
+UPDATED = "atualizado"
+SKIPPED = "ignorado"
+FAILED = "falhou"
+CANCELLED = "cancelado"
+
+
+class CloneResult:
+    """Resultado de um repositório do lote."""
+
+    __slots__ = ("full_name", "path", "status", "bytes", "seconds", "error", "saved")
+
+    def __init__(self, full_name: str, path: Path, status: str, bytes: int = 0,
+                 seconds: float = 0.0, error: Optional[str] = None,
+                 saved: Optional[int] = None) -> None:
+        self.full_name = full_name
+        self.path = path
+        self.status = status
+        self.bytes = bytes  # Tamanho do .git baixado (ou o que cresceu, num update)
+        self.seconds = seconds
+        self.error = error
+        self.saved = saved  # Bytes poupados face a um clone completo (raso/parcial)
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (CLONED, UPDATED, SKIPPED)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"repo": self.full_name, "path": str(self.path), "status": self.status,
+                "ok": self.ok, "bytes": self.bytes, "seconds": round(self.seconds, 3),
+                "saved": self.saved, "error": self.error}
+
+    def __repr__(self) -> str:
+        return f"CloneResult({self.full_name!r}, {self.status})"
+
+
+class BulkCloneStats:
+    """Totais do lote (seguro entre threads): contagens, bytes e débito."""
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.running = 0
+        self.results: List[CloneResult] = []
+        self._live: Dict[str, ProgressSnapshot] = {}  # Último progresso de cada clone em curso
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            self.running += 1
+
+    def _update(self, full_name: str, snapshot: ProgressSnapshot) -> None:
+        with self._lock:
+            self._live[full_name] = snapshot
+
+    def _add(self, result: CloneResult, started: bool) -> None:
+        with self._lock:
+            if started:
+                self.running -= 1
+            self._live.pop(result.full_name, None)
+            self.results.append(result)
+
+    def count(self, status: str) -> int:
+        with self._lock:
+            return sum(1 for result in self.results if result.status == status)
+
+    @property
+    def done(self) -> int:
+        return len(self.results)
+
+    @property
+    def bytes(self) -> int:
+        with self._lock:
+            return sum(result.bytes for result in self.results)
+
+    @property
+    def saved(self) -> int:
+        with self._lock:
+            return sum(result.saved or 0 for result in self.results)
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return max(end - self.started_at, 1e-6)
+
+    @property
+    def in_flight_bytes(self) -> int:
+        """Bytes já recebidos pelos clones que ainda não terminaram."""
+        with self._lock:
+            return sum(snapshot.bytes for snapshot in self._live.values())
+
+    @property
+    def mb_per_s(self) -> float:
+        return (self.bytes + self.in_flight_bytes) / 1024 ** 2 / self.elapsed
+
+    @property
+    def repos_per_min(self) -> float:
+        with self._lock:
+            transferred = sum(1 for result in self.results if result.status in (CLONED, UPDATED))
+        return transferred * 60 / self.elapsed
+
+    def progress_text(self) -> str:
+        """Linha curta para a barra de status."""
+        return (f"⬇️ {self.done}/{self.total} · {self.running} a clonar · "
+                f"{self.mb_per_s:.1f} MB/s · {self.repos_per_min:.0f} repos/min")
+
+    def live_text(self, limit: int = 3) -> str:
+        """Fase de cada clone em curso (os `limit` mais atrasados), uma linha por clone."""
+        with self._lock:
+            live = sorted(self._live.items(), key=lambda item: item[1].percent or 0)
+        lines = [f"{name}: {snapshot.text()}" for name, snapshot in live[:limit]]
+        if len(live) > limit:
+            lines.append(f"... e mais {len(live) - limit}")
+        return "\n".join(lines)
+
+    def summary(self) -> str:
+        """Resumo final (várias linhas)."""
+        lines = [f"{self.done}/{self.total} repositórios em {self.elapsed:.1f}s "
+                 f"({self.bytes / 1024 ** 2:.1f} MB, {self.mb_per_s:.1f} MB/s, "
+                 f"{self.repos_per_min:.0f} repos/min)"]
+        if self.saved:
+            lines.append(f"  poupados ~{self.saved / 1024 ** 2:.1f} MB face a clones completos")
+        for status in (CLONED, UPDATED, SKIPPED, FAILED, CANCELLED):
+            count = self.count(status)
+            if count:
+                lines.append(f"  {status}: {count}")
+        failures = [result for result in self.results if result.status == FAILED]
+        for result in failures[:10]:
+            lines.append(f"  ✗ {result.full_name}: {result.error}")
+        if len(failures) > 10:
+            lines.append(f"  ... e mais {len(failures) - 10} falhas")
+        return "\n".join(lines)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"total": self.total, "done": self.done, "bytes": self.bytes, "saved": self.saved,
+                "seconds": round(self.elapsed, 3), "mb_per_s": round(self.mb_per_s, 3),
+                "repos_per_min": round(self.repos_per_min, 1),
+                **{status: self.count(status) for status in (CLONED, UPDATED, SKIPPED, FAILED,
+                                                               CANCELLED)}}
+
+
+class DiskBudget:
+    """Reserva de espaço em disco para os clones em curso."""
+
+    def __init__(self, path: Path, reserve_bytes: int = DISK_RESERVE_BYTES) -> None:
+        self.path = path
+        self.reserve_bytes = reserve_bytes
+        self.in_flight = 0  # Bytes reservados pelos clones em curso
+        self.holders = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, amount: int, token: Optional[CancelToken] = None) -> None:
+        """Espera até haver espaço para `amount` bytes. Levanta `ServiceError` se nunca houver."""
+        with self._condition:
+            while True:
+                free = shutil.disk_usage(self.path).free - self.in_flight - self.reserve_bytes
+                if amount <= free:
+                    self.in_flight += amount
+                    self.holders += 1
+                    return
+                if self.holders == 0:
+                    raise services.ServiceError(
+                        f"Sem espaço em disco: faltam {(amount - free) / 1024 ** 2:.0f} MB")
+                if token is not None:
+                    token.raise_if_cancelled()
+                self._condition.wait(timeout=1.0)
+
+    def release(self, amount: int) -> None:
+        with self._condition:
+            self.in_flight -= amount
+            self.holders -= 1
+            self._condition.notify_all()
+
+
+def estimated_bytes(repo: RepoSummary) -> int:
+    """Espaço que o clone vai ocupar (0 se a API não disse o tamanho)."""
+    return (repo.size_kb or 0) * 1024 * CHECKOUT_FACTOR
+
+
+def short_error(error: Exception) -> str:
+    """Uma linha para o resumo: do git, a última linha do stderr (ex: "fatal: ...")."""
+    # O GitCommandError formata o stderr como "\n  stderr: '...'"
+    stderr = str(getattr(error, "stderr", "") or "").strip().removeprefix("stderr:").strip(" '\n")
+    if stderr:
+        return stderr.splitlines()[-1].strip()
+    if isinstance(error, services.ServiceError):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def destinations(repos: Sequence[RepoSummary], dest: Path) -> Dict[str, Path]:
+    """
+    Pasta de cada repositório: `dest/nome`; se o mesmo nome aparece com donos
+    diferentes (ex: octo/app e org/app), `dest/dono/nome` para esses.
+    """
+    counts: Dict[str, int] = {}
+    for repo in repos:
+        counts[repo.name] = counts.get(repo.name, 0) + 1
+    return {repo.full_name: dest / repo.full_name if counts[repo.name] > 1 else dest / repo.name
+            for repo in repos}
+
+
+def clone_one(repo: RepoSummary, path: Path, if_exists: str = IF_EXISTS_SKIP,
+              disk: Optional[DiskBudget] = None, token: Optional[CancelToken] = None,
+              options: Optional[CloneOptions] = None,
+              mirrors: Optional[MirrorStore] = None,
+              on_progress: Optional[git_progress.OnProgress] = None) -> CloneResult:
+    """Clona (ou atualiza/ignora, conforme `if_exists`) um repositório. Não levanta exceções."""
+    started = time.perf_counter()
+    try:
+        if path.exists():
+            if if_exists == IF_EXISTS_SKIP:
+                return CloneResult(repo.full_name, path, SKIPPED)
+            if if_exists == IF_EXISTS_FAIL:
+                raise services.ServiceError(f"A pasta '{path}' já existe")
+            before = clone_options.downloaded_bytes(path)
+            services.pull_repo(str(path), on_progress=on_progress)
+            return CloneResult(repo.full_name, path, UPDATED,
+                               max(0, clone_options.downloaded_bytes(path) - before),
+                               time.perf_counter() - started)
+
+        needed = estimated_bytes(repo)
+        if disk is not None:
+            disk.acquire(needed, token)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                services.clone_repo(repo.clone_url, path, options=options, mirrors=mirrors,
+                                    on_progress=on_progress)
+            except BaseException:
+                # Não deixa um clone pela metade (o próximo lote veria "já existe")
+                shutil.rmtree(path, ignore_errors=True)
+                raise
+        finally:
+            if disk is not None:
+                disk.release(needed)
+        downloaded = clone_options.downloaded_bytes(path)
+        # Do espelho, quase nada vem da rede: a comparação com o clone completo não se aplica
+        saved = None if options is None or options.is_full or mirrors is not None else \
+            clone_options.savings(downloaded, repo.size_kb)
+        return CloneResult(repo.full_name, path, CLONED, downloaded,
+                           time.perf_counter() - started, saved=saved)
+    except Cancelled:
+        return CloneResult(repo.full_name, path, CANCELLED)
+    except Exception as e:
+        return CloneResult(repo.full_name, path, FAILED, seconds=time.perf_counter() - started,
+                           error=short_error(e))
+
+
+def clone_many(repos: Sequence[RepoSummary], dest: Path, jobs: int = DEFAULT_JOBS,
+               if_exists: str = IF_EXISTS_SKIP,
+               on_start: Optional[Callable[[RepoSummary, BulkCloneStats], None]] = None,
+               on_result: Optional[Callable[[CloneResult, BulkCloneStats], None]] = None,
+               token: Optional[CancelToken] = None,
+               options: Optional[CloneOptions] = None,
+               mirrors: Optional[MirrorStore] = None,
+               on_progress: Optional[Callable[[RepoSummary, ProgressSnapshot, BulkCloneStats],
+                                              None]] = None) -> BulkCloneStats:
+    """
+    Clona `repos` para `dest` com até `jobs` clones em paralelo, no modo
+    `options` (padrão: clone completo) e, com `mirrors`, a partir dos
+    espelhos locais.
+    `on_start`/`on_progress`/`on_result` são chamados na thread de cada clone
+    (`on_progress` já limitado a poucas chamadas por segundo por clone). Se o `token`
+    for cancelado, os que ainda não começaram ficam como `CANCELLED` (os que
+    já estão a correr terminam).
+    """
+    if if_exists not in IF_EXISTS_POLICIES:
+        raise ValueError(f"Política desconhecida: {if_exists!r}")
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    jobs = max(1, min(jobs, MAX_JOBS))
+    paths = destinations(repos, dest)
+    stats = BulkCloneStats(len(repos))
+    disk = DiskBudget(dest)
+
+    def work(repo: RepoSummary) -> None:
+        path = paths[repo.full_name]
+        if token is not None and token.cancelled:
+            result, started = CloneResult(repo.full_name, path, CANCELLED), False
+        else:
+            stats._start()
+            if on_start:
+                on_start(repo, stats)
+            def progress(snapshot: ProgressSnapshot) -> None:
+                stats._update(repo.full_name, snapshot)
+                if on_progress:
+                    on_progress(repo, snapshot, stats)
+
+            result = clone_one(repo, path, if_exists, disk, token, options, mirrors, progress)
+            started = True
+        stats._add(result, started)
+        if on_result:
+            on_result(result, stats)
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="clone") as pool:
+        for future in as_completed([pool.submit(work, repo) for repo in repos]):
+            future.result()
+    stats.finished_at = time.monotonic()
+    return stats
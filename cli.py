@@ -0,0 +1,496 @@
+"""
+Linha de comando do gestor (sem Tk): as mesmas operações da janela, para
+scripts e tarefas em lote num servidor.
+
+Cada resultado é escrito assim que fica pronto; com `--json`, uma linha JSON
+por item (JSON Lines), fácil de encadear com `jq`. As operações em lote
+(issues de vários repositórios, clone, pull) correm em paralelo (`--jobs`).
+O código de saída é 1 se alguma operação falhou. Num terminal, clone/push/pull
+mostram no stderr uma linha de progresso ao vivo (fase, MB/s, ETA).
+
+Uso:
+    export GITHUB_TOKEN=ghp_...
+    python -m cli repos --json
+    python -m cli issues --owner minha-org --jobs 8 --json
+    python -m cli clone --owner minha-org --dest ~/src --jobs 8
+    python -m cli pull ~/src/* --jobs 8
+    python -m cli create-repo novo --private --readme
+    python -m cli create-issue octo/app --title "Corrigir login"
+    python -m cli delete-repo octo/velho --yes
+    python -m cli push ./pasta octo/app
+    python -m cli push ./jogo octo/jogo --lfs --lfs-pattern "*.psd" "*.fbx"
+    python -m cli lfs-fetch ~/src/jogo --include "assets/**"
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import bulk_clone
+import clone_options
+import git_progress
+import github_http
+import lfs
+import mirror_store
+import repo_cache
+import services
+import staging
+import tracing
+from repo_models import RepoSummary
+
+DEFAULT_JOBS = 4
+TOKEN_ENV = "GITHUB_TOKEN"
+
+
+class Output:
+    """Escreve os resultados à medida que chegam (seguro entre threads)."""
+
+    def __init__(self, as_json: bool, stream: Any = None) -> None:
+        self.as_json = as_json
+        self.stream = stream or sys.stdout
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def emit(self, record: Dict[str, Any], text: str) -> None:
+        LIVE.clear()
+        with self._lock:
+            if record.get("ok") is False:
+                self.failures += 1
+            self.stream.write((json.dumps(record, ensure_ascii=False) if self.as_json else text) + "\n")
+            self.stream.flush()
+
+    def error(self, op: str, target: str, error: BaseException, **extra: Any) -> None:
+        message = str(error) if isinstance(error, services.ServiceError) else \
+            f"{type(error).__name__}: {error}"
+        self.emit(dict(op=op, target=target, ok=False, error=message, **extra),
+                  f"✗ {op} {target}: {message}")
+
+
+class LiveLine:
+    """Uma linha de progresso no stderr, reescrita no lugar (só se for um terminal)."""
+
+    def __init__(self, stream: Any = None) -> None:
+        self.stream = stream or sys.stderr
+        self.enabled = self.stream.isatty()
+        self._shown = False
+        self._lock = threading.Lock()
+
+    def show(self, text: str) -> None:
+        if not self.enabled:
+            return
+        width = shutil.get_terminal_size().columns - 1
+        with self._lock:
+            self.stream.write("\r\033[K" + text[:width])
+            self.stream.flush()
+            self._shown = True
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._shown:
+                self.stream.write("\r\033[K")
+                self.stream.flush()
+                self._shown = False
+
+
+LIVE = LiveLine()
+
+
+def _progress(message: str) -> None:
+    """Mensagens de progresso vão para o stderr (o stdout fica só com os resultados)."""
+    LIVE.clear()
+    print(message, file=sys.stderr)
+
+
+def _git_progress(prefix: str) -> git_progress.OnProgress:
+    """Progresso do git (fase, MB/s, ETA) na linha ao vivo."""
+    return lambda snapshot: LIVE.show(f"{prefix} {snapshot.text()}")
+
+
+def run_parallel(items: Iterable[Any], work: Callable[[Any], None], jobs: int) -> None:
+    """Corre `work(item)` para cada item com até `jobs` em paralelo."""
+    items = list(items)
+    if jobs <= 1 or len(items) <= 1:
+        for item in items:
+            work(item)
+        return
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for future in as_completed([pool.submit(work, item) for item in items]):
+            future.result()
+
+
+# --- Sessão e seleção de repositórios ---
+
+def make_service(args: argparse.Namespace) -> services.GitHubService:
+    token = args.token or os.environ.get(TOKEN_ENV)
+    if not token:
+        raise SystemExit(f"Sem token: use --token ou a variável de ambiente {TOKEN_ENV}.")
+    cache = None
+    if not args.no_cache:
+        cache = repo_cache.RepoCache(
+            services.repo_cache_path(repo_cache.default_cache_dir(), args.base_url))
+    return services.GitHubService(token, args.base_url, cache=cache)
+
+
+def select_repos(service: services.GitHubService, args: argparse.Namespace) -> List[RepoSummary]:
+    """Repositórios pedidos: os nomes dados e/ou os filtros (--owner, --match, --all)."""
+    names = getattr(args, "repos", None) or []
+    owner = getattr(args, "owner", None)
+    match = getattr(args, "match", None)
+    if not names and not owner and not match and not getattr(args, "all", True):
+        raise SystemExit("Indique repositórios (owner/nome), --owner, --match ou --all.")
+
+    repos = service.load_repos().repos
+    wanted = set(names)
+    selected = []
+    for repo in repos:
+        if wanted and repo.full_name not in wanted and repo.name not in wanted:
+            continue
+        if owner and repo.full_name.split("/", 1)[0].lower() != owner.lower():
+            continue
+        if match and match.lower() not in repo.full_name.lower():
+            continue
+        selected.append(repo)
+    missing = wanted - {repo.full_name for repo in selected} - {repo.name for repo in selected}
+    if missing:
+        raise SystemExit(f"Repositórios não encontrados: {', '.join(sorted(missing))}")
+    return selected
+
+
+def _repo_record(repo: RepoSummary) -> Dict[str, Any]:
+    return {name: getattr(repo, name) for name in RepoSummary.__slots__}
+
+
+# --- Comandos ---
+
+def cmd_repos(args: argparse.Namespace, out: Output) -> None:
+    service = make_service(args)
+    if args.graphql:
+        _, repos = service.load_repos_graphql()
+    else:
+        repos = select_repos(service, args)
+    for repo in repos:
+        issues = f"  ({repo.open_issues} issues)" if repo.open_issues is not None else ""
+        out.emit(_repo_record(repo), f"{repo.full_name}{issues}")
+
+
+def cmd_issues(args: argparse.Namespace, out: Output) -> None:
+    service = make_service(args)
+
+    def work(repo: RepoSummary) -> None:
+        try:
+            issues, _ = service.list_issues(repo.full_name)
+        except Exception as e:
+            out.error("issues", repo.full_name, e)
+            return
+        for issue in issues:
+            out.emit({"repo": repo.full_name, "number": issue.number, "title": issue.title,
+                      "user": issue.user_login, "created_at": issue.created_at,
+                      "labels": list(issue.labels)},
+                     f"{repo.full_name}#{issue.number}  {issue.title}")
+
+    run_parallel(select_repos(service, args), work, args.jobs)
+
+
+def cmd_create_repo(args: argparse.Namespace, out: Output) -> None:
+    service = make_service(args)
+    try:
+        repo = service.create_repo(args.name, args.description, private=args.private,
+                                   auto_init=args.readme)
+    except Exception as e:
+        out.error("create-repo", args.name, e)
+        return
+    out.emit(dict(_repo_record(repo), op="create-repo", ok=True),
+             f"✓ Repositório '{repo.full_name}' criado.")
+
+
+def cmd_delete_repo(args: argparse.Namespace, out: Output) -> None:
+    if not args.yes:
+        raise SystemExit("Apagar é irreversível: confirme com --yes.")
+    service = make_service(args)
+
+    def work(full_name: str) -> None:
+        try:
+            service.delete_repo(full_name)
+        except Exception as e:
+            out.error("delete-repo", full_name, e)
+            return
+        out.emit({"op": "delete-repo", "target": full_name, "ok": True},
+                 f"✓ Repositório '{full_name}' excluído.")
+
+    run_parallel(args.full_names, work, args.jobs)
+
+
+def cmd_create_issue(args: argparse.Namespace, out: Output) -> None:
+    service = make_service(args)
+    try:
+        number = service.create_issue(args.repo, args.title, args.body)
+    except Exception as e:
+        out.error("create-issue", args.repo, e)
+        return
+    out.emit({"op": "create-issue", "target": args.repo, "ok": True, "number": number},
+             f"✓ Tarefa #{number} criada em {args.repo}.")
+
+
+def clone_options_from_args(args: argparse.Namespace) -> clone_options.CloneOptions:
+    """O preset escolhido, com as opções dadas explicitamente por cima."""
+    options = clone_options.preset(args.preset)
+    try:
+        return clone_options.CloneOptions(
+            depth=args.depth if args.depth is not None else options.depth,
+            filter=args.filter or options.filter,
+            single_branch=args.single_branch or options.single_branch,
+            branch=args.branch or options.branch,
+            sparse_paths=args.sparse or options.sparse_paths,
+            recurse_submodules=args.recurse_submodules or options.recurse_submodules,
+            submodule_jobs=args.submodule_jobs or options.submodule_jobs,
+            lfs_skip_smudge=args.lfs_skip_smudge or options.lfs_skip_smudge,
+        )
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+
+def cmd_clone(args: argparse.Namespace, out: Output) -> None:
+    service = make_service(args)
+
+    def on_result(result: bulk_clone.CloneResult, stats: bulk_clone.BulkCloneStats) -> None:
+        if result.status == bulk_clone.FAILED:
+            out.error("clone", result.full_name, services.ServiceError(result.error),
+                      path=str(result.path), seconds=round(result.seconds, 3))
+            return
+        out.emit(dict(result.as_dict(), op="clone", target=result.full_name),
+                 f"{'✓' if result.ok else '✗'} {result.full_name} {result.status} -> {result.path} "
+                 f"({result.bytes / 1024 ** 2:.1f} MB, {result.seconds:.1f}s)")
+        _progress(stats.progress_text())
+
+    def on_progress(repo: RepoSummary, snapshot: git_progress.ProgressSnapshot,
+                    stats: bulk_clone.BulkCloneStats) -> None:
+        LIVE.show(f"{stats.progress_text()} · {repo.name}: {snapshot.text()}")
+
+    stats = bulk_clone.clone_many(select_repos(service, args), Path(args.dest).expanduser(),
+                                  args.jobs, args.if_exists, on_result=on_result,
+                                  on_progress=on_progress,
+                                  options=clone_options_from_args(args),
+                                  mirrors=mirror_store.MirrorStore(args.mirror_dir) if args.mirror else None)
+    _progress(stats.summary())
+
+
+def lfs_options_from_args(args: argparse.Namespace) -> Optional[lfs.LfsOptions]:
+    if not (args.lfs or args.lfs_pattern):
+        return None
+    return lfs.LfsOptions(threshold_bytes=int(args.lfs_mb * 1024 ** 2) if args.lfs_mb else None,
+                          patterns=args.lfs_pattern, concurrent_transfers=args.lfs_transfers,
+                          endpoint=args.lfs_url)
+
+
+def cmd_push(args: argparse.Namespace, out: Output) -> None:
+    plan = staging.scan(args.path, int(args.large_mb * 1024 ** 2))
+    lfs_options = lfs_options_from_args(args)
+    to_lfs = set()
+    if lfs_options is not None:
+        to_lfs = set(lfs.covered(plan)) | {change.path for change in lfs.candidates(plan, lfs_options)}
+    exclude = [change.path for change in plan.large_files()
+               if change.path not in to_lfs] if args.skip_large else []
+    _progress(plan.summary(exclude))
+    if lfs_options is not None:
+        _progress(f"📦 Git LFS ({lfs_options.describe()}): {len(to_lfs)} ficheiros")
+    if plan.suggested_gitignore and not args.gitignore:
+        _progress("ℹ️ Use --gitignore para criar o .gitignore sugerido antes do commit.")
+    if args.dry_run:
+        staging.discard(plan)
+        out.emit(dict(plan.as_dict(exclude), op="push", target=args.repo, ok=True, dry_run=True,
+                      lfs=sorted(to_lfs)),
+                 f"✓ {args.path}: nada enviado (--dry-run).")
+        return
+
+    service = make_service(args)
+    args.repos, args.all = [args.repo], False
+    repo = select_repos(service, args)[0]
+    try:
+        branch = services.push_local(args.path, repo.clone_url, report=_progress,
+                                     on_progress=_git_progress("⬆️"), plan=plan,
+                                     exclude=exclude, gitignore=args.gitignore,
+                                     lfs_options=lfs_options)
+    except Exception as e:
+        out.error("push", repo.full_name, e, path=args.path)
+        return
+    out.emit({"op": "push", "target": repo.full_name, "ok": True, "path": args.path,
+              "branch": branch, "excluded": exclude, "lfs": sorted(to_lfs)},
+             f"✓ {args.path} enviado para {repo.full_name} ({branch}).")
+
+
+def cmd_pull(args: argparse.Namespace, out: Output) -> None:
+    def work(path: str) -> None:
+        started = time.perf_counter()
+        try:
+            services.pull_repo(path, on_progress=_git_progress(f"⬇️ {path}:"))
+        except Exception as e:
+            out.error("pull", path, e)
+            return
+        elapsed = time.perf_counter() - started
+        out.emit({"op": "pull", "target": path, "ok": True, "elapsed_s": round(elapsed, 3)},
+                 f"✓ {path} atualizado ({elapsed:.1f}s)")
+
+    run_parallel(args.paths, work, args.jobs)
+
+
+def cmd_lfs_fetch(args: argparse.Namespace, out: Output) -> None:
+    def work(path: str) -> None:
+        started = time.perf_counter()
+        try:
+            count = services.fetch_lfs(path, report=_progress, include=args.include,
+                                       concurrent_transfers=args.transfers)
+        except Exception as e:
+            out.error("lfs-fetch", path, e)
+            return
+        elapsed = time.perf_counter() - started
+        out.emit({"op": "lfs-fetch", "target": path, "ok": True, "files": count,
+                  "elapsed_s": round(elapsed, 3)},
+                 f"✓ {path}: {count} ficheiros do Git LFS baixados ({elapsed:.1f}s)")
+
+    run_parallel(args.paths, work, args.jobs)
+
+
+# --- Argumentos ---
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description=__doc__.splitlines()[1])
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--token", help=f"token do GitHub (padrão: ${TOKEN_ENV})")
+    common.add_argument("--base-url", default=github_http.DEFAULT_BASE_URL,
+                        help="URL da API (ex: o emulador local)")
+    common.add_argument("--json", action="store_true", help="uma linha JSON por resultado")
+    common.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help="operações em paralelo (padrão: %(default)s)")
+    common.add_argument("--no-cache", action="store_true",
+                        help="não usa o cache local da lista de repositórios")
+    common.add_argument("--trace", type=Path, metavar="ARQUIVO",
+                        help="grava os spans no fim (.jsonl ou Chrome trace)")
+
+    selection = argparse.ArgumentParser(add_help=False)
+    selection.add_argument("repos", nargs="*", metavar="REPO", help="owner/nome (ou só o nome)")
+    selection.add_argument("--owner", help="só repositórios deste dono/organização")
+    selection.add_argument("--match", help="só repositórios cujo nome contém este texto")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    repos = commands.add_parser("repos", parents=[common, selection], help="lista os repositórios")
+    repos.add_argument("--graphql", action="store_true", help="carrega pelo GraphQL (com nº de issues)")
+    repos.set_defaults(func=cmd_repos, all=True)
+
+    issues = commands.add_parser("issues", parents=[common, selection],
+                                 help="lista as issues abertas")
+    issues.add_argument("--all", action="store_true", help="de todos os repositórios")
+    issues.set_defaults(func=cmd_issues)
+
+    create_repo = commands.add_parser("create-repo", parents=[common], help="cria um repositório")
+    create_repo.add_argument("name")
+    create_repo.add_argument("--description", default="")
+    create_repo.add_argument("--private", action="store_true")
+    create_repo.add_argument("--readme", action="store_true", help="inicializa com README")
+    create_repo.set_defaults(func=cmd_create_repo)
+
+    delete_repo = commands.add_parser("delete-repo", parents=[common], help="apaga repositórios")
+    delete_repo.add_argument("full_names", nargs="+", metavar="REPO")
+    delete_repo.add_argument("--yes", action="store_true", help="confirma a exclusão")
+    delete_repo.set_defaults(func=cmd_delete_repo)
+
+    create_issue = commands.add_parser("create-issue", parents=[common], help="cria uma issue")
+    create_issue.add_argument("repo", metavar="REPO")
+    create_issue.add_argument("--title", required=True)
+    create_issue.add_argument("--body", default="")
+    create_issue.set_defaults(func=cmd_create_issue)
+
+    clone = commands.add_parser("clone", parents=[common, selection], help="clona repositórios")
+    clone.add_argument("--dest", required=True, help="pasta onde clonar")
+    clone.add_argument("--all", action="store_true", help="todos os repositórios")
+    clone.add_argument("--if-exists", choices=bulk_clone.IF_EXISTS_POLICIES,
+                       default=bulk_clone.IF_EXISTS_SKIP,
+                       help="pasta já existe: ignorar, atualizar (pull) ou erro (padrão: %(default)s)")
+    mode = clone.add_argument_group("modo do clone")
+    mode.add_argument("--preset", choices=list(clone_options.PRESETS),
+                      default=clone_options.DEFAULT_PRESET,
+                      help="; ".join(f"{name}: {label}" for name, (label, _) in
+                                     clone_options.PRESETS.items()) + " (padrão: %(default)s)")
+    mode.add_argument("--depth", type=int, help="clone raso com N commits")
+    mode.add_argument("--filter", choices=clone_options.FILTERS, help="clone parcial")
+    mode.add_argument("--single-branch", action="store_true")
+    mode.add_argument("--branch")
+    mode.add_argument("--sparse", nargs="+", metavar="CAMINHO", help="sparse-checkout destes caminhos")
+    mode.add_argument("--recurse-submodules", action="store_true")
+    mode.add_argument("--submodule-jobs", type=int, help="submódulos baixados em paralelo")
+    mode.add_argument("--lfs-skip-smudge", action="store_true",
+                      help="deixa os binários do Git LFS como ponteiros (baixe depois com lfs-fetch)")
+    mode.add_argument("--mirror", action="store_true",
+                      help="reaproveita os objetos de um espelho local (ver mirror_store.py)")
+    mode.add_argument("--mirror-dir", type=Path, help=f"padrão: {mirror_store.default_mirrors_dir()}")
+    clone.set_defaults(func=cmd_clone)
+
+    push = commands.add_parser("push", parents=[common],
+                               help="liga uma pasta a um repositório e faz push")
+    push.add_argument("path")
+    push.add_argument("repo", metavar="REPO")
+    push.add_argument("--gitignore", action="store_true",
+                      help="sem .gitignore, cria o modelo sugerido para as linguagens do projeto")
+    push.add_argument("--skip-large", action="store_true",
+                      help="deixa de fora do commit os ficheiros a partir de --large-mb")
+    push.add_argument("--large-mb", type=float, default=staging.LARGE_FILE_BYTES / 1024 ** 2,
+                      help="tamanho a partir do qual um ficheiro é grande (padrão: %(default)s)")
+    push.add_argument("--dry-run", action="store_true", help="só mostra o que seria enviado")
+    push_lfs = push.add_argument_group("Git LFS")
+    push_lfs.add_argument("--lfs", action="store_true",
+                          help="envia pelo Git LFS os ficheiros a partir de --lfs-mb")
+    push_lfs.add_argument("--lfs-mb", type=float,
+                          default=lfs.DEFAULT_THRESHOLD_BYTES / 1024 ** 2,
+                          help="0 = só pelos padrões (padrão: %(default)s)")
+    push_lfs.add_argument("--lfs-pattern", nargs="+", default=[], metavar="PADRÃO",
+                          help='padrões do .gitattributes (ex: "*.psd"); implica --lfs')
+    push_lfs.add_argument("--lfs-transfers", type=int, default=lfs.DEFAULT_CONCURRENT_TRANSFERS,
+                          help="objetos LFS enviados em paralelo (padrão: %(default)s)")
+    push_lfs.add_argument("--lfs-url", help="servidor LFS (ex: o de lfs_emulator.py)")
+    push.set_defaults(func=cmd_push)
+
+    pull = commands.add_parser("pull", parents=[common], help="git pull em várias pastas")
+    pull.add_argument("paths", nargs="+", metavar="PASTA")
+    pull.set_defaults(func=cmd_pull)
+
+    lfs_fetch = commands.add_parser("lfs-fetch", parents=[common],
+                                    help="baixa os binários do Git LFS que ficaram como ponteiros")
+    lfs_fetch.add_argument("paths", nargs="+", metavar="PASTA")
+    lfs_fetch.add_argument("--include", nargs="+", default=[], metavar="PADRÃO",
+                           help="só estes caminhos/padrões")
+    lfs_fetch.add_argument("--transfers", type=int, default=lfs.DEFAULT_CONCURRENT_TRANSFERS,
+                           help="objetos baixados em paralelo por pasta (padrão: %(default)s)")
+    lfs_fetch.set_defaults(func=cmd_lfs_fetch)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Uma conexão keep-alive por operação em paralelo (+ as páginas da lista)
+    github_http.configure_pool(args.jobs + services.REPO_FETCH_WORKERS)
+    out = Output(args.json)
+    try:
+        with tracing.TRACER.span(f"cli {args.command}"):
+            args.func(args, out)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # A saída foi fechada (ex: `| head`): para sem traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        LIVE.clear()
+        if args.trace:
+            count = tracing.TRACER.export(args.trace)
+            _progress(f"💾 {count} spans gravados em {args.trace}")
+    return 1 if out.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
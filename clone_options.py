@@ -0,0 +1,190 @@
+"""
+Modos de clone: raso (`--depth`), parcial (`--filter=blob:none` / `tree:0`),
+um só branch, sparse-checkout por caminhos, submódulos em paralelo e
+binários do Git LFS sob demanda (ficam como ponteiros; ver `lfs`).
+
+Um clone completo de um monorepo traz todo o histórico e todos os blobs;
+para "só dar uma olhada" basta o último commit. `PRESETS` junta as
+combinações mais usadas e `CloneOptions` gera os argumentos do `git clone`
+(usados por `services.clone_repo`).
+
+O tamanho de um clone completo é estimado pelo `size` da API (KB do
+repositório no GitHub); `savings()` compara-o com o que foi baixado.
+"""
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+FILTER_BLOBLESS = "blob:none"  # Histórico completo, blobs baixados sob demanda
+FILTER_TREELESS = "tree:0"  # Só os commits; árvores e blobs sob demanda
+FILTERS = (FILTER_BLOBLESS, FILTER_TREELESS)
+DEFAULT_SUBMODULE_JOBS = 4
+# Com o git-lfs instalado, o checkout deixa os binários LFS como ponteiros
+SKIP_SMUDGE_ENV = {"GIT_LFS_SKIP_SMUDGE": "1"}
+# Caracteres que tornam um caminho do sparse-checkout num padrão (modo "no-cone")
+_GLOB_CHARS = set("*?[!")
+
+
+class CloneOptions:
+    """Como clonar: profundidade, filtro, branch, caminhos do sparse e submódulos."""
+
+    __slots__ = ("depth", "filter", "single_branch", "branch", "sparse_paths",
+                 "recurse_submodules", "submodule_jobs", "lfs_skip_smudge")
+
+    def __init__(self, depth: Optional[int] = None, filter: Optional[str] = None,
+                 single_branch: bool = False, branch: Optional[str] = None,
+                 sparse_paths: Sequence[str] = (), recurse_submodules: bool = False,
+                 submodule_jobs: int = DEFAULT_SUBMODULE_JOBS,
+                 lfs_skip_smudge: bool = False) -> None:
+        if depth is not None and depth < 1:
+            raise ValueError("A profundidade tem de ser pelo menos 1")
+        if filter is not None and filter not in FILTERS:
+            raise ValueError(f"Filtro desconhecido: {filter!r} (use {', '.join(FILTERS)})")
+        self.depth = depth
+        self.filter = filter
+        self.single_branch = single_branch
+        self.branch = branch or None
+        self.sparse_paths: Tuple[str, ...] = tuple(path.strip() for path in sparse_paths
+                                                   if path.strip())
+        self.recurse_submodules = recurse_submodules
+        self.submodule_jobs = max(1, submodule_jobs)
+        self.lfs_skip_smudge = lfs_skip_smudge  # Binários LFS baixados depois (lfs.pull_objects)
+
+    @property
+    def is_full(self) -> bool:
+        """Clone completo (tudo o que o `git clone` padrão traz)?"""
+        return (self.depth is None and self.filter is None and not self.single_branch
+                and not self.sparse_paths)
+
+    @property
+    def cone(self) -> bool:
+        """Sparse em modo "cone" (só pastas) — o mais rápido; padrões usam "no-cone"."""
+        return not any(_GLOB_CHARS & set(path) for path in self.sparse_paths)
+
+    def clone_flags(self, local: bool = False) -> List[str]:
+        """
+        Argumentos extra do `git clone`. Com `local` (clone a partir de um
+        espelho no disco), sem `--depth`/`--filter` — os objetos já estão cá e
+        são ligados por hardlink — e sem submódulos: os URLs relativos deles
+        só resolvem depois de o `origin` apontar para o GitHub.
+        """
+        flags: List[str] = []
+        if self.depth is not None and not local:
+            flags.append(f"--depth={self.depth}")
+        if self.filter and not local:
+            flags.append(f"--filter={self.filter}")
+        if self.single_branch:
+            flags.append("--single-branch")
+        if self.branch:
+            flags.append(f"--branch={self.branch}")
+        if self.sparse_paths:
+            flags.append("--sparse")  # Só os ficheiros da raiz até ao `sparse-checkout set`
+        if self.recurse_submodules and not local:
+            flags += ["--recurse-submodules", f"--jobs={self.submodule_jobs}"]
+            if self.depth is not None:
+                flags.append("--shallow-submodules")
+        return flags
+
+    def sparse_args(self) -> List[str]:
+        """Argumentos do `git sparse-checkout set` (vazio se não houver caminhos)."""
+        if not self.sparse_paths:
+            return []
+        return (["--cone"] if self.cone else ["--no-cone"]) + list(self.sparse_paths)
+
+    def clone_env(self) -> Optional[Dict[str, str]]:
+        """Variáveis extra do `git clone` (None = nenhuma)."""
+        return dict(SKIP_SMUDGE_ENV) if self.lfs_skip_smudge else None
+
+    def describe(self) -> str:
+        """Resumo curto para a barra de status (ex: "raso (1), sem blobs")."""
+        parts = []
+        if self.depth is not None:
+            parts.append(f"raso ({self.depth})")
+        if self.filter == FILTER_BLOBLESS:
+            parts.append("sem blobs")
+        elif self.filter == FILTER_TREELESS:
+            parts.append("sem árvores")
+        if self.single_branch or self.branch:
+            parts.append(f"branch {self.branch}" if self.branch else "um branch")
+        if self.sparse_paths:
+            parts.append(f"sparse: {', '.join(self.sparse_paths)}")
+        if self.recurse_submodules:
+            parts.append(f"submódulos ({self.submodule_jobs} em paralelo)")
+        if self.lfs_skip_smudge:
+            parts.append("LFS sob demanda")
+        return ", ".join(parts) or "completo"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CloneOptions) and other.as_dict() == self.as_dict()
+
+    def __repr__(self) -> str:
+        return f"CloneOptions({self.describe()})"
+
+
+# --- Presets ---
+# (chave, rótulo na UI, opções)
+PRESET_QUICK = "quick"
+PRESET_FULL = "full"
+PRESET_BLOBLESS = "blobless"
+PRESET_TREELESS = "treeless"
+
+PRESETS: Dict[str, Tuple[str, CloneOptions]] = {
+    PRESET_FULL: ("Completo (dev)", CloneOptions(recurse_submodules=True)),
+    PRESET_QUICK: ("Olhada rápida", CloneOptions(depth=1, single_branch=True,
+                                                 lfs_skip_smudge=True)),
+    PRESET_BLOBLESS: ("Parcial: histórico sem blobs",
+                      CloneOptions(filter=FILTER_BLOBLESS, recurse_submodules=True)),
+    PRESET_TREELESS: ("Parcial: só commits (CI)", CloneOptions(filter=FILTER_TREELESS,
+                                                               single_branch=True,
+                                                               lfs_skip_smudge=True)),
+}
+DEFAULT_PRESET = PRESET_FULL
+
+
+def preset(name: str) -> CloneOptions:
+    return CloneOptions(**PRESETS[name][1].as_dict())
+
+
+def preset_name(options: CloneOptions) -> Optional[str]:
+    """Chave do preset igual a `options` (None = personalizado)."""
+    return next((name for name, (_, preset_options) in PRESETS.items()
+                 if preset_options == options), None)
+
+
+# --- Tamanho ---
+
+def directory_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def downloaded_bytes(destination: Path) -> int:
+    """Bytes que o clone trouxe (o `.git`, sem a cópia de trabalho)."""
+    return directory_size(Path(destination) / ".git")
+
+
+def savings(downloaded: int, size_kb: Optional[int]) -> Optional[int]:
+    """Bytes poupados face a um clone completo (None se a API não disse o tamanho)."""
+    if not size_kb:
+        return None
+    return max(0, size_kb * 1024 - downloaded)
+
+
+def savings_text(downloaded: int, size_kb: Optional[int]) -> str:
+    """Ex: "12.0 MB baixados (~88% menos que um clone completo de 100.0 MB)"."""
+    text = f"{downloaded / 1024 ** 2:.1f} MB baixados"
+    saved = savings(downloaded, size_kb)
+    if saved:
+        full = size_kb * 1024  # type: ignore[operator]
+        text += (f" (~{saved / full:.0%} menos que um clone completo "
+                 f"de {full / 1024 ** 2:.1f} MB)")
+    return text
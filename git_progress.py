@@ -0,0 +1,164 @@
+"""
+Progresso ao vivo de clone/fetch/pull/push (o `--progress` do git).
+
+`TransferProgress` é passado como `progress=` ao GitPython (aceita qualquer
+callable com a assinatura do `RemoteProgress.update`). A cada linha do git
+atualiza a fase (contar, comprimir, receber, resolver...), os objetos, os
+bytes recebidos, o débito (MB/s) e a estimativa do tempo restante, e chama
+`on_update(snapshot)` — no máximo a cada `interval` segundos, mais uma vez
+em cada mudança ou fim de fase, para não inundar a UI thread.
+"""
+import re
+import time
+from typing import Callable, Optional
+
+# Códigos de operação do `git.RemoteProgress` (copiados para não importar o GitPython)
+BEGIN = 1
+END = 2
+STAGE_MASK = BEGIN | END
+COUNTING = 4
+COMPRESSING = 8
+WRITING = 16
+RECEIVING = 32
+RESOLVING = 64
+FINDING_SOURCES = 128
+CHECKING_OUT = 256
+
+PHASES = {
+    COUNTING: "contando objetos",
+    COMPRESSING: "comprimindo",
+    WRITING: "enviando",
+    RECEIVING: "recebendo",
+    RESOLVING: "resolvendo deltas",
+    FINDING_SOURCES: "procurando origens",
+    CHECKING_OUT: "checkout",
+}
+
+DEFAULT_INTERVAL = 0.25  # Segundos entre atualizações (fora mudanças de fase)
+# Peso da medida mais recente na média do débito (suaviza os picos)
+RATE_SMOOTHING = 0.3
+
+# Ex: ", 12.34 MiB | 2.50 MiB/s" (a mensagem que o git junta às fases de transferência)
+_BYTES_RE = re.compile(r"([\d.]+)\s*(bytes|KiB|MiB|GiB)\s*\|\s*([\d.]+)\s*(bytes|KiB|MiB|GiB)/s")
+_UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
+
+
+class ProgressSnapshot:
+    """Estado da transferência num instante."""
+
+    __slots__ = ("phase", "current", "total", "bytes", "rate", "eta", "elapsed", "finished")
+
+    def __init__(self, phase: str, current: int, total: Optional[int], bytes: int,
+                 rate: float, eta: Optional[float], elapsed: float, finished: bool) -> None:
+        self.phase = phase
+        self.current = current  # Objetos (ou ficheiros, no checkout) processados
+        self.total = total
+        self.bytes = bytes  # Bytes recebidos/enviados até agora
+        self.rate = rate  # Bytes por segundo (média suavizada)
+        self.eta = eta  # Segundos até ao fim da fase atual (None = desconhecido)
+        self.elapsed = elapsed
+        self.finished = finished  # Fim da fase atual
+
+    @property
+    def percent(self) -> Optional[float]:
+        return self.current * 100 / self.total if self.total else None
+
+    def text(self) -> str:
+        """Ex: "recebendo 45% (4500/10000) · 120.5 MB · 8.2 MB/s · ~12s"."""
+        parts = [self.phase]
+        if self.total:
+            parts[0] += f" {self.percent:.0f}% ({self.current}/{self.total})"
+        elif self.current:
+            parts[0] += f" ({self.current})"
+        if self.bytes:
+            parts.append(f"{self.bytes / 1024 ** 2:.1f} MB")
+        if self.rate:
+            parts.append(f"{self.rate / 1024 ** 2:.1f} MB/s")
+        if self.eta is not None and not self.finished:
+            parts.append(f"~{format_eta(self.eta)}")
+        return " · ".join(parts)
+
+    def __repr__(self) -> str:
+        return f"ProgressSnapshot({self.text()!r})"
+
+
+def format_eta(seconds: float) -> str:
+    seconds = int(seconds + 0.5)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}min {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}min"
+
+
+def parse_bytes(message: str) -> Optional[int]:
+    """Bytes transferidos na mensagem do git (None se ela não os traz)."""
+    match = _BYTES_RE.search(message or "")
+    if not match:
+        return None
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+OnProgress = Callable[[ProgressSnapshot], None]
+
+
+class TransferProgress:
+    """Callable para `progress=` do GitPython: agrega e limita as atualizações."""
+
+    def __init__(self, on_update: OnProgress,
+                 interval: float = DEFAULT_INTERVAL) -> None:
+        self.on_update = on_update
+        self.interval = interval
+        self.started_at = time.monotonic()
+        self.updates = 0  # Linhas recebidas do git
+        self.emitted = 0  # Chamadas a on_update
+        self.last: Optional[ProgressSnapshot] = None
+        self._phase = 0
+        self._phase_started = self.started_at
+        self._bytes = 0
+        self._rate = 0.0
+        self._rate_at = self.started_at
+        self._rate_bytes = 0
+        self._last_emit = 0.0
+
+    def __call__(self, op_code: int, cur_count: float, max_count: Optional[float] = None,
+                 message: str = "") -> None:
+        self.updates += 1
+        now = time.monotonic()
+        phase = op_code & ~STAGE_MASK
+        phase_changed = phase != self._phase
+        if phase_changed:
+            self._phase = phase
+            self._phase_started = now
+        finished = bool(op_code & END)
+
+        transferred = parse_bytes(message)
+        if transferred is not None:
+            self._bytes = max(self._bytes, transferred)
+            if now - self._rate_at >= self.interval:
+                sample = (self._bytes - self._rate_bytes) / (now - self._rate_at)
+                self._rate = sample if not self._rate else \
+                    RATE_SMOOTHING * sample + (1 - RATE_SMOOTHING) * self._rate
+                self._rate_at, self._rate_bytes = now, self._bytes
+
+        if not (phase_changed or finished or now - self._last_emit >= self.interval):
+            return
+        current = int(cur_count or 0)
+        total = int(max_count) if max_count else None
+        eta = None
+        phase_elapsed = now - self._phase_started
+        if total and current and phase_elapsed > 0:
+            eta = (total - current) * phase_elapsed / current
+        # O débito só faz sentido enquanto há bytes a passar na rede
+        rate = self._rate if phase in (RECEIVING, WRITING) else 0.0
+        snapshot = ProgressSnapshot(PHASES.get(phase, "a transferir"), current, total,
+                                    self._bytes, rate, eta, now - self.started_at, finished)
+        self.last = snapshot
+        self._last_emit = now
+        self.emitted += 1
+        self.on_update(snapshot)
+
+
+def transfer(on_progress: Optional[OnProgress]) -> Optional[TransferProgress]:
+    """`progress=` para o GitPython (None se ninguém quer o progresso)."""
+    return TransferProgress(on_progress) if on_progress is not None else None
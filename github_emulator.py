@@ -0,0 +1,463 @@
+"""
+Emulador local da API do GitHub, para testes de carga sem rede nem quota.
+
+Implementa os endpoints REST (e a query GraphQL) que o app usa, com o mesmo
+comportamento que importa para o desempenho:
+
+- paginação com header `Link` (`next`/`last`) e `per_page`/`page`;
+- ETag em todas as listas, com 304 para `If-None-Match` (sem gastar quota);
+- headers `X-RateLimit-*` por token e 403 quando a quota acaba;
+- limites secundários injetados (403 com `Retry-After` a cada N pedidos);
+- latência (e jitter) injetada em cada resposta;
+- headers com nomes em minúsculas (`--lowercase-headers`), como mandam
+  alguns proxies (o HTTP não distingue maiúsculas nos nomes).
+
+As contas são sintéticas e determinísticas (ver `benchmarks/synthetic.py`):
+presets `small` (10 repositórios), `medium` (1 000) e `large` (50 000), cada
+repositório inicial com 0..`max_issues` issues abertas (os criados pela API
+começam sem issues). O JSON é gerado por página, não fica todo em memória.
+
+Uso:
+    python github_emulator.py --preset medium --port 8765 --latency-ms 40
+    python app.py --base-url http://127.0.0.1:8765
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from benchmarks.synthetic import synthetic_issue_json, synthetic_names, synthetic_repo_json
+
+DEFAULT_PORT = 8765
+DEFAULT_LOGIN = "octo"
+DEFAULT_RATE_LIMIT = 5000
+DEFAULT_PER_PAGE = 30  # Como no GitHub
+MAX_PER_PAGE = 100
+
+# nome -> (nº de repositórios, máximo de issues abertas por repositório)
+PRESETS: Dict[str, Tuple[int, int]] = {
+    "small": (10, 20),
+    "medium": (1000, 120),
+    "large": (50000, 250),
+}
+
+_REPO_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)(?P<rest>/.*)?$")
+
+
+class EmulatorConfig:
+    """Parâmetros do emulador (dados, quota e falhas injetadas)."""
+
+    def __init__(self, repos: int = PRESETS["small"][0], max_issues: int = PRESETS["small"][1],
+                 login: str = DEFAULT_LOGIN, seed: int = 42,
+                 rate_limit: int = DEFAULT_RATE_LIMIT, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, secondary_every: int = 0,
+                 secondary_retry_after: int = 1, lowercase_headers: bool = False) -> None:
+        self.repos = repos
+        self.max_issues = max_issues
+        self.login = login
+        self.seed = seed
+        self.rate_limit = rate_limit
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.secondary_every = secondary_every  # 0 = nunca
+        self.secondary_retry_after = secondary_retry_after
+        self.lowercase_headers = lowercase_headers  # `etag`, `link`... em vez de `ETag`, `Link`
+
+    @classmethod
+    def preset(cls, name: str, **overrides: Any) -> "EmulatorConfig":
+        repos, max_issues = PRESETS[name]
+        return cls(repos=repos, max_issues=max_issues, **overrides)
+
+
+class Quota:
+    """Quota de um token por recurso (core/graphql), como no GitHub."""
+
+    __slots__ = ("limit", "used", "reset_at")
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.used = 0
+        self.reset_at = int(time.time()) + 3600
+
+    def headers(self, resource: str) -> Dict[str, str]:
+        if time.time() >= self.reset_at:
+            self.used = 0
+            self.reset_at = int(time.time()) + 3600
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(0, self.limit - self.used)),
+            "X-RateLimit-Used": str(self.used),
+            "X-RateLimit-Reset": str(self.reset_at),
+            "X-RateLimit-Resource": resource,
+        }
+
+
+class EmulatorState:
+    """Conta sintética (repositórios, issues criadas) e contadores (seguro entre threads)."""
+
+    def __init__(self, config: EmulatorConfig) -> None:
+        self.config = config
+        self.lock = threading.Lock()
+        # Ordem de `/user/repos?sort=updated`: os criados depois vão para o início
+        self.names: List[str] = synthetic_names(config.repos, config.seed)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.private: Dict[str, bool] = {}  # Repositórios criados pelo emulador
+        self.next_index = config.repos
+        self.created_issues: Dict[str, List[Dict[str, Any]]] = {}
+        self.quotas: Dict[Tuple[str, str], Quota] = {}
+        self.requests = 0
+        self.not_modified = 0
+        self.secondary_limited = 0
+        self._rng = random.Random(config.seed)
+
+    # --- Dados ---
+    def repo_json(self, name: str, api_url: str) -> Dict[str, Any]:
+        repo = synthetic_repo_json(self.index[name], name, self.config.login,
+                                   self.config.seed, api_url)
+        if name in self.private:
+            repo["private"] = self.private[name]
+        repo["open_issues_count"] = self.issue_count(name)
+        return repo
+
+    def seeded_issue_count(self, name: str) -> int:
+        """Issues sintéticas: só os repositórios da conta inicial têm; os criados começam vazios."""
+        if self.index[name] >= self.config.repos:
+            return 0
+        rng = random.Random(f"{self.config.seed}:{name}:issues")
+        return rng.randint(0, self.config.max_issues)
+
+    def issue_count(self, name: str) -> int:
+        return self.seeded_issue_count(name) + len(self.created_issues.get(name, []))
+
+    def issues(self, name: str, api_url: str, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Issues [start, stop) da mais recente para a mais antiga (como o GitHub)."""
+        full_name = f"{self.config.login}/{name}"
+        created = self.created_issues.get(name, [])
+        total = self.issue_count(name)
+        page = []
+        for position in range(start, min(stop, total)):
+            if position < len(created):
+                page.append(created[-1 - position])
+            else:
+                number = total - position
+                page.append(synthetic_issue_json(full_name, number, self.config.seed, api_url))
+        return page
+
+    def quota(self, token: str, resource: str) -> Quota:
+        key = (token, resource)
+        quota = self.quotas.get(key)
+        if quota is None:
+            quota = self.quotas[key] = Quota(self.config.rate_limit)
+        return quota
+
+    def delay(self) -> float:
+        jitter = self._rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        return max(0.0, self.config.latency_ms + jitter) / 1000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, como o GitHub
+    server: "_Server"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    # --- Infraestrutura ---
+    @property
+    def state(self) -> EmulatorState:
+        return self.server.state
+
+    @property
+    def api_url(self) -> str:
+        return f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address[:2]}"
+
+    def _token(self) -> Optional[str]:
+        header = self.headers.get("Authorization") or ""
+        parts = header.split()
+        return parts[-1] if len(parts) == 2 else None
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send(self, status: int, data: Any = None, headers: Optional[Dict[str, str]] = None) -> None:
+        body = b"" if data is None or status == 304 else json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        lowercase = self.state.config.lowercase_headers
+        for name, value in (headers or {}).items():
+            self.send_header(name.lower() if lowercase else name, value)
+        if body:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _dispatch(self, method: str) -> None:
+        state = self.state
+        delay = state.delay()
+        if delay:
+            time.sleep(delay)
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        body = self._body() if method in ("POST", "PATCH") else {}
+
+        token = self._token()
+        if token is None:
+            self._send(401, {"message": "Requires authentication"})
+            return
+        resource = "graphql" if url.path == "/graphql" else "core"
+
+        with state.lock:
+            status, data, headers = self._respond(method, url.path, query, body, token, resource)
+        # Escreve fora do lock: respostas grandes não atrasam os outros pedidos
+        self._send(status, data, headers)
+
+    def _respond(self, method: str, path: str, query: Dict[str, str], body: Dict[str, Any],
+                 token: str, resource: str) -> Tuple[int, Any, Dict[str, str]]:
+        state = self.state
+        state.requests += 1
+        quota = state.quota(token, resource)
+        rate_headers = quota.headers(resource)
+        every = state.config.secondary_every
+        if every and state.requests % every == 0:
+            state.secondary_limited += 1
+            rate_headers["Retry-After"] = str(state.config.secondary_retry_after)
+            return 403, {"message": "You have exceeded a secondary rate limit."}, rate_headers
+        if quota.used >= quota.limit:
+            return 403, {"message": "API rate limit exceeded"}, rate_headers
+
+        status, data, extra = self._route(method, path, query, body)
+        if method == "GET" and status == 200:
+            extra["ETag"] = 'W/"%s"' % hashlib.sha1(json.dumps(data).encode("utf-8")).hexdigest()
+            if self.headers.get("If-None-Match") == extra["ETag"]:
+                # Pedidos condicionais com 304 não gastam quota
+                state.not_modified += 1
+                return 304, None, dict(rate_headers, **extra)
+        quota.used += 1
+        return status, data, dict(quota.headers(resource), **extra)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    # --- Rotas (chamadas com o lock do estado) ---
+    def _route(self, method: str, path: str, query: Dict[str, str],
+               body: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        state = self.state
+        if path == "/user" and method == "GET":
+            return 200, self._user_json(), {}
+        if path == "/user/repos" and method == "GET":
+            names = state.names
+            return self._paginate(path, query, len(names),
+                                  lambda a, b: [state.repo_json(n, self.api_url) for n in names[a:b]])
+        if path == "/user/repos" and method == "POST":
+            return self._create_repo(body)
+        if path == "/rate_limit" and method == "GET":
+            return 200, {"resources": {}}, {}
+        if path == "/graphql" and method == "POST":
+            return 200, self._graphql(body.get("variables") or {}), {}
+
+        match = _REPO_PATH.match(path)
+        if match and match.group("owner") == state.config.login and match.group("repo") in state.index:
+            name = match.group("repo")
+            rest = match.group("rest") or ""
+            if rest == "" and method == "GET":
+                return 200, state.repo_json(name, self.api_url), {}
+            if rest == "" and method == "DELETE":
+                state.names.remove(name)
+                del state.index[name]
+                state.created_issues.pop(name, None)
+                return 204, None, {}
+            if rest == "/issues" and method == "GET":
+                return self._paginate(path, query, state.issue_count(name),
+                                      lambda a, b: state.issues(name, self.api_url, a, b))
+            if rest == "/issues" and method == "POST":
+                return self._create_issue(name, body)
+        return 404, {"message": "Not Found"}, {}
+
+    def _paginate(self, path: str, query: Dict[str, str], total: int,
+                  items: Any) -> Tuple[int, Any, Dict[str, str]]:
+        per_page = min(MAX_PER_PAGE, max(1, int(query.get("per_page", DEFAULT_PER_PAGE))))
+        page = max(1, int(query.get("page", 1)))
+        last = max(1, -(-total // per_page))
+        data = items((page - 1) * per_page, page * per_page)
+
+        def link(number: int, rel: str) -> str:
+            params = dict(query, per_page=str(per_page), page=str(number))
+            return f'<{self.api_url}{path}?{urlencode(params)}>; rel="{rel}"'
+
+        links = []
+        if page < last:
+            links += [link(page + 1, "next"), link(last, "last")]
+        if page > 1:
+            links += [link(1, "first"), link(page - 1, "prev")]
+        return 200, data, {"Link": ", ".join(links)} if links else {}
+
+    def _user_json(self) -> Dict[str, Any]:
+        login = self.state.config.login
+        return {"login": login, "id": 1000, "type": "User", "name": "Octo Emulado",
+                "url": f"{self.api_url}/users/{login}",
+                "html_url": f"https://github.com/{login}",
+                "public_repos": len(self.state.names)}
+
+    def _create_repo(self, body: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        state = self.state
+        name = body.get("name") or ""
+        if not name or name in state.index:
+            return 422, {"message": "Repository creation failed.",
+                         "errors": [{"field": "name", "message": "name already exists on this account"}]}, {}
+        state.index[name] = state.next_index
+        state.next_index += 1
+        state.names.insert(0, name)
+        state.private[name] = bool(body.get("private", False))
+        repo = state.repo_json(name, self.api_url)
+        repo["description"] = body.get("description")
+        return 201, repo, {}
+
+    def _create_issue(self, name: str, body: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        state = self.state
+        if not body.get("title"):
+            return 422, {"message": "Validation Failed"}, {}
+        number = state.issue_count(name) + 1
+        issue = synthetic_issue_json(f"{state.config.login}/{name}", number,
+                                     state.config.seed, self.api_url)
+        issue.update(title=body["title"], body=body.get("body"),
+                     user={"login": state.config.login, "id": 1000, "type": "User"},
+                     labels=[], created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+        state.created_issues.setdefault(name, []).append(issue)
+        return 201, issue, {}
+
+    def _graphql(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Resposta de `graphql_loader.REPOSITORIES_QUERY` (cursor = posição na lista)."""
+        state = self.state
+        first = min(MAX_PER_PAGE, int(variables.get("first") or MAX_PER_PAGE))
+        start = int(variables.get("after") or 0)
+        names = state.names[start:start + first]
+        nodes = []
+        for name in names:
+            repo = state.repo_json(name, self.api_url)
+            nodes.append({
+                "name": name,
+                "nameWithOwner": repo["full_name"],
+                "url": repo["html_url"],
+                "createdAt": repo["created_at"],
+                "pushedAt": repo["pushed_at"],
+                "isPrivate": repo["private"],
+                "diskUsage": repo["size"],
+                "openIssues": {"totalCount": repo["open_issues_count"]},
+            })
+        end = start + len(names)
+        return {"data": {"viewer": {"login": state.config.login, "repositories": {
+            "totalCount": len(state.names),
+            "pageInfo": {"hasNextPage": end < len(state.names), "endCursor": str(end)},
+            "nodes": nodes,
+        }}}}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    state: EmulatorState
+
+
+class GitHubEmulator:
+    """
+    Servidor do emulador numa thread própria. Também é um context manager:
+
+        with GitHubEmulator(EmulatorConfig.preset("medium")) as emulator:
+            client = github_rest.RestClient("token", emulator.base_url)
+    """
+
+    def __init__(self, config: Optional[EmulatorConfig] = None, host: str = "127.0.0.1",
+                 port: int = 0) -> None:
+        self.config = config or EmulatorConfig()
+        self.state = EmulatorState(self.config)
+        self._server = _Server((host, port), _Handler)
+        self._server.state = self.state
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "GitHubEmulator":
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="github-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        with self.state.lock:
+            return {"requests": self.state.requests, "not_modified": self.state.not_modified,
+                    "secondary_limited": self.state.secondary_limited}
+
+    def __enter__(self) -> "GitHubEmulator":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--repos", type=int, help="nº de repositórios (substitui o preset)")
+    parser.add_argument("--max-issues", type=int, help="máximo de issues por repositório")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--login", default=DEFAULT_LOGIN)
+    parser.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--secondary-every", type=int, default=0,
+                        help="devolve um limite secundário a cada N pedidos (0 = nunca)")
+    parser.add_argument("--secondary-retry-after", type=int, default=1)
+    parser.add_argument("--lowercase-headers", action="store_true",
+                        help="manda os nomes dos headers em minúsculas (como alguns proxies)")
+    args = parser.parse_args()
+
+    config = EmulatorConfig.preset(
+        args.preset, login=args.login, rate_limit=args.rate_limit, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, secondary_every=args.secondary_every,
+        secondary_retry_after=args.secondary_retry_after,
+        lowercase_headers=args.lowercase_headers)
+    if args.repos is not None:
+        config.repos = args.repos
+    if args.max_issues is not None:
+        config.max_issues = args.max_issues
+
+    emulator = GitHubEmulator(config, args.host, args.port)
+    print(f"Emulador da API do GitHub em {emulator.base_url} "
+          f"({config.repos} repositórios, login {config.login!r}). Ctrl+C para sair.")
+    print(f"    python app.py --base-url {emulator.base_url}")
+    try:
+        emulator._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
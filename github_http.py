@@ -0,0 +1,298 @@
+"""
+Caminho comum de todos os pedidos HTTP à API do GitHub.
+
+Tanto o PyGithub (através das classes de conexão do `Requester`) como o
+`RestClient` passam por `send()`, que:
+
+1. pede uma vaga ao `RateLimiter` do token (ver `rate_limit`);
+2. regista o pedido como span de tracing (ver `tracing`);
+3. devolve a vaga com o status/headers e, num limite secundário, espera o
+   tempo indicado pelo servidor e repete o pedido.
+
+Todos usam também a mesma `requests.Session` (`shared_session()`), com um
+pool de conexões keep-alive do tamanho dos workers: as conexões TCP/TLS
+aquecidas sobrevivem a reconexões, e `pool_stats()` diz quantas foram
+abertas, reutilizadas ou esperadas.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import requests
+import requests.adapters
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection as _HTTPConnection
+from urllib3.connection import HTTPSConnection as _HTTPSConnection
+from urllib3.util.retry import Retry
+
+import rate_limit
+import tracing
+
+DEFAULT_BASE_URL = "https://api.github.com"
+BASE_URL_FLAG = "--base-url"
+MAX_RATE_LIMIT_RETRIES = 2
+DEFAULT_POOL_SIZE = 16  # Conexões keep-alive por host (ajustado pelo app aos workers)
+CONNECT_TIMEOUT = 5.0  # segundos
+READ_TIMEOUT = 30.0
+
+T = TypeVar("T")
+# (status, headers, corpo em bytes ou None se for um stream)
+Described = Tuple[int, Any, Optional[bytes]]
+
+
+# --- Pool de conexões partilhado ---
+
+class PoolStats:
+    """Contadores do pool (seguros entre threads)."""
+
+    __slots__ = ("connects", "checkouts", "reused", "waits", "wait_seconds", "_lock")
+
+    def __init__(self) -> None:
+        self.connects = 0  # Handshakes TCP (+TLS) feitos
+        self.checkouts = 0  # Conexões pedidas ao pool
+        self.reused = 0  # ... que já estavam abertas (keep-alive)
+        self.waits = 0  # ... que tiveram de esperar por uma conexão livre
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"connects": self.connects, "checkouts": self.checkouts,
+                    "reused": self.reused, "waits": self.waits,
+                    "wait_ms": round(self.wait_seconds * 1000, 1)}
+
+
+POOL_STATS = PoolStats()
+_WAIT_THRESHOLD = 0.001  # Checkouts mais lentos que isto contam como espera
+
+
+class _CountingHTTPConnection(_HTTPConnection):
+    def connect(self) -> None:
+        with POOL_STATS._lock:
+            POOL_STATS.connects += 1
+        super().connect()
+
+
+class _CountingHTTPSConnection(_HTTPSConnection):
+    def connect(self) -> None:
+        with POOL_STATS._lock:
+            POOL_STATS.connects += 1
+        super().connect()
+
+
+class _CountingPoolMixin:
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        started = time.perf_counter()
+        conn = super()._get_conn(timeout)  # type: ignore[misc]
+        waited = time.perf_counter() - started
+        with POOL_STATS._lock:
+            POOL_STATS.checkouts += 1
+            if conn.is_connected:
+                POOL_STATS.reused += 1
+            if waited > _WAIT_THRESHOLD:
+                POOL_STATS.waits += 1
+                POOL_STATS.wait_seconds += waited
+        return conn
+
+
+class _CountingHTTPPool(_CountingPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSPool(_CountingPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledAdapter(requests.adapters.HTTPAdapter):
+    """
+    Adapter com pool bloqueante do tamanho dos workers: com o pool cheio, o
+    pedido espera por uma conexão aquecida em vez de abrir (e deitar fora) outra.
+    """
+
+    def __init__(self, pool_size: int) -> None:
+        retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+        super().__init__(pool_connections=4, pool_maxsize=pool_size,
+                         pool_block=True, max_retries=retry)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPPool, "https": _CountingHTTPSPool}
+
+
+class TimeoutSession(requests.Session):
+    """Sessão com timeout (conexão, leitura) por omissão em todos os pedidos."""
+
+    def request(self, *args: Any, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        return super().request(*args, **kwargs)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_pool_size = DEFAULT_POOL_SIZE
+
+
+def configure_pool(pool_size: int) -> None:
+    """Define o tamanho do pool (antes do primeiro pedido; ex: nº total de workers)."""
+    global _pool_size
+    with _session_lock:
+        _pool_size = max(1, pool_size)
+        if _session is not None:
+            adapter = PooledAdapter(_pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+
+
+def shared_session() -> requests.Session:
+    """
+    A sessão HTTP única do processo. Não guarda credenciais: cada cliente envia
+    o seu header `Authorization`, por isso tokens diferentes partilham o pool.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = TimeoutSession()
+            session.auth = lambda request: request  # Não ler credenciais do ~/.netrc
+            session.headers["Accept-Encoding"] = "gzip, deflate"
+            adapter = PooledAdapter(_pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def pool_stats() -> Dict[str, Any]:
+    return POOL_STATS.as_dict()
+
+
+def base_url_from_argv(argv: List[str]) -> str:
+    """URL da API passado em `--base-url URL` (ex: o emulador local), senão o do GitHub."""
+    if BASE_URL_FLAG in argv:
+        index = argv.index(BASE_URL_FLAG)
+        if index + 1 < len(argv):
+            return argv[index + 1].rstrip("/")
+    return DEFAULT_BASE_URL
+
+
+def describe_requests(response: Any) -> Described:
+    """Status, headers e corpo de uma `requests.Response`."""
+    return response.status_code, response.headers, response.content
+
+
+def send(method: str, url: str, limiter: Optional[rate_limit.RateLimiter],
+         perform: Callable[[], T], describe: Callable[[T], Described],
+         retries: int = MAX_RATE_LIMIT_RETRIES) -> T:
+    """
+    (Worker Thread) Executa `perform()` respeitando o rate limit e com tracing.
+    Pode levantar `rate_limit.RateLimitExceeded` se a espera for longa demais.
+    """
+    resource = rate_limit.resource_for_url(url)
+    attempt = 0
+    while True:
+        if limiter:
+            limiter.acquire(resource)
+        status: Optional[int] = None
+        headers: Any = None
+        body: Optional[bytes] = None
+        started = time.perf_counter()
+        try:
+            with tracing.http_span(method, url) as span:
+                response = perform()
+                status, headers, body = describe(response)
+                tracing.record_http_response(span, status, headers, body)
+                if attempt:
+                    span.set(retry=attempt)
+        finally:
+            retry_in = None
+            if limiter:
+                text = body.decode("utf-8", "replace") if body and status in (403, 429) else ""
+                retry_in = limiter.release(status, headers, time.perf_counter() - started, text)
+        if retry_in is None or attempt >= retries:
+            return response
+        attempt += 1
+        # A espera em si acontece no próximo acquire() (até `blocked_until`)
+
+
+_pygithub_lock = threading.Lock()
+_pygithub_instrumented = False
+
+
+def instrument_pygithub(github_module: Any = None) -> None:
+    """
+    Faz os pedidos do PyGithub passarem por `send()`, trocando as classes de
+    conexão do `Requester` por subclasses. Tem de correr antes de criar o
+    primeiro `Github(...)` (o app chama-a quando o módulo `github` carrega).
+    """
+    global _pygithub_instrumented
+    with _pygithub_lock:
+        if _pygithub_instrumented:
+            return
+        from github import Requester as requester_module  # type: ignore
+
+        def shared_init(original: Callable[..., None]) -> Callable[..., None]:
+            def __init__(self: Any, *args: Any, **kwargs: Any) -> None:
+                original(self, *args, **kwargs)
+                # Troca a sessão própria (pool frio) pela sessão partilhada
+                self.session.close()
+                self.session = shared_session()
+            return __init__
+
+        def wrap_getresponse(original: Callable[[Any], Any]) -> Callable[[Any], Any]:
+            def getresponse(self: Any) -> Any:
+                url = f"{self.protocol}://{self.host}:{self.port}{self.url}"
+                limiter = rate_limit.limiter_for_authorization(
+                    (self.headers or {}).get("Authorization"))
+                # A sessão partilhada não tem o GithubRetry do PyGithub: send() repete
+                # os limites secundários (os pedidos recusados não tiveram efeito).
+                return send(self.verb, url, limiter, lambda: original(self),
+                            lambda r: (r.status, r.headers,
+                                       None if self.stream else r.response.content))
+            return getresponse
+
+        def keep_open(self: Any) -> None:
+            """A sessão é partilhada: fechar um cliente não fecha o pool."""
+
+        base_https = requester_module.HTTPSRequestsConnectionClass
+        base_http = requester_module.HTTPRequestsConnectionClass
+
+        class HTTPSConnection(base_https):
+            __init__ = shared_init(base_https.__init__)
+            getresponse = wrap_getresponse(base_https.getresponse)
+            close = keep_open
+
+        class HTTPConnection(base_http):
+            __init__ = shared_init(base_http.__init__)
+            getresponse = wrap_getresponse(base_http.getresponse)
+            close = keep_open
+
+        requester = requester_module.Requester
+        requester.injectConnectionClasses(HTTPConnection, HTTPSConnection)
+        # injectConnectionClasses desliga a reutilização da conexão (pensado para
+        # testes); sem isto cada pedido abriria uma sessão e um handshake TLS novos.
+        requester._Requester__persist = True
+        _pygithub_instrumented = True
+
+
+# --- Um cliente PyGithub por token ---
+_clients: Dict[Tuple[str, str], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def github_client(token: str, base_url: str = DEFAULT_BASE_URL) -> Any:
+    """
+    `Github` de longa duração para o token (reconectar com o mesmo token
+    devolve o mesmo cliente, e o pool partilhado mantém as conexões quentes).
+    """
+    import github  # type: ignore
+
+    instrument_pygithub()
+    key = (token, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = github.Github(
+                auth=github.Auth.Token(token), base_url=base_url,
+                pool_size=_pool_size, timeout=int(READ_TIMEOUT))
+        return client
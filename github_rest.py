@@ -0,0 +1,150 @@
+"""
+Cliente REST mínimo para a API do GitHub (usado onde o PyGithub não ajuda).
+
+Permite pedidos condicionais (If-None-Match / If-Modified-Since), que quando
+devolvem 304 não gastam a quota de rate limit.
+"""
+import re
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import github_http
+import rate_limit
+
+DEFAULT_BASE_URL = github_http.DEFAULT_BASE_URL
+DEFAULT_TIMEOUT = 15  # segundos
+
+_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
+
+
+def parse_link_header(header: Optional[str]) -> Dict[str, str]:
+    """Converte o header `Link` num dicionário {rel: url} (ex: "next", "last")."""
+    if not header:
+        return {}
+    return {rel: url for url, rel in _LINK_RE.findall(header)}
+
+
+def page_number(url: Optional[str]) -> Optional[int]:
+    """Extrai o parâmetro `page` de um URL de paginação (ex: o rel="last")."""
+    if not url:
+        return None
+    values = parse_qs(urlparse(url).query).get("page")
+    return int(values[0]) if values else None
+
+
+class RestResponse:
+    """
+    Resposta de um GET: status, corpo (já em JSON) e headers de cache/paginação.
+    Os nomes dos headers não distinguem maiúsculas (um proxy pode mandar `etag`).
+    """
+
+    __slots__ = ("status", "data", "etag", "last_modified", "links", "headers")
+
+    def __init__(self, status: int, data: Any, headers: Mapping[str, str]) -> None:
+        self.status = status
+        self.data = data
+        self.headers: CaseInsensitiveDict = CaseInsensitiveDict(headers)
+        self.etag: Optional[str] = self.headers.get("ETag")
+        self.last_modified: Optional[str] = self.headers.get("Last-Modified")
+        self.links = parse_link_header(self.headers.get("Link"))
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class RestError(Exception):
+    """Erro HTTP devolvido pela API REST do GitHub."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class RestClient:
+    """
+    Cliente autenticado para a API REST do GitHub. Usa a sessão partilhada de
+    `github_http` (pool keep-alive comum a todos os clientes e threads); o token
+    vai em cada pedido, não na sessão.
+    """
+
+    def __init__(self, token: str, base_url: str = DEFAULT_BASE_URL,
+                 timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (github_http.CONNECT_TIMEOUT, timeout)
+        self.limiter = rate_limit.limiter_for_token(token)
+        self.session = github_http.shared_session()
+        self.headers = {
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+
+    def url_for(self, path_or_url: str) -> str:
+        if path_or_url.startswith("http"):
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    def get(self, path_or_url: str, params: Optional[Dict[str, Any]] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> RestResponse:
+        """GET condicional. Com `etag`/`last_modified`, pode devolver 304 (sem corpo)."""
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        # URL final (com a query) para o tracing e o rate limit verem o pedido real
+        prepared = requests.models.PreparedRequest()
+        prepared.prepare_url(self.url_for(path_or_url), params)
+        url = prepared.url
+        response = github_http.send(
+            "GET", url, self.limiter,
+            lambda: self.session.get(url, headers=headers, timeout=self.timeout),
+            github_http.describe_requests)
+
+        if response.status_code == 304:
+            return RestResponse(304, None, response.headers)
+        self._raise_for_status(response)
+        return RestResponse(response.status_code, response.json(), response.headers)
+
+    def post(self, path_or_url: str, payload: Dict[str, Any]) -> RestResponse:
+        """POST com corpo JSON (usado, por exemplo, pelo endpoint GraphQL)."""
+        url = self.url_for(path_or_url)
+        response = github_http.send(
+            "POST", url, self.limiter,
+            lambda: self.session.post(url, json=payload, headers=self.headers,
+                                      timeout=self.timeout),
+            github_http.describe_requests)
+        self._raise_for_status(response)
+        return RestResponse(response.status_code, response.json(), response.headers)
+
+    def _raise_for_status(self, response: requests.Response) -> None:
+        if response.status_code < 400:
+            return
+        if rate_limit.is_rate_limited(response.status_code, response.headers, response.text):
+            # Já se esperou/repetiu em github_http.send: agora avisa com a hora da renovação
+            raise rate_limit.RateLimitExceeded(self.limiter.blocked_until or None)
+        raise RestError(response.status_code, _error_message(response))
+
+    @property
+    def graphql_url(self) -> str:
+        """Endpoint GraphQL (no GitHub Enterprise, /api/v3 vira /api/graphql)."""
+        if self.base_url.endswith("/api/v3"):
+            return self.base_url[:-len("/v3")] + "/graphql"
+        return f"{self.base_url}/graphql"
+
+    def close(self) -> None:
+        """Nada a fechar: as conexões pertencem ao pool partilhado."""
+
+
+def _error_message(response: requests.Response) -> str:
+    try:
+        return str(response.json().get("message", response.reason))
+    except ValueError:
+        return response.reason or "erro desconhecido"
+
@@ -0,0 +1,185 @@
+"""
+Carregador GraphQL: repositórios + nº de issues abertas numa só ida à API.
+
+Cada pedido traz 100 repositórios (paginação por cursor) com `createdAt`,
+`pushedAt`, `isPrivate` e `issues(states: OPEN) { totalCount }`, o que evita
+um pedido extra por repositório só para contar issues.
+
+O transporte é injetável: `HttpTransport` fala com a API, `FixtureTransport`
+repete respostas gravadas (para testar sem rede) e `RecordingTransport` grava.
+A fixture de exemplo foi gravada com páginas de 3 (`first: 3`), para a
+repetição também percorrer mais de uma página.
+
+Uso offline:
+    python graphql_loader.py --replay fixtures/graphql_repos.json
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from repo_models import RepoSummary
+
+PAGE_SIZE = 100
+
+REPOSITORIES_QUERY = """
+query($first: Int!, $after: String) {
+  viewer {
+    login
+    repositories(first: $first, after: $after,
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        url
+        createdAt
+        pushedAt
+        isPrivate
+        diskUsage
+        openIssues: issues(states: OPEN) { totalCount }
+      }
+    }
+  }
+}
+"""
+
+# Um transporte recebe (query, variáveis) e devolve o JSON completo da resposta
+Transport = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+
+class GraphQLError(Exception):
+    """A API respondeu, mas com erros GraphQL no corpo."""
+
+
+class HttpTransport:
+    """Envia a query para o endpoint GraphQL usando a sessão do RestClient."""
+
+    def __init__(self, rest_client: Any) -> None:
+        self.rest_client = rest_client
+
+    def __call__(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.rest_client.post(
+            self.rest_client.graphql_url, {"query": query, "variables": variables})
+        return response.data
+
+
+class FixtureTransport:
+    """
+    Repete respostas gravadas, indexadas pelo cursor `after` (None = 1ª página).
+    `page_size` é o `first` da gravação: pedir outro tamanho é um erro, porque
+    as páginas gravadas não teriam o número de itens pedido.
+    """
+
+    def __init__(self, path: Path) -> None:
+        recorded = json.loads(Path(path).read_text(encoding="utf-8"))
+        self.responses: Dict[str, Dict[str, Any]] = {
+            entry["variables"].get("after") or "": entry["response"] for entry in recorded}
+        self.page_size: int = recorded[0]["variables"]["first"] if recorded else PAGE_SIZE
+
+    def __call__(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        if variables.get("first") != self.page_size:
+            raise GraphQLError(f"Respostas gravadas com first={self.page_size}, "
+                               f"pedido com first={variables.get('first')}")
+        key = variables.get("after") or ""
+        if key not in self.responses:
+            raise GraphQLError(f"Nenhuma resposta gravada para o cursor {key!r}")
+        return self.responses[key]
+
+
+class RecordingTransport:
+    """Passa os pedidos para outro transporte e grava as respostas num ficheiro."""
+
+    def __init__(self, inner: Transport, path: Path) -> None:
+        self.inner = inner
+        self.path = Path(path)
+        self.recorded: List[Dict[str, Any]] = []
+
+    def __call__(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.inner(query, variables)
+        self.recorded.append({"variables": variables, "response": response})
+        self.path.write_text(json.dumps(self.recorded, indent=2), encoding="utf-8")
+        return response
+
+
+def summary_from_node(node: Dict[str, Any]) -> RepoSummary:
+    """Converte um nó `Repository` do GraphQL no mesmo resumo usado pelo REST."""
+    url = node["url"]
+    return RepoSummary(
+        name=node["name"],
+        full_name=node["nameWithOwner"],
+        html_url=url,
+        clone_url=f"{url}.git",
+        created_at=node.get("createdAt"),
+        private=bool(node.get("isPrivate", False)),
+        pushed_at=node.get("pushedAt"),
+        open_issues=(node.get("openIssues") or {}).get("totalCount"),
+        size_kb=node.get("diskUsage"),
+    )
+
+
+def load_repositories(transport: Transport,
+                      on_page: Optional[Callable[[List[RepoSummary], int, int], None]] = None,
+                      page_size: int = PAGE_SIZE) -> Tuple[str, List[RepoSummary]]:
+    """
+    Percorre todas as páginas de `viewer.repositories`.
+    `on_page(resumos, recebidos, total)` é chamado a cada página.
+    Devolve (login do utilizador, lista de resumos).
+    """
+    repos: List[RepoSummary] = []
+    login = ""
+    cursor: Optional[str] = None
+
+    while True:
+        payload = transport(REPOSITORIES_QUERY, {"first": page_size, "after": cursor})
+        if payload.get("errors"):
+            messages = "; ".join(error.get("message", "?") for error in payload["errors"])
+            raise GraphQLError(messages)
+
+        viewer = payload["data"]["viewer"]
+        login = viewer["login"]
+        connection = viewer["repositories"]
+        page = [summary_from_node(node) for node in connection["nodes"] if node]
+        repos.extend(page)
+        if on_page:
+            on_page(page, len(repos), connection["totalCount"])
+
+        page_info = connection["pageInfo"]
+        if not page_info["hasNextPage"]:
+            break
+        cursor = page_info["endCursor"]
+
+    return login, repos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Carrega repositórios via GraphQL.")
+    parser.add_argument("--replay", type=Path, help="ficheiro de respostas gravadas (offline)")
+    parser.add_argument("--token", help="token do GitHub (para carregar da API)")
+    parser.add_argument("--record", type=Path, help="grava as respostas da API neste ficheiro")
+    args = parser.parse_args()
+
+    transport: Transport
+    page_size = PAGE_SIZE
+    if args.replay:
+        transport = FixtureTransport(args.replay)
+        page_size = transport.page_size
+    elif args.token:
+        import github_rest
+        transport = HttpTransport(github_rest.RestClient(args.token))
+        if args.record:
+            transport = RecordingTransport(transport, args.record)
+    else:
+        parser.error("use --replay ARQUIVO ou --token TOKEN")
+
+    login, repos = load_repositories(transport, page_size=page_size)
+    print(f"{login}: {len(repos)} repositórios")
+    for repo in repos:
+        visibility = "privado" if repo.private else "público"
+        print(f"  {repo.full_name:<40} {visibility:<8} issues abertas: {repo.open_issues}")
+
+
+if __name__ == "__main__":
+    main()
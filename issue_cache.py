@@ -0,0 +1,136 @@
+"""
+Cache em memória (LRU + TTL) das issues abertas de cada repositório.
+
+Cada página de `/repos/{repo}/issues` é guardada com o seu ETag: dentro do TTL
+a lista é servida direto da memória; depois disso é revalidada com
+If-None-Match (páginas inalteradas voltam como 304 e não gastam quota).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+from repo_models import IssueSummary
+from tasks import CancelToken
+
+DEFAULT_MAX_REPOS = 64
+DEFAULT_TTL = 120.0  # segundos
+ISSUES_PER_PAGE = 100
+
+
+class IssuePage:
+    """Uma página de issues com o ETag usado para revalidar."""
+
+    __slots__ = ("etag", "issues")
+
+    def __init__(self, etag: Optional[str], issues: List[IssueSummary]) -> None:
+        self.etag = etag
+        self.issues = issues
+
+
+class IssueEntry:
+    """Issues em cache de um repositório."""
+
+    __slots__ = ("pages", "fetched_at")
+
+    def __init__(self, pages: List[IssuePage], fetched_at: float) -> None:
+        self.pages = pages
+        self.fetched_at = fetched_at
+
+    @property
+    def issues(self) -> List[IssueSummary]:
+        return [issue for page in self.pages for issue in page.issues]
+
+
+class IssueCache:
+    """LRU limitado por nº de repositórios, com TTL por entrada (seguro entre threads)."""
+
+    def __init__(self, max_repos: int = DEFAULT_MAX_REPOS, ttl: float = DEFAULT_TTL) -> None:
+        self.max_repos = max_repos
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, IssueEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, full_name: str) -> Optional[IssueEntry]:
+        """Entrada do repositório (mesmo expirada), marcando-a como usada."""
+        with self._lock:
+            entry = self._entries.get(full_name)
+            if entry is not None:
+                self._entries.move_to_end(full_name)
+            return entry
+
+    def is_fresh(self, entry: Optional[IssueEntry]) -> bool:
+        return entry is not None and time.monotonic() - entry.fetched_at < self.ttl
+
+    def get_fresh(self, full_name: str) -> Optional[List[IssueSummary]]:
+        """Issues do repositório se ainda estiverem dentro do TTL."""
+        entry = self.get(full_name)
+        return entry.issues if entry is not None and self.is_fresh(entry) else None
+
+    def put(self, full_name: str, pages: List[IssuePage]) -> None:
+        with self._lock:
+            self._entries[full_name] = IssueEntry(pages, time.monotonic())
+            self._entries.move_to_end(full_name)
+            while len(self._entries) > self.max_repos:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, full_name: str) -> None:
+        """Força a próxima leitura a revalidar (ex: depois de criar uma issue)."""
+        with self._lock:
+            entry = self._entries.get(full_name)
+            if entry is not None:
+                entry.fetched_at = float("-inf")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def load_issues(client: Any, cache: IssueCache, full_name: str, force: bool = False,
+                cancel: Optional[CancelToken] = None,
+                on_page: Optional[Callable[[List[IssueSummary]], None]] = None
+                ) -> Tuple[List[IssueSummary], bool]:
+    """
+    (Worker Thread) Devolve as issues abertas de `full_name`, usando o cache.
+    Dentro do TTL não faz pedidos (a menos que `force`); senão revalida cada
+    página com o ETag guardado. O segundo valor indica se nada mudou no servidor.
+    Com `cancel`, levanta `Cancelled` entre páginas (e nada vai para o cache).
+    `on_page(issues)` recebe cada página assim que ela chega.
+    """
+    entry = cache.get(full_name)
+    if entry is not None and not force and cache.is_fresh(entry):
+        if on_page:
+            on_page(entry.issues)
+        return entry.issues, True
+
+    old_pages = entry.pages if entry is not None else []
+    pages: List[IssuePage] = []
+    unchanged = True
+    page_number = 1
+    while True:
+        if cancel:
+            cancel.raise_if_cancelled()
+        old = old_pages[page_number - 1] if page_number <= len(old_pages) else None
+        response = client.get(
+            f"/repos/{full_name}/issues",
+            params={"state": "open", "per_page": ISSUES_PER_PAGE, "page": page_number},
+            etag=old.etag if old else None,
+        )
+        if response.not_modified and old:
+            page = old
+            has_next = page_number < len(old_pages) or len(old.issues) == ISSUES_PER_PAGE
+        else:
+            unchanged = False
+            page = IssuePage(response.etag, [IssueSummary.from_raw(raw) for raw in response.data])
+            has_next = "next" in response.links
+        if page.issues or page_number == 1:
+            pages.append(page)
+            if on_page and page.issues:
+                on_page(page.issues)
+        if not has_next or not page.issues:
+            break
+        page_number += 1
+
+    unchanged = unchanged and len(pages) == len(old_pages)
+    cache.put(full_name, pages)
+    return [issue for page in pages for issue in page.issues], unchanged
@@ -0,0 +1,139 @@
+"""
+Importação preguiçosa de módulos pesados e medição do tempo de arranque.
+
+Usado pelo app.py para que a primeira janela apareça antes de carregar
+pandas, matplotlib, PyGithub e GitPython (que só são necessários mais tarde).
+"""
+import builtins
+import importlib
+import sys
+import threading
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+PROFILE_FLAG = "--profile-startup"
+
+
+class ImportProfiler:
+    """Mede o tempo de cada import de topo e marcos do arranque (ex: primeira pintura)."""
+
+    active: Optional["ImportProfiler"] = None
+
+    def __init__(self) -> None:
+        self.started_at = perf_counter()
+        self.imports: List[Tuple[str, float]] = []
+        self.marks: List[Tuple[str, float]] = []
+        self._original_import: Any = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def install_if_requested(cls, argv: Sequence[str]) -> Optional["ImportProfiler"]:
+        """Instala o profiler se `--profile-startup` estiver na linha de comando."""
+        if PROFILE_FLAG not in argv:
+            return None
+        profiler = cls()
+        profiler.install()
+        return profiler
+
+    def install(self) -> None:
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        ImportProfiler.active = self
+
+    def uninstall(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name: str, globals: Any = None, locals: Any = None,
+                      fromlist: Any = (), level: int = 0) -> ModuleType:
+        depth = getattr(self._local, "depth", 0)
+        # Só mede imports de topo que ainda não foram carregados (tempo inclusivo)
+        if depth or level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._local.depth = depth + 1
+        start = perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._local.depth = depth
+            self.record_import(name, perf_counter() - start)
+
+    def record_import(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.imports.append((name, seconds))
+
+    def record_lazy_import(self, name: str, seconds: float) -> None:
+        """Regista (e mostra logo) um import adiado que só aconteceu no primeiro uso."""
+        self.record_import(name, seconds)
+        print(f"[startup] import adiado '{name}': {seconds * 1000:.1f} ms "
+              f"(em t={self.elapsed_ms():.0f} ms)")
+
+    def mark(self, label: str) -> None:
+        with self._lock:
+            self.marks.append((label, perf_counter() - self.started_at))
+
+    def elapsed_ms(self) -> float:
+        return (perf_counter() - self.started_at) * 1000
+
+    def report(self) -> str:
+        """Monta a tabela com os imports (mais lentos primeiro) e os marcos."""
+        with self._lock:
+            imports = sorted(self.imports, key=lambda item: item[1], reverse=True)
+            marks = list(self.marks)
+
+        lines = ["[startup] Imports (tempo inclusivo):"]
+        for name, seconds in imports:
+            lines.append(f"  {seconds * 1000:8.1f} ms  {name}")
+        total = sum(seconds for _, seconds in imports)
+        lines.append(f"  {total * 1000:8.1f} ms  TOTAL")
+        lines.append("[startup] Marcos:")
+        for label, seconds in marks:
+            lines.append(f"  {seconds * 1000:8.1f} ms  {label}")
+        return "\n".join(lines)
+
+
+class LazyModule(ModuleType):
+    """
+    Proxy que só importa o módulo real no primeiro acesso a um atributo.
+    `on_load(módulo)` corre uma vez, logo depois do import (ex: instrumentação).
+    """
+
+    def __init__(self, module_name: str,
+                 on_load: Optional[Callable[[ModuleType], None]] = None) -> None:
+        super().__init__(module_name)
+        self._lazy_name = module_name
+        self._lazy_on_load = on_load
+        self._lazy_module: Optional[ModuleType] = None
+        self._lazy_lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                start = perf_counter()
+                module = importlib.import_module(self._lazy_name)
+                if self._lazy_on_load:
+                    self._lazy_on_load(module)
+                self._lazy_module = module
+                if ImportProfiler.active:
+                    ImportProfiler.active.record_lazy_import(
+                        self._lazy_name, perf_counter() - start)
+            return self._lazy_module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._lazy_module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        # Só é chamado para atributos que não existem no proxy
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "carregado" if self.is_loaded else "adiado"
+        return f"<LazyModule '{self._lazy_name}' ({state})>"
@@ -0,0 +1,262 @@
+"""
+Git LFS: ficheiros grandes fora do histórico do git.
+
+No push (`services.push_local`), os ficheiros a partir de um tamanho ou que
+casam com padrões (`LfsOptions`) passam a ser rastreados no LFS antes do
+commit: uma linha no `.gitattributes` por ficheiro, e o `git add` guarda só
+o ponteiro. O `git push` envia os objetos pelo hook do LFS, com
+`lfs.concurrenttransfers` transferências em paralelo.
+
+No clone, `GIT_LFS_SKIP_SMUDGE=1` deixa os binários como ponteiros (o clone
+só traz o git); `pull_objects()` baixa-os depois, todos ou só alguns
+caminhos, também em paralelo.
+
+Precisa do `git-lfs` instalado (https://git-lfs.com). Para testar sem o
+GitHub, `lfs_emulator.py` é um servidor LFS local.
+
+Uso:
+    python lfs.py status ~/projeto
+    python lfs.py fetch ~/projeto [--include "assets/**"] [-j 8]
+"""
+import argparse
+import fnmatch
+import functools
+import re
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import staging
+import tracing
+from lazy_imports import LazyModule
+
+git = LazyModule("git", on_load=tracing.instrument_gitpython)
+
+DEFAULT_THRESHOLD_BYTES = staging.LARGE_FILE_BYTES
+DEFAULT_CONCURRENT_TRANSFERS = 8
+MAX_CONCURRENT_TRANSFERS = 32
+ATTRIBUTES = "filter=lfs diff=lfs merge=lfs -text"
+ATTRIBUTES_FILE_NAME = ".gitattributes"
+ATTRIBUTES_HEADER = "# Ficheiros grandes no Git LFS (Gestor GitHub)"
+# Um ponteiro LFS é um ficheiro de texto pequeno que começa assim
+POINTER_PREFIX = b"version https://git-lfs.github.com/spec/v1"
+POINTER_MAX_BYTES = 1024
+# Caracteres com significado num padrão do .gitattributes (escapados com "\")
+_PATTERN_CHARS = re.compile(r"([*?\[\]\\!#])")
+
+
+class LfsOptions:
+    """Que ficheiros vão para o LFS (tamanho e padrões) e quantas transferências em paralelo."""
+
+    __slots__ = ("threshold_bytes", "patterns", "concurrent_transfers", "endpoint")
+
+    def __init__(self, threshold_bytes: Optional[int] = DEFAULT_THRESHOLD_BYTES,
+                 patterns: Sequence[str] = (),
+                 concurrent_transfers: int = DEFAULT_CONCURRENT_TRANSFERS,
+                 endpoint: Optional[str] = None) -> None:
+        self.threshold_bytes = threshold_bytes  # None = só pelos padrões
+        self.patterns: Tuple[str, ...] = tuple(pattern.strip() for pattern in patterns
+                                               if pattern.strip())
+        self.concurrent_transfers = max(1, min(concurrent_transfers, MAX_CONCURRENT_TRANSFERS))
+        self.endpoint = endpoint or None  # `lfs.url` (None = o do remoto; ex: lfs_emulator.py)
+
+    def wants(self, change: staging.FileChange) -> bool:
+        """O ficheiro deve ir para o LFS?"""
+        if self.threshold_bytes is not None and change.size >= self.threshold_bytes:
+            return True
+        return matches(change.path, self.patterns)
+
+    def describe(self) -> str:
+        """Ex: "a partir de 50 MB, *.psd · 8 transferências em paralelo"."""
+        rules = list(self.patterns)
+        if self.threshold_bytes is not None:
+            rules.insert(0, f"a partir de {self.threshold_bytes / 1024 ** 2:.0f} MB")
+        return f"{', '.join(rules) or 'nada'} · {self.concurrent_transfers} transferências em paralelo"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"LfsOptions({self.describe()})"
+
+
+# --- Padrões e .gitattributes ---
+
+def matches(path: str, patterns: Iterable[str]) -> bool:
+    """
+    `path` casa com algum padrão? Como no .gitattributes: sem "/", o padrão
+    vale para o nome em qualquer pasta; com "/", para o caminho a partir da raiz.
+    """
+    name = PurePosixPath(path).name
+    for pattern in patterns:
+        if "/" in pattern.rstrip("/"):
+            if fnmatch.fnmatchcase(path, pattern.lstrip("/")):
+                return True
+        elif fnmatch.fnmatchcase(name, pattern.rstrip("/")):
+            return True
+    return False
+
+
+def path_pattern(path: str) -> str:
+    """Padrão do .gitattributes que casa só com este ficheiro (ancorado na raiz)."""
+    return "/" + _PATTERN_CHARS.sub(r"\\\1", path).replace(" ", "[[:space:]]")
+
+
+def _unescape(pattern: str) -> str:
+    """Inverso de `path_pattern` (para comparar com os caminhos)."""
+    return re.sub(r"\\(.)", r"\1", pattern.replace("[[:space:]]", " "))
+
+
+def tracked_patterns(root: Path) -> List[str]:
+    """Padrões do `.gitattributes` da raiz com `filter=lfs`."""
+    try:
+        lines = (Path(root) / ATTRIBUTES_FILE_NAME).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    patterns = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) > 1 and not fields[0].startswith("#") and "filter=lfs" in fields[1:]:
+            patterns.append(fields[0])
+    return patterns
+
+
+def is_tracked(path: str, patterns: Sequence[str]) -> bool:
+    """O caminho já é do LFS (por um padrão ou por uma linha só dele)?"""
+    for pattern in patterns:
+        if "\\" in pattern or "[[:space:]]" in pattern:
+            # Linha de `path_pattern`: compara o caminho literal
+            if _unescape(pattern).lstrip("/") == path:
+                return True
+        elif matches(path, [pattern]):
+            return True
+    return False
+
+
+def covered(plan: staging.StagePlan) -> List[str]:
+    """Caminhos do plano que o `.gitattributes` atual já manda para o LFS."""
+    patterns = tracked_patterns(plan.root)
+    if not patterns:
+        return []
+    return [change.path for change in plan.changes
+            if change.kind != staging.DELETED and is_tracked(change.path, patterns)]
+
+
+def candidates(plan: staging.StagePlan, options: LfsOptions) -> List[staging.FileChange]:
+    """Ficheiros do plano que devem passar a ir para o LFS (e ainda não vão)."""
+    already = set(covered(plan))
+    return [change for change in plan.changes
+            if change.kind in (staging.NEW, staging.MODIFIED, staging.RENAMED)
+            and change.path not in already and options.wants(change)]
+
+
+def track(root: Path, paths: Sequence[str]) -> Path:
+    """Acrescenta ao `.gitattributes` uma linha LFS por ficheiro. Devolve o caminho dele."""
+    attributes = Path(root) / ATTRIBUTES_FILE_NAME
+    try:
+        text = attributes.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        text = ""
+    if text and not text.endswith("\n"):
+        text += "\n"
+    if ATTRIBUTES_HEADER not in text:
+        text += ("\n" if text else "") + ATTRIBUTES_HEADER + "\n"
+    text += "".join(f"{path_pattern(path)} {ATTRIBUTES}\n" for path in paths)
+    attributes.write_text(text, encoding="utf-8")
+    return attributes
+
+
+# --- Ponteiros ---
+
+def is_pointer(path: Path) -> bool:
+    """O ficheiro é um ponteiro LFS (o binário ainda não foi baixado)?"""
+    try:
+        if Path(path).stat().st_size > POINTER_MAX_BYTES:
+            return False
+        with open(path, "rb") as handle:
+            return handle.read(len(POINTER_PREFIX)) == POINTER_PREFIX
+    except OSError:
+        return False
+
+
+def pending(repo: Any) -> List[str]:
+    """
+    Ficheiros do LFS que ainda são ponteiros. Não precisa do git-lfs: sem
+    ele, um clone deixa todos os binários LFS assim.
+    """
+    root = Path(repo.working_tree_dir)
+    output = repo.git.ls_files("-z", ":(attr:filter=lfs)")  # Segue todos os .gitattributes
+    return [path for path in output.split("\0") if path and is_pointer(root / path)]
+
+
+# --- git-lfs ---
+
+@functools.lru_cache(maxsize=1)
+def version() -> Optional[str]:
+    """Versão do `git-lfs` instalado (None se não houver)."""
+    try:
+        return git.Git().lfs("version").strip()
+    except Exception:  # GitCommandError ou git ausente
+        return None
+
+
+def install(repo: Any, skip_smudge: bool = False) -> None:
+    """
+    Liga os filtros e o hook de pre-push do LFS só neste repositório. Com
+    `skip_smudge`, os checkouts seguintes também deixam os binários como ponteiros.
+    """
+    args = ["install", "--local"]
+    if skip_smudge:
+        args.append("--skip-smudge")
+    repo.git.lfs(*args)
+
+
+def configure(repo: Any, options: LfsOptions) -> None:
+    """
+    Transferências em paralelo (`lfs.concurrenttransfers`, usado pelo push e
+    pelos fetch seguintes) e, se houver, o servidor LFS deste repositório.
+    """
+    repo.git.config("lfs.concurrenttransfers", str(options.concurrent_transfers))
+    if options.endpoint:
+        repo.git.config("lfs.url", options.endpoint)
+
+
+def pull_objects(repo: Any, include: Sequence[str] = (),
+                 concurrent_transfers: int = DEFAULT_CONCURRENT_TRANSFERS) -> None:
+    """Baixa os objetos LFS (todos, ou só os caminhos/padrões `include`) e troca os ponteiros."""
+    args = ["pull"]
+    if include:
+        args.append(f"--include={','.join(include)}")
+    repo.git(c=f"lfs.concurrenttransfers={concurrent_transfers}").lfs(*args)
+
+
+# --- Linha de comando ---
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    status = commands.add_parser("status", help="padrões rastreados e ficheiros por baixar")
+    status.add_argument("path", type=Path)
+    fetch = commands.add_parser("fetch", help="baixa os binários que ficaram como ponteiros")
+    fetch.add_argument("path", type=Path)
+    fetch.add_argument("--include", nargs="+", default=[], metavar="PADRÃO")
+    fetch.add_argument("-j", "--jobs", type=int, default=DEFAULT_CONCURRENT_TRANSFERS)
+    args = parser.parse_args()
+
+    repo = git.Repo(str(args.path))
+    if args.command == "status":
+        print(version() or "git-lfs não está instalado (https://git-lfs.com)")
+        for pattern in tracked_patterns(args.path):
+            print(f"  rastreado: {pattern}")
+        missing = pending(repo)
+        print(f"{len(missing)} ficheiros por baixar" + (":" if missing else "."))
+        for path in missing:
+            print(f"  {path}")
+    else:
+        if version() is None:
+            raise SystemExit("git-lfs não está instalado (https://git-lfs.com).")
+        pull_objects(repo, args.include, args.jobs)
+        print(f"✓ Objetos LFS baixados ({len(pending(repo))} continuam como ponteiros).")
+
+
+if __name__ == "__main__":
+    main()
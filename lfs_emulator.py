@@ -0,0 +1,317 @@
+"""
+Servidor Git LFS local, para testar push/clone com LFS sem o GitHub.
+
+Implementa a Batch API com o adaptador `basic` (o que o `git-lfs` usa por
+padrão): `POST .../info/lfs/objects/batch`, `PUT`/`GET` de cada objeto e
+`verify`, além de um `locks/verify` vazio (sem ele o git-lfs avisa a cada
+push). Os objetos ficam numa pasta, um ficheiro por OID, e o SHA-256 é
+conferido no upload.
+
+Para medir transferências em paralelo: latência por pedido, débito máximo
+por transferência (`--bandwidth-mbps`) e, em `stats()`, o pico de
+transferências simultâneas.
+
+Uso:
+    python lfs_emulator.py --port 8766 --latency-ms 30 --bandwidth-mbps 20
+    git config lfs.url http://127.0.0.1:8766/octo/app.git/info/lfs
+    python -m cli push ./pasta octo/app --lfs --lfs-url http://127.0.0.1:8766/octo/app.git/info/lfs
+"""
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_PORT = 8766
+LFS_MEDIA_TYPE = "application/vnd.git-lfs+json"
+CHUNK_BYTES = 64 * 1024
+
+# /<dono>/<repo>[.git]/info/lfs/<resto>
+_LFS_PATH = re.compile(r"^/(?P<repo>[^/]+/[^/]+?)(?:\.git)?/info/lfs/(?P<rest>.+)$")
+_OID = re.compile(r"^[0-9a-f]{64}$")
+
+
+class LfsStore:
+    """Objetos por repositório numa pasta, e as contagens das transferências."""
+
+    def __init__(self, root: Path, latency_ms: float = 0.0, bandwidth_mbps: float = 0.0) -> None:
+        self.root = Path(root)
+        self.latency_ms = latency_ms
+        self.bandwidth_mbps = bandwidth_mbps  # Por transferência; 0 = sem limite
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.uploads = 0
+        self.downloads = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.active = 0
+        self.peak_active = 0  # Máximo de transferências ao mesmo tempo
+
+    def path(self, repo: str, oid: str) -> Path:
+        return self.root / repo / oid[:2] / oid[2:4] / oid
+
+    def size(self, repo: str, oid: str) -> Optional[int]:
+        try:
+            return self.path(repo, oid).stat().st_size
+        except OSError:
+            return None
+
+    def transfer_started(self) -> None:
+        with self.lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def transfer_finished(self, upload: bool, size: int) -> None:
+        with self.lock:
+            self.active -= 1
+            if upload:
+                self.uploads += 1
+                self.bytes_in += size
+            else:
+                self.downloads += 1
+                self.bytes_out += size
+
+    def throttle(self, chunk_bytes: int) -> None:
+        """Espera o tempo que `chunk_bytes` levariam ao débito configurado."""
+        if self.bandwidth_mbps:
+            time.sleep(chunk_bytes / (self.bandwidth_mbps * 1024 ** 2))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    @property
+    def store(self) -> LfsStore:
+        return self.server.store
+
+    def _base_url(self, repo: str) -> str:
+        host = self.headers.get("Host") or "%s:%d" % self.server.server_address[:2]
+        return f"http://{host}/{repo}.git/info/lfs"
+
+    def _send(self, status: int, data: Any = None, content_type: str = LFS_MEDIA_TYPE) -> None:
+        body = b"" if data is None else json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _route(self) -> Optional[Tuple[str, str]]:
+        match = _LFS_PATH.match(self.path.split("?", 1)[0])
+        if not match:
+            self._send(404, {"message": "Not found"})
+            return None
+        if self.store.latency_ms:
+            time.sleep(self.store.latency_ms / 1000)
+        return match.group("repo"), match.group("rest")
+
+    def _json_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    # --- Métodos ---
+
+    def do_POST(self) -> None:
+        route = self._route()
+        if route is None:
+            return
+        repo, rest = route
+        body = self._json_body()
+        if rest == "objects/batch":
+            self._send(200, self._batch(repo, body))
+        elif rest == "verify":
+            size = self.store.size(repo, body.get("oid", ""))
+            if size is None or size != body.get("size"):
+                self._send(404, {"message": "Object does not exist"})
+            else:
+                self._send(200, {})
+        elif rest == "locks/verify":
+            self._send(200, {"ours": [], "theirs": []})
+        else:
+            self._send(404, {"message": "Not found"})
+
+    def do_PUT(self) -> None:
+        route = self._route()
+        if route is None:
+            return
+        repo, rest = route
+        oid = rest.rsplit("/", 1)[-1]
+        if not rest.startswith("objects/") or not _OID.match(oid):
+            self._send(404, {"message": "Not found"})
+            return
+        remaining = int(self.headers.get("Content-Length") or 0)
+        size = remaining
+        target = self.store.path(repo, oid)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f"{oid}.{threading.get_ident()}.tmp")
+        digest = hashlib.sha256()
+        self.store.transfer_started()
+        try:
+            with open(temp, "wb") as handle:
+                while remaining:
+                    chunk = self.rfile.read(min(CHUNK_BYTES, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    digest.update(chunk)
+                    handle.write(chunk)
+                    self.store.throttle(len(chunk))
+        finally:
+            self.store.transfer_finished(upload=True, size=size - remaining)
+        if remaining or digest.hexdigest() != oid:
+            temp.unlink(missing_ok=True)
+            self._send(422, {"message": "SHA-256 ou tamanho não confere"})
+            return
+        temp.replace(target)
+        self._send(200)
+
+    def do_GET(self) -> None:
+        route = self._route()
+        if route is None:
+            return
+        repo, rest = route
+        oid = rest.rsplit("/", 1)[-1]
+        size = self.store.size(repo, oid) if _OID.match(oid) else None
+        if not rest.startswith("objects/") or size is None:
+            self._send(404, {"message": "Object does not exist"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        sent = 0
+        self.store.transfer_started()
+        try:
+            with open(self.store.path(repo, oid), "rb") as handle:
+                while True:
+                    chunk = handle.read(CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    self.store.throttle(len(chunk))
+        finally:
+            self.store.transfer_finished(upload=False, size=sent)
+
+    # --- Batch API ---
+
+    def _batch(self, repo: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        operation = body.get("operation")
+        base = self._base_url(repo)
+        with self.store.lock:
+            self.store.batches += 1
+        objects = []
+        for item in body.get("objects", []):
+            oid, size = item.get("oid", ""), item.get("size", 0)
+            entry: Dict[str, Any] = {"oid": oid, "size": size, "authenticated": True}
+            stored = self.store.size(repo, oid) if _OID.match(oid) else None
+            href = f"{base}/objects/{oid}"
+            if not _OID.match(oid):
+                entry["error"] = {"code": 422, "message": "OID inválido"}
+            elif operation == "upload":
+                if stored != size:  # Já existente: sem ações (o cliente não reenvia)
+                    entry["actions"] = {"upload": {"href": href, "expires_in": 3600},
+                                        "verify": {"href": f"{base}/verify", "expires_in": 3600}}
+            elif stored is None:
+                entry["error"] = {"code": 404, "message": "Object does not exist"}
+            else:
+                entry["actions"] = {"download": {"href": href, "expires_in": 3600}}
+            objects.append(entry)
+        return {"transfer": "basic", "objects": objects, "hash_algo": "sha256"}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    store: LfsStore
+
+
+class LfsEmulator:
+    """
+    Servidor numa thread própria; também é um context manager:
+
+        with LfsEmulator() as server:
+            repo.git.config("lfs.url", server.lfs_url("octo/app"))
+    """
+
+    def __init__(self, root: Optional[Path] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0.0, bandwidth_mbps: float = 0.0) -> None:
+        self._temp_root = None if root is not None else tempfile.mkdtemp(prefix="lfs-emulator-")
+        self.store = LfsStore(Path(root or self._temp_root), latency_ms, bandwidth_mbps)
+        self._server = _Server((host, port), _Handler)
+        self._server.store = self.store
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def lfs_url(self, full_name: str) -> str:
+        """Valor de `lfs.url` para o repositório `dono/nome`."""
+        return f"{self.base_url}/{full_name}.git/info/lfs"
+
+    def start(self) -> "LfsEmulator":
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="lfs-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._temp_root:
+            shutil.rmtree(self._temp_root, ignore_errors=True)
+
+    def stats(self) -> Dict[str, int]:
+        store = self.store
+        with store.lock:
+            return {"batches": store.batches, "uploads": store.uploads,
+                    "downloads": store.downloads, "bytes_in": store.bytes_in,
+                    "bytes_out": store.bytes_out, "peak_active": store.peak_active}
+
+    def __enter__(self) -> "LfsEmulator":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--store", type=Path, help="pasta dos objetos (padrão: temporária)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0,
+                        help="débito máximo por transferência, em MB/s (0 = sem limite)")
+    args = parser.parse_args()
+
+    emulator = LfsEmulator(args.store, args.host, args.port, args.latency_ms, args.bandwidth_mbps)
+    print(f"Servidor LFS em {emulator.base_url} (objetos em {emulator.store.root}). Ctrl+C para sair.")
+    print(f"    git config lfs.url {emulator.lfs_url('octo/app')}")
+    try:
+        emulator._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator._server.server_close()
+        print(json.dumps(emulator.stats()))
+
+
+if __name__ == "__main__":
+    main()
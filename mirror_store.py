@@ -0,0 +1,334 @@
+"""
+Cache local de objetos git: um espelho bare (branches e tags) por
+repositório, atualizado com `git fetch --prune` incremental.
+
+Um clone novo sai do espelho local (clone por caminho: os packs são ligados
+por hardlink, sem copiar nem baixar nada) e depois o `origin` é reescrito
+para o URL do GitHub. O segundo clone de um repositório de 2 GB leva
+segundos, e só o que mudou desde o último fetch vem da rede.
+
+Porque não `--reference` (alternates): o clone ficaria a depender do espelho,
+e a remoção por LRU corromperia os clones antigos. Com hardlinks, remover um
+espelho nunca afeta os clones já feitos.
+
+O espaço ocupado respeita uma quota (`quota_bytes`): quando passa, os
+espelhos usados há mais tempo são removidos (nunca os que estão em uso).
+`refresh_stale()` atualiza em segundo plano os que não são buscados há muito.
+
+Uso:
+    python mirror_store.py list
+    python mirror_store.py refresh [--max-age-min 60]
+    python mirror_store.py evict [--quota-gb 20]
+"""
+import argparse
+import json
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import clone_options
+import git_progress
+import repo_cache
+import tracing
+from lazy_imports import LazyModule
+
+git = LazyModule("git", on_load=tracing.instrument_gitpython)
+
+MIRRORS_DIR_NAME = "mirrors"
+INDEX_FILE_NAME = "index.json"
+DEFAULT_QUOTA_BYTES = 20 * 1024 ** 3
+# Um espelho buscado há menos que isto é usado sem fetch (clones seguidos em lote)
+FRESH_SECONDS = 5 * 60
+# `refresh_stale()` atualiza os espelhos buscados há mais que isto
+REFRESH_AFTER_SECONDS = 60 * 60
+
+Report = Callable[[str], None]
+
+
+def _ignore(message: str) -> None:
+    pass
+
+
+def remote_head(repo: Any) -> Optional[str]:
+    """Branch padrão do `origin` (ex: "refs/heads/main"); None se o remoto não o diz."""
+    output = repo.git.ls_remote("--symref", "origin", "HEAD")
+    for line in output.splitlines():
+        if line.startswith("ref: ") and line.endswith("\tHEAD"):
+            return line[len("ref: "):-len("\tHEAD")]
+    return None
+
+
+def _sync_head(repo: Any) -> None:
+    """
+    Aponta o HEAD do espelho para o branch padrão do remoto. O `init --bare`
+    deixa-o em `refs/heads/master`: num remoto com `main`, um clone do
+    espelho ficaria num branch sem commits e sem ficheiros.
+    """
+    head = remote_head(repo)
+    if head and repo.git.for_each_ref(head):
+        repo.git.symbolic_ref("HEAD", head)
+
+
+def default_mirrors_dir() -> Path:
+    return repo_cache.default_cache_dir() / MIRRORS_DIR_NAME
+
+
+class MirrorEntry:
+    """Um espelho no índice: URL de origem, caminho, tamanho e datas de uso/fetch."""
+
+    __slots__ = ("url", "path", "size", "last_used", "last_fetched")
+
+    def __init__(self, url: str, path: str, size: int = 0, last_used: float = 0.0,
+                 last_fetched: float = 0.0) -> None:
+        self.url = url
+        self.path = path  # Relativo à pasta do store
+        self.size = size
+        self.last_used = last_used
+        self.last_fetched = last_fetched
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"MirrorEntry({self.url!r}, {self.size / 1024 ** 2:.1f} MB)"
+
+
+class MirrorStore:
+    """Espelhos bare partilhados entre clones, com quota e remoção por LRU."""
+
+    def __init__(self, root: Optional[Path] = None,
+                 quota_bytes: int = DEFAULT_QUOTA_BYTES) -> None:
+        self.root = Path(root) if root is not None else default_mirrors_dir()
+        self.quota_bytes = quota_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()  # Índice e contadores de uso
+        self._url_locks: Dict[str, threading.Lock] = {}  # Um clone/fetch por espelho
+        self._in_use: Dict[str, int] = {}
+        self._entries: Dict[str, MirrorEntry] = self._load_index()
+
+    # --- Índice ---
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_FILE_NAME
+
+    def _load_index(self) -> Dict[str, MirrorEntry]:
+        try:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        entries = {item["url"]: MirrorEntry(**item) for item in raw.get("mirrors", [])}
+        # Espelhos apagados à mão saem do índice
+        return {url: entry for url, entry in entries.items() if (self.root / entry.path).is_dir()}
+
+    def _save_index(self) -> None:
+        """Grava o índice (chamar com `_lock`). Escreve num temporário e troca."""
+        data = {"mirrors": [entry.as_dict() for entry in self._entries.values()]}
+        temp = self.index_path.with_suffix(".tmp")
+        temp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        temp.replace(self.index_path)
+
+    def entries(self) -> List[MirrorEntry]:
+        """Espelhos, dos usados mais recentemente para os mais antigos."""
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda entry: -entry.last_used)
+
+    @property
+    def total_size(self) -> int:
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
+
+    def mirror_path(self, clone_url: str) -> Path:
+        """Pasta do espelho: `<store>/<host>/<dono>/<nome>.git`."""
+        parsed = urlparse(clone_url)
+        if parsed.scheme:
+            host, path = parsed.hostname or "local", parsed.path
+        elif re.match(r"^[\w.-]+@[\w.-]+:", clone_url):  # SSH no formato git@host:dono/nome
+            host, path = clone_url.split("@", 1)[1].split(":", 1)
+        else:  # Caminho local
+            host, path = "local", clone_url
+        parts = [re.sub(r"[^A-Za-z0-9._-]", "_", part) for part in path.strip("/").split("/") if part]
+        name = (parts.pop() if parts else "repo").removesuffix(".git") + ".git"
+        return self.root.joinpath(host, *parts, name)
+
+    def _url_lock(self, clone_url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(clone_url, threading.Lock())
+
+    # --- Espelhos ---
+
+    def acquire(self, clone_url: str, report: Report = _ignore,
+                on_progress: Optional[git_progress.OnProgress] = None) -> Path:
+        """
+        Devolve o espelho de `clone_url`, criado ou atualizado (`fetch --prune`,
+        com progresso em `on_progress`) se preciso. Fica marcado como em uso
+        (não é removido pela quota) até `release(clone_url)`.
+        """
+        with self._lock:
+            self._in_use[clone_url] = self._in_use.get(clone_url, 0) + 1
+        try:
+            return self._ensure(clone_url, report, on_progress=on_progress)
+        except BaseException:
+            self.release(clone_url)
+            raise
+
+    def release(self, clone_url: str) -> None:
+        with self._lock:
+            count = self._in_use.get(clone_url, 0) - 1
+            if count > 0:
+                self._in_use[clone_url] = count
+            else:
+                self._in_use.pop(clone_url, None)
+        self.evict()
+
+    def _ensure(self, clone_url: str, report: Report, max_age: float = FRESH_SECONDS,
+                touch: bool = True,
+                on_progress: Optional[git_progress.OnProgress] = None) -> Path:
+        """Cria ou atualiza o espelho. `touch` conta como uso (para o LRU)."""
+        path = self.mirror_path(clone_url)
+        with self._url_lock(clone_url):
+            with self._lock:
+                entry = self._entries.get(clone_url)
+            now = time.time()
+            if entry is None or not path.is_dir():
+                report(f"🪞 Criando espelho local de {clone_url}...")
+                shutil.rmtree(path, ignore_errors=True)  # Restos de um espelho incompleto
+                path.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    self._create(clone_url, path, on_progress)
+                except BaseException:
+                    shutil.rmtree(path, ignore_errors=True)
+                    raise
+                fetched = True
+            elif now - entry.last_fetched > max_age:
+                report("🪞 Atualizando espelho local (git fetch)...")
+                self._fetch(git.Repo(str(path)), on_progress)
+                fetched = True
+            else:
+                fetched = False
+
+            with self._lock:
+                entry = self._entries.get(clone_url) or MirrorEntry(
+                    clone_url, path.relative_to(self.root).as_posix())
+                if touch or not entry.last_used:
+                    entry.last_used = now
+                if fetched:
+                    entry.last_fetched = now
+                    entry.size = clone_options.directory_size(path)
+                self._entries[clone_url] = entry
+                self._save_index()
+        return path
+
+    @staticmethod
+    def _fetch(repo: Any, on_progress: Optional[git_progress.OnProgress]) -> None:
+        repo.remotes.origin.fetch(prune=True, progress=git_progress.transfer(on_progress))
+        _sync_head(repo)
+
+    @classmethod
+    def _create(cls, clone_url: str, path: Path,
+                on_progress: Optional[git_progress.OnProgress] = None) -> None:
+        """
+        Espelho bare só com branches e tags. (`clone --mirror` traria também
+        `refs/pull/*` do GitHub: os objetos de todos os PRs, que um clone não usa.)
+        """
+        repo = git.Repo.init(str(path), bare=True)
+        repo.git.remote("add", "origin", clone_url)
+        repo.git.config("remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+        repo.git.config("--add", "remote.origin.fetch", "+refs/tags/*:refs/tags/*")
+        cls._fetch(repo, on_progress)
+
+    def refresh(self, clone_url: str, report: Report = _ignore) -> Path:
+        """Força um `fetch` do espelho (ou cria-o)."""
+        return self._ensure(clone_url, report, max_age=0)
+
+    def refresh_stale(self, max_age: float = REFRESH_AFTER_SECONDS,
+                      report: Report = _ignore) -> int:
+        """Atualiza os espelhos buscados há mais de `max_age` segundos. Devolve quantos."""
+        now = time.time()
+        stale = [entry.url for entry in self.entries() if now - entry.last_fetched > max_age]
+        refreshed = 0
+        for url in stale:
+            try:
+                self._ensure(url, report, max_age=max_age, touch=False)
+                refreshed += 1
+            except Exception as e:
+                report(f"✗ Falha ao atualizar o espelho de {url}: {e}")
+        return refreshed
+
+    def remove(self, clone_url: str) -> bool:
+        """Apaga um espelho (se não estiver em uso). Os clones já feitos não são afetados."""
+        with self._url_lock(clone_url):
+            with self._lock:
+                entry = self._entries.get(clone_url)
+                if entry is None or self._in_use.get(clone_url):
+                    return False
+                del self._entries[clone_url]
+                self._save_index()
+            path = self.root / entry.path
+            shutil.rmtree(path, ignore_errors=True)
+            # Apaga as pastas de dono/host que ficaram vazias
+            for parent in path.parents:
+                if parent == self.root or not parent.is_relative_to(self.root):
+                    break
+                try:
+                    parent.rmdir()
+                except OSError:
+                    break
+            return True
+
+    def evict(self, quota_bytes: Optional[int] = None) -> List[str]:
+        """Remove os espelhos menos usados até caber na quota. Devolve os URLs removidos."""
+        quota = self.quota_bytes if quota_bytes is None else quota_bytes
+        removed: List[str] = []
+        while True:
+            with self._lock:
+                total = sum(entry.size for entry in self._entries.values())
+                candidates = sorted((entry for url, entry in self._entries.items()
+                                     if not self._in_use.get(url)), key=lambda entry: entry.last_used)
+            if total <= quota or not candidates:
+                return removed
+            if self.remove(candidates[0].url):
+                removed.append(candidates[0].url)
+
+    def clear(self) -> int:
+        """Remove todos os espelhos que não estão em uso."""
+        return len(self.evict(quota_bytes=0))
+
+
+# --- Linha de comando ---
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", type=Path, help=f"padrão: {default_mirrors_dir()}")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="lista os espelhos")
+    refresh = commands.add_parser("refresh", help="atualiza os espelhos antigos")
+    refresh.add_argument("--max-age-min", type=float, default=REFRESH_AFTER_SECONDS / 60)
+    evict = commands.add_parser("evict", help="remove os menos usados até caber na quota")
+    evict.add_argument("--quota-gb", type=float, default=DEFAULT_QUOTA_BYTES / 1024 ** 3)
+    commands.add_parser("clear", help="remove todos os espelhos")
+    args = parser.parse_args()
+
+    store = MirrorStore(args.root)
+    if args.command == "list":
+        for entry in store.entries():
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.last_used))
+            print(f"{entry.size / 1024 ** 2:>9.1f} MB  {used}  {entry.url}")
+        print(f"Total: {store.total_size / 1024 ** 2:.1f} MB de "
+              f"{store.quota_bytes / 1024 ** 3:.0f} GB", flush=True)
+    elif args.command == "refresh":
+        count = store.refresh_stale(args.max_age_min * 60, report=print)
+        print(f"✓ {count} espelhos atualizados.")
+    elif args.command == "evict":
+        removed = store.evict(int(args.quota_gb * 1024 ** 3))
+        print(f"✓ {len(removed)} espelhos removidos.")
+    else:
+        print(f"✓ {store.clear()} espelhos removidos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Agendador de pedidos à API do GitHub ciente do rate limit.
+
+Todo pedido (PyGithub, `RestClient`, GraphQL) pede uma vaga ao `RateLimiter`
+do token antes de sair e devolve-a com o status e os headers da resposta:
+
+- o orçamento (`X-RateLimit-Remaining` / `Reset`) é acompanhado por recurso
+  ("core", "graphql"); perto do fim, o pré-carregamento (pista de segundo
+  plano) para e a quota que sobra fica para os cliques do utilizador;
+- a concorrência adapta-se por AIMD: sobe devagar enquanto as respostas são
+  rápidas, cai para metade num limite secundário e um pouco com latência alta;
+- num limite secundário (403/429 com `Retry-After`, ou quota a zero) todos os
+  pedidos esperam exatamente até ao momento indicado pelo servidor.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import tasks
+
+DEFAULT_CONCURRENCY = 4.0
+MIN_CONCURRENCY = 1.0
+MAX_CONCURRENCY = 8.0
+TARGET_LATENCY = 2.0  # segundos; acima disso a concorrência diminui
+BACKGROUND_RESERVE = 100  # Pedidos guardados para o trabalho interativo
+LOW_BUDGET_FRACTION = 0.1  # Abaixo de 10% da quota, no máximo 2 pedidos em paralelo
+SECONDARY_LIMIT_WAIT = 60.0  # Espera mínima sem Retry-After (recomendação do GitHub)
+MAX_WAIT = 90.0  # Mais do que isso: desiste com RateLimitExceeded (não congela a UI)
+
+
+class RateLimitExceeded(Exception):
+    """A quota acabou (ou o servidor pediu uma pausa longa)."""
+
+    def __init__(self, reset_at: Optional[float], message: str = "") -> None:
+        self.reset_at = reset_at
+        when = time.strftime("%H:%M", time.localtime(reset_at)) if reset_at else "?"
+        super().__init__(message or f"Limite de pedidos da API atingido (renova às {when})")
+
+
+def resource_for_url(url: str) -> str:
+    """Recurso de rate limit de um URL da API ("graphql", "search" ou "core")."""
+    path = url.split("?", 1)[0]
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+class Budget:
+    """Quota de um recurso, como informada pelo último header recebido."""
+
+    __slots__ = ("resource", "limit", "remaining", "reset_at")
+
+    def __init__(self, resource: str) -> None:
+        self.resource = resource
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # epoch (segundos)
+
+    def update(self, headers: Any) -> bool:
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return False
+        self.remaining = int(remaining)
+        limit = headers.get("X-RateLimit-Limit")
+        reset = headers.get("X-RateLimit-Reset")
+        if limit is not None:
+            self.limit = int(limit)
+        if reset is not None:
+            self.reset_at = float(reset)
+        return True
+
+    def exhausted(self, now: float) -> bool:
+        return self.remaining == 0 and self.reset_at is not None and now < self.reset_at
+
+    def __repr__(self) -> str:
+        return f"Budget({self.resource}: {self.remaining}/{self.limit})"
+
+
+class RateLimiter:
+    """Vagas para pedidos de um token: orçamento, AIMD e pausas do servidor."""
+
+    def __init__(self, max_concurrency: float = MAX_CONCURRENCY,
+                 target_latency: float = TARGET_LATENCY,
+                 background_reserve: int = BACKGROUND_RESERVE,
+                 max_wait: float = MAX_WAIT,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.background_reserve = background_reserve
+        self.max_wait = max_wait
+        self.clock = clock
+        self.concurrency = min(DEFAULT_CONCURRENCY, max_concurrency)
+        self.budgets: Dict[str, Budget] = {}
+        self.blocked_until = 0.0  # Pausa pedida pelo servidor (limite secundário)
+        self.in_flight = 0
+        self._waiting_interactive = 0
+        self._cond = threading.Condition()
+        self._listeners: List[Callable[["RateLimiter"], None]] = []
+
+    # --- Vagas ---
+    def acquire(self, resource: str = "core", background: Optional[bool] = None) -> None:
+        """
+        Espera por uma vaga. `background` (por omissão: a pista da tarefa atual)
+        cede sempre a vez aos pedidos interativos e não usa a reserva final.
+        Levanta `RateLimitExceeded` se a espera passar de `max_wait`.
+        """
+        if background is None:
+            background = tasks.current_lane() == tasks.BACKGROUND
+        with self._cond:
+            if not background:
+                self._waiting_interactive += 1
+            try:
+                while True:
+                    now = self.clock()
+                    wait = self._required_wait(resource, background, now)
+                    if wait > self.max_wait:
+                        raise RateLimitExceeded(now + wait)
+                    if wait <= 0 and self.in_flight < self._slots(resource) and \
+                            (not background or self._waiting_interactive == 0):
+                        self.in_flight += 1
+                        return
+                    self._cond.wait(timeout=wait if wait > 0 else 0.5)
+            finally:
+                if not background:
+                    self._waiting_interactive -= 1
+
+    def _required_wait(self, resource: str, background: bool, now: float) -> float:
+        wait = self.blocked_until - now
+        budget = self.budgets.get(resource)
+        if budget is not None and budget.reset_at is not None and budget.remaining is not None:
+            if budget.exhausted(now):
+                wait = max(wait, budget.reset_at - now)
+            elif background and budget.remaining <= self.background_reserve:
+                if self.max_wait < budget.reset_at - now:
+                    # O pré-carregamento não espera uma hora: desiste logo
+                    raise RateLimitExceeded(budget.reset_at, "Quota reservada para pedidos interativos")
+                wait = max(wait, budget.reset_at - now)
+        return wait
+
+    def _slots(self, resource: str) -> int:
+        slots = self.concurrency
+        budget = self.budgets.get(resource)
+        if budget is not None and budget.remaining is not None and budget.limit:
+            if budget.remaining <= budget.limit * LOW_BUDGET_FRACTION:
+                slots = min(slots, 2.0)
+        return max(1, int(slots))
+
+    def release(self, status: Optional[int], headers: Any, latency: float,
+                body: str = "") -> Optional[float]:
+        """
+        Devolve a vaga e aprende com a resposta. Devolve quantos segundos esperar
+        antes de repetir o pedido, se foi um limite secundário (senão None).
+        """
+        retry_in: Optional[float] = None
+        with self._cond:
+            self.in_flight -= 1
+            if headers is not None:
+                resource = headers.get("X-RateLimit-Resource") or "core"
+                budget = self.budgets.get(resource) or Budget(resource)
+                if budget.update(headers):
+                    self.budgets[resource] = budget
+
+            if status is not None and is_rate_limited(status, headers, body):
+                retry_in = self._retry_delay(headers)
+                self.blocked_until = max(self.blocked_until, self.clock() + retry_in)
+                self.concurrency = max(MIN_CONCURRENCY, self.concurrency / 2)
+            elif status is not None and status < 500:
+                if latency > self.target_latency:
+                    self.concurrency = max(MIN_CONCURRENCY, self.concurrency * 0.75)
+                else:
+                    self.concurrency = min(self.max_concurrency,
+                                           self.concurrency + 1 / self.concurrency)
+            self._cond.notify_all()
+        self._notify()
+        return retry_in
+
+    def _retry_delay(self, headers: Any) -> float:
+        retry_after = headers.get("Retry-After") if headers is not None else None
+        if retry_after is not None:
+            return max(0.0, float(retry_after))
+        if headers is not None and headers.get("X-RateLimit-Remaining") == "0":
+            reset = headers.get("X-RateLimit-Reset")
+            if reset is not None:
+                return max(0.0, float(reset) - self.clock()) + 1
+        return SECONDARY_LIMIT_WAIT
+
+    # --- Estado para a UI ---
+    def budget(self, resource: str = "core") -> Optional[Budget]:
+        with self._cond:
+            return self.budgets.get(resource)
+
+    def add_listener(self, callback: Callable[["RateLimiter"], None]) -> None:
+        self._listeners.append(callback)
+
+    def _notify(self) -> None:
+        for callback in self._listeners:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"Erro num ouvinte do rate limit: {e}")
+
+
+def is_rate_limited(status: int, headers: Any, body: str = "") -> bool:
+    """403/429 causado por rate limit (primário ou secundário), e não por permissões."""
+    if status not in (403, 429):
+        return False
+    if status == 429 or (headers is not None and (
+            headers.get("Retry-After") is not None or headers.get("X-RateLimit-Remaining") == "0")):
+        return True
+    return "rate limit" in body.lower()
+
+
+# --- Um limitador por token (a quota do GitHub é por utilizador/token) ---
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for_token(token: str) -> RateLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(token)
+        if limiter is None:
+            limiter = _limiters[token] = RateLimiter()
+        return limiter
+
+
+def limiter_for_authorization(header: Optional[str]) -> Optional[RateLimiter]:
+    """Limitador do token num header `Authorization: token XXX` / `Bearer XXX`."""
+    if not header:
+        return None
+    return limiter_for_token(header.split()[-1])
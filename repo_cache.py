@@ -0,0 +1,169 @@
+"""
+Cache persistente (SQLite) da lista de repositórios, por dono do token.
+
+Cada página de `/user/repos` é guardada com o seu ETag/Last-Modified, para
+que a próxima carga mostre tudo na hora e depois só revalide as páginas.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Política de despejo padrão
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+
+def default_cache_dir() -> Path:
+    """Pasta de cache do utilizador (XDG no Linux/macOS, LocalAppData no Windows)."""
+    if os.name == "nt" and os.environ.get("LocalAppData"):
+        base = Path(os.environ["LocalAppData"])
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "github_manager"
+
+
+def token_key(token: str) -> str:
+    """Identificador do token que pode ser guardado em disco (nunca o token em si)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class CachedPage:
+    """Uma página da listagem de repositórios guardada em cache."""
+
+    __slots__ = ("page", "etag", "last_modified", "items", "fetched_at")
+
+    def __init__(self, page: int, etag: Optional[str], last_modified: Optional[str],
+                 items: List[Dict[str, Any]], fetched_at: float) -> None:
+        self.page = page
+        self.etag = etag
+        self.last_modified = last_modified
+        self.items = items
+        self.fetched_at = fetched_at
+
+
+class RepoCache:
+    """Guarda as páginas de repositórios num ficheiro SQLite (seguro entre threads)."""
+
+    def __init__(self, path: Optional[Path] = None,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path or default_cache_dir() / "repos.sqlite3"
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS owners (
+                token_key   TEXT PRIMARY KEY,
+                login       TEXT NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                login         TEXT NOT NULL,
+                page          INTEGER NOT NULL,
+                etag          TEXT,
+                last_modified TEXT,
+                body          TEXT NOT NULL,
+                fetched_at    REAL NOT NULL,
+                accessed_at   REAL NOT NULL,
+                PRIMARY KEY (login, page)
+            );
+        """)
+        self._db.commit()
+
+    # --- Dono do token ---
+    def get_login(self, token: str) -> Optional[str]:
+        """Devolve o login associado ao token na última conexão (se houver)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT login FROM owners WHERE token_key = ?", (token_key(token),)).fetchone()
+        return row[0] if row else None
+
+    def set_login(self, token: str, login: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO owners (token_key, login, accessed_at) VALUES (?, ?, ?)",
+                (token_key(token), login, time.time()))
+            self._db.commit()
+
+    # --- Páginas ---
+    def load_pages(self, login: str) -> List[CachedPage]:
+        """Lê todas as páginas em cache de um utilizador, ordenadas."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT page, etag, last_modified, body, fetched_at FROM pages "
+                "WHERE login = ? ORDER BY page", (login,)).fetchall()
+            self._db.execute(
+                "UPDATE pages SET accessed_at = ? WHERE login = ?", (time.time(), login))
+            self._db.commit()
+        return [CachedPage(page, etag, last_modified, json.loads(body), fetched_at)
+                for page, etag, last_modified, body, fetched_at in rows]
+
+    def load_repos(self, login: str) -> List[Dict[str, Any]]:
+        """Lista completa (JSON cru) dos repositórios em cache, na ordem das páginas."""
+        return [item for page in self.load_pages(login) for item in page.items]
+
+    def store_page(self, login: str, page: int, etag: Optional[str],
+                   last_modified: Optional[str], items: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(login, page, etag, last_modified, body, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (login, page, etag, last_modified, json.dumps(items), now, now))
+            self._db.commit()
+
+    def truncate(self, login: str, last_page: int) -> None:
+        """Remove páginas que deixaram de existir (a lista ficou mais curta)."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM pages WHERE login = ? AND page > ?", (login, last_page))
+            self._db.commit()
+
+    def clear(self, login: str) -> None:
+        """Descarta todo o cache de um utilizador (usado no 'forçar atualização')."""
+        with self._lock:
+            self._db.execute("DELETE FROM pages WHERE login = ?", (login,))
+            self._db.commit()
+
+    # --- Despejo ---
+    def evict(self) -> int:
+        """
+        Aplica a política de despejo: remove páginas não acedidas há mais de
+        `max_age_days` e, se o cache passar de `max_bytes`, remove utilizadores
+        inteiros do menos para o mais recentemente acedido. Devolve quantas
+        páginas foram removidas.
+        """
+        removed = 0
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock:
+            removed += self._db.execute(
+                "DELETE FROM pages WHERE accessed_at < ?", (cutoff,)).rowcount
+
+            usage = self._db.execute(
+                "SELECT login, SUM(LENGTH(body)), MAX(accessed_at) FROM pages "
+                "GROUP BY login ORDER BY MAX(accessed_at)").fetchall()
+            total = sum(size for _, size, _ in usage)
+            for login, size, _ in usage:
+                if total <= self.max_bytes:
+                    break
+                removed += self._db.execute(
+                    "DELETE FROM pages WHERE login = ?", (login,)).rowcount
+                total -= size
+
+            self._db.execute(
+                "DELETE FROM owners WHERE login NOT IN (SELECT DISTINCT login FROM pages) "
+                "AND accessed_at < ?", (cutoff,))
+            self._db.commit()
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,215 @@
+"""
+Índice de busca dos nomes de repositórios (usado pelo filtro da lista).
+
+Os nomes ficam ordenados e já em minúsculas. Cada trigrama (3 caracteres
+seguidos) aponta para os nomes que o contêm: uma busca com 3+ caracteres só
+confere os nomes da lista de trigrama mais curta, em vez de todos. Montar os
+trigramas de 50k nomes leva ~0,4 s, por isso o índice cresce aos poucos
+(`index_pending`, chamado pelo app em fatias) e os nomes ainda sem trigramas
+são conferidos um a um.
+
+Uma busca que estende uma busca anterior (ex: "ap" -> "api") só filtra o
+resultado dela, e as buscas recentes ficam guardadas (o backspace volta a um
+resultado já calculado). As listas devolvidas nunca são alteradas depois.
+"""
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+GRAM = 3
+RESULT_CACHE_SIZE = 32
+INDEX_CHUNK = 2000  # Nomes com trigramas montados por chamada (~10 ms)
+# Acima disto, apagar e reinserir a lista de uma vez sai mais barato que aplicar o diff
+MAX_DIFF_OPS = 200
+
+
+def grams(text: str) -> List[str]:
+    """Trigramas distintos de `text` (vazio se tiver menos de 3 caracteres)."""
+    return list({text[i:i + GRAM] for i in range(len(text) - GRAM + 1)})
+
+
+class RepoIndex:
+    """Nomes ordenados e em minúsculas, com trigramas e busca incremental por substring."""
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.names: List[str] = sorted(names)
+        self.lowered: List[str] = [name.lower() for name in self.names]  # Paralela a `names`
+        self._lowered: Dict[str, str] = dict(zip(self.names, self.lowered))
+        self._grams: Dict[str, List[str]] = {}
+        # Ordem de indexação: `_queue[:_indexed]` já estão nos trigramas
+        self._queue: List[str] = list(self.names)
+        self._indexed = 0
+        self._reset_results()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._lowered
+
+    @property
+    def pending(self) -> int:
+        """Nomes ainda sem trigramas."""
+        return len(self._queue) - self._indexed
+
+    def _reset_results(self) -> None:
+        # Resultados recentes (listas ordenadas de nomes), do menos para o mais recente
+        self._results: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._results[""] = self.names
+
+    def add(self, names: Iterable[str]) -> List[str]:
+        """
+        Junta nomes novos (uma página da carga progressiva). Devolve os que
+        entraram, ordenados, para o app inserir só essas linhas na lista.
+        """
+        lowered = self._lowered
+        added = sorted({name for name in names if name not in lowered})
+        if not added:
+            return added
+        merged = self.names[:]  # As listas já devolvidas ficam como estavam
+        merged_lowered = self.lowered[:]
+        for name in added:
+            position = bisect_left(merged, name)
+            merged.insert(position, name)
+            lowered[name] = name.lower()
+            merged_lowered.insert(position, lowered[name])
+        self.names = merged
+        self.lowered = merged_lowered
+        self._queue.extend(added)
+        self._reset_results()
+        return added
+
+    def index_pending(self, limit: int = INDEX_CHUNK) -> bool:
+        """Monta os trigramas de até `limit` nomes. Devolve True se ainda faltam."""
+        index = self._grams
+        lowered = self._lowered
+        stop = min(len(self._queue), self._indexed + limit)
+        for name in self._queue[self._indexed:stop]:
+            for gram in grams(lowered[name]):
+                postings = index.get(gram)
+                if postings is None:
+                    index[gram] = [name]
+                else:
+                    postings.append(name)
+        self._indexed = stop
+        return stop < len(self._queue)
+
+    def _base_for(self, query: str) -> List[str]:
+        """O menor resultado guardado cuja busca está contida em `query`."""
+        best = self._results[""]
+        for previous, result in self._results.items():
+            if previous in query and len(result) < len(best):
+                best = result
+        return best
+
+    def _candidates(self, query: str) -> List[str]:
+        """Nomes que podem conter `query`: a lista de trigrama mais curta + os sem trigramas."""
+        shortest: Sequence[str] = ()
+        for gram in grams(query):
+            postings = self._grams.get(gram, ())
+            if not shortest or len(postings) < len(shortest):
+                shortest = postings
+            if not postings:
+                break
+        return list(shortest) + self._queue[self._indexed:]
+
+    def search_names(self, query: str) -> List[str]:
+        """Devolve, ordenados, os nomes que contêm `query` (sem distinguir maiúsculas)."""
+        query = query.lower()
+        cached = self._results.get(query)
+        if cached is not None:
+            self._results.move_to_end(query)
+            return cached
+
+        lowered = self._lowered
+        base = self._base_for(query)
+        candidates = base
+        if len(query) >= GRAM and self._indexed:
+            from_grams = self._candidates(query)
+            if len(from_grams) < len(base):
+                candidates = from_grams
+        if candidates is self.names:
+            result = [name for name, low in zip(self.names, self.lowered) if query in low]
+        else:
+            result = [name for name in candidates if query in lowered[name]]
+            if candidates is not base:
+                result.sort()  # Os trigramas guardam os nomes pela ordem de indexação
+
+        self._results[query] = result
+        if len(self._results) > RESULT_CACHE_SIZE:
+            # Descarta a busca mais antiga, mas nunca a entrada "" (lista completa)
+            oldest = next(key for key in self._results if key)
+            del self._results[oldest]
+        return result
+
+
+def _runs(indices: List[int]) -> List[Tuple[int, int]]:
+    """Agrupa índices crescentes em intervalos contíguos [início, fim)."""
+    runs: List[Tuple[int, int]] = []
+    for index in indices:
+        if runs and runs[-1][1] == index:
+            runs[-1] = (runs[-1][0], index + 1)
+        else:
+            runs.append((index, index + 1))
+    return runs
+
+
+def _gaps(positions: List[int], size: int) -> List[Tuple[int, int]]:
+    """Intervalos [início, fim) de 0..size que não contêm nenhuma das `positions` (crescentes)."""
+    gaps: List[Tuple[int, int]] = []
+    previous = 0
+    for position in positions:
+        if position > previous:
+            gaps.append((previous, position))
+        previous = position + 1
+    if size > previous:
+        gaps.append((previous, size))
+    return gaps
+
+
+def diff_sorted(old: Sequence[str], new: Sequence[str],
+                max_ops: Optional[int] = None) -> Optional[List[Tuple[str, int, int]]]:
+    """
+    Operações que transformam a lista `old` em `new` (ambas ordenadas), em
+    blocos contíguos [início, fim), para aplicar na sequência devolvida:
+    - ("delete", início, fim): linhas a remover da lista atual;
+    - ("insert", início, fim): inserir `new[início:fim]` na posição `início`.
+
+    Só as linhas que saem ou entram são tocadas. Cada item da lista menor é
+    procurado (bisect) na maior, por isso o custo acompanha a lista menor:
+    de 50k nomes para 100 (ou de volta) são ~100 buscas, não 50k. Devolve
+    None assim que passar de `max_ops` blocos (o app reconstrói a lista).
+    """
+    if old == new:  # Mesmos itens (ex: "serv" -> "servi"): compara por identidade, rápido
+        return []
+    small, large = (old, new) if len(old) <= len(new) else (new, old)
+    kept: List[int] = []  # Posições, na lista maior, dos itens que estão nas duas
+    missing: List[int] = []  # Índices, na lista menor, dos que só estão nela
+    blocks = 0
+    low = 0
+    for index, item in enumerate(small):
+        position = bisect_left(large, item, low)  # `small` é crescente: nunca volta atrás
+        if position < len(large) and large[position] == item:
+            if position > (kept[-1] + 1 if kept else 0):
+                blocks += 1  # Intervalo da lista maior que só está nela
+            kept.append(position)
+            low = position + 1
+        else:
+            if not missing or missing[-1] != index - 1:
+                blocks += 1
+            missing.append(index)
+            low = position
+        if max_ops is not None and blocks > max_ops:
+            return None
+    if small is old:
+        deletes, inserts = _runs(missing), _gaps(kept, len(new))
+    else:
+        deletes, inserts = _gaps(kept, len(old)), _runs(missing)
+    if max_ops is not None and len(deletes) + len(inserts) > max_ops:
+        return None
+
+    # Remove de baixo para cima (os índices de `old` continuam válidos) e depois
+    # insere de cima para baixo (os índices de `new` ficam corretos no fim).
+    ops = [("delete", start, stop) for start, stop in reversed(deletes)]
+    ops.extend(("insert", start, stop) for start, stop in inserts)
+    return ops
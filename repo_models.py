@@ -0,0 +1,81 @@
+"""
+Registos compactos usados pela UI no lugar dos objetos completos do PyGithub.
+
+Um `Repository` do PyGithub guarda o JSON cru, os headers e o requester; a
+lista só precisa de meia dúzia de campos. O objeto completo é pedido sob
+demanda (ver `services.GitHubService.full_repo`).
+"""
+from typing import Any, Dict, Optional, Tuple
+
+
+class RepoSummary:
+    """Resumo de um repositório: só os campos que a interface usa."""
+
+    __slots__ = ("name", "full_name", "html_url", "clone_url", "created_at", "private",
+                 "pushed_at", "open_issues", "size_kb")
+
+    def __init__(self, name: str, full_name: str, html_url: str, clone_url: str,
+                 created_at: Optional[str], private: bool = False,
+                 pushed_at: Optional[str] = None, open_issues: Optional[int] = None,
+                 size_kb: Optional[int] = None) -> None:
+        self.name = name
+        self.full_name = full_name
+        self.html_url = html_url
+        self.clone_url = clone_url
+        self.created_at = created_at  # ISO 8601, como vem da API
+        self.private = private
+        self.pushed_at = pushed_at
+        # Só o loader GraphQL conhece este número (o REST mistura issues e PRs)
+        self.open_issues = open_issues
+        self.size_kb = size_kb  # Tamanho no GitHub (KB); estima o espaço de um clone
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> "RepoSummary":
+        """Cria o resumo a partir do JSON da API REST (`/user/repos`)."""
+        return cls(
+            name=raw["name"],
+            full_name=raw.get("full_name") or raw["name"],
+            html_url=raw.get("html_url", ""),
+            clone_url=raw.get("clone_url", ""),
+            created_at=raw.get("created_at"),
+            private=bool(raw.get("private", False)),
+            pushed_at=raw.get("pushed_at"),
+            size_kb=raw.get("size"),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RepoSummary) and other.full_name == self.full_name
+
+    def __hash__(self) -> int:
+        return hash(self.full_name)
+
+    def __repr__(self) -> str:
+        return f"RepoSummary({self.full_name!r})"
+
+
+class IssueSummary:
+    """Resumo de uma issue aberta: só o que a caixa de tarefas mostra."""
+
+    __slots__ = ("number", "title", "user_login", "created_at", "labels")
+
+    def __init__(self, number: int, title: str, user_login: str,
+                 created_at: str, labels: Tuple[str, ...] = ()) -> None:
+        self.number = number
+        self.title = title
+        self.user_login = user_login
+        self.created_at = created_at  # ISO 8601, como vem da API
+        self.labels = labels
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> "IssueSummary":
+        """Cria o resumo a partir do JSON da API REST (`/repos/{repo}/issues`)."""
+        return cls(
+            number=raw["number"],
+            title=raw.get("title", ""),
+            user_login=(raw.get("user") or {}).get("login", "?"),
+            created_at=raw.get("created_at", ""),
+            labels=tuple(label["name"] for label in raw.get("labels", [])),
+        )
+
+    def __repr__(self) -> str:
+        return f"IssueSummary(#{self.number})"
@@ -0,0 +1,478 @@
+"""
+Operações do gestor sem interface: API do GitHub (repositórios, issues) e git
+(clone, push, pull).
+
+Tanto o `GitHubApp` como a linha de comando (`python -m cli`) usam estas
+funções. Nada aqui mostra diálogos ou mexe em widgets: o progresso sai por um
+callback `report(mensagem)` (e, nas operações git, `on_progress(snapshot)`
+com fase, objetos, bytes, MB/s e ETA; ver `git_progress`) e os erros sobem como exceções (`ServiceError`
+para as falhas previsíveis; as do PyGithub/GitPython/REST passam sem mudar).
+Podem ser chamadas de qualquer thread.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from urllib.parse import urlparse
+
+from clone_options import SKIP_SMUDGE_ENV, CloneOptions
+import git_progress
+import github_http
+import github_rest
+import graphql_loader
+import issue_cache
+import lfs
+import repo_cache
+import staging
+import tracing
+from lazy_imports import LazyModule
+from repo_models import IssueSummary, RepoSummary
+from tasks import CancelToken
+
+if TYPE_CHECKING:
+    import mirror_store
+
+# Módulos pesados: só carregam no primeiro uso (e já instrumentados)
+github = LazyModule("github", on_load=github_http.instrument_pygithub)
+git = LazyModule("git", on_load=tracing.instrument_gitpython)
+
+REPOS_PER_PAGE = 100
+REPO_FETCH_WORKERS = 8  # Páginas de repositórios pedidas em paralelo
+COMMIT_MESSAGE = "Commit via Gestor GitHub"
+
+Report = Callable[[str], None]
+
+
+def _ignore(message: str) -> None:
+    pass
+
+
+class ServiceError(Exception):
+    """Falha previsível de uma operação (mensagem pronta para mostrar)."""
+
+
+class RepoLoad:
+    """Resultado da carga de `/user/repos`: JSON cru e quantas páginas vieram do cache."""
+
+    __slots__ = ("raw", "unchanged", "pages")
+
+    def __init__(self, raw: List[Dict[str, Any]], unchanged: int, pages: int) -> None:
+        self.raw = raw
+        self.unchanged = unchanged
+        self.pages = pages
+
+    @property
+    def repos(self) -> List[RepoSummary]:
+        return repos_from_raw(self.raw)
+
+
+def repos_from_raw(raw_repos: List[Dict[str, Any]]) -> List[RepoSummary]:
+    """Converte o JSON cru (do cache ou da API) em resumos compactos."""
+    return [RepoSummary.from_raw(raw) for raw in raw_repos]
+
+
+def repo_cache_path(cache_dir: Path, base_url: str = github_http.DEFAULT_BASE_URL) -> Path:
+    """Ficheiro do cache de repositórios (outra API, ex: o emulador, tem o seu)."""
+    if base_url == github_http.DEFAULT_BASE_URL:
+        return cache_dir / "repos.sqlite3"
+    host = re.sub(r"[^A-Za-z0-9]+", "_", urlparse(base_url).netloc)
+    return cache_dir / f"repos-{host}.sqlite3"
+
+
+class GitHubService:
+    """Sessão autenticada na API: repositórios (com cache por ETag) e issues."""
+
+    def __init__(self, token: str, base_url: str = github_http.DEFAULT_BASE_URL,
+                 cache: Optional[repo_cache.RepoCache] = None,
+                 issues: Optional[issue_cache.IssueCache] = None,
+                 repos_per_page: int = REPOS_PER_PAGE,
+                 repo_fetch_workers: int = REPO_FETCH_WORKERS) -> None:
+        self.token = token
+        self.base_url = base_url
+        self.cache = cache
+        self.issue_cache = issues if issues is not None else issue_cache.IssueCache()
+        self.repos_per_page = repos_per_page
+        self.repo_fetch_workers = repo_fetch_workers
+        # Reconectar com o mesmo token reaproveita o cliente e as conexões abertas
+        self.github_api = github_http.github_client(token, base_url)
+        self.rest_client = github_rest.RestClient(token, base_url)
+        self.user: Any = None
+        self.login: Optional[str] = None
+
+    @property
+    def limiter(self) -> Any:
+        return self.rest_client.limiter
+
+    # --- Autenticação ---
+    def authenticate(self) -> str:
+        """Confirma o token (`GET /user`) e devolve o login."""
+        user = self.github_api.get_user()
+        login = user.login  # O pedido só acontece aqui (objeto preguiçoso)
+        if not login:
+            raise github.GithubException(
+                status=401, data={"message": "Não foi possível obter o utilizador autenticado."})
+        self.user = user
+        self.login = login
+        if self.cache:
+            self.cache.set_login(self.token, login)
+        return login
+
+    # --- Repositórios ---
+    def cached_repos(self, force_refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        Repositórios guardados da última vez para este token (sem pedidos).
+        Com `force_refresh`, descarta o cache e devolve None.
+        """
+        if not self.cache:
+            return None
+        login = self.cache.get_login(self.token)
+        if not login:
+            return None
+        if force_refresh:
+            self.cache.clear(login)
+            return None
+        return self.cache.load_repos(login) or None
+
+    def load_repos(self, on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                   on_progress: Optional[Callable[[int, int], None]] = None) -> RepoLoad:
+        """
+        Percorre `/user/repos` com pedidos condicionais (precisa de `authenticate()`).
+        A página 1 diz quantas páginas existem (header Link "last"); as restantes
+        são pedidas em paralelo por um pool limitado. `on_page(itens)` é chamado
+        à medida que cada página chega e `on_progress(recebidas, total)` depois.
+        """
+        login = self.login or self.authenticate()
+        cache = self.cache
+        per_page = self.repos_per_page
+        cached_pages = {page.page: page for page in cache.load_pages(login)} if cache else {}
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        unchanged = 0
+        parent_span = tracing.TRACER.current()  # Os pedidos do pool ficam sob este span
+
+        def fetch(page: int) -> Tuple[List[Dict[str, Any]], bool, bool, int]:
+            """Devolve (itens, veio do cache?, há próxima página?, última página estimada)."""
+            cached = cached_pages.get(page)
+            with tracing.TRACER.attach(parent_span):
+                response = self.rest_client.get(
+                    "/user/repos",
+                    params={"sort": "updated", "per_page": per_page, "page": page},
+                    etag=cached.etag if cached else None,
+                    last_modified=cached.last_modified if cached else None,
+                )
+            if response.not_modified and cached:
+                # Um 304 pode vir sem header Link: deduz do cache se há próxima página
+                has_next = page + 1 in cached_pages or len(cached.items) == per_page
+                last_page = max(cached_pages) if cached_pages else page
+                return cached.items, True, has_next, last_page
+
+            items = response.data
+            if cache:
+                cache.store_page(login, page, response.etag, response.last_modified, items)
+            last_page = github_rest.page_number(response.links.get("last")) or page
+            return items, False, "next" in response.links, last_page
+
+        def record(page: int, result: Tuple[List[Dict[str, Any]], bool, bool, int]) -> None:
+            nonlocal unchanged
+            pages[page] = result[0]
+            unchanged += result[1]
+            if on_page:
+                on_page(result[0])
+
+        first = fetch(1)
+        record(1, first)
+        has_next = first[2]
+        total = first[3] if has_next else 1
+
+        # Páginas 2..N em paralelo
+        if total > 1:
+            with ThreadPoolExecutor(max_workers=self.repo_fetch_workers) as pool:
+                futures = {pool.submit(fetch, page): page for page in range(2, total + 1)}
+                for future in as_completed(futures):
+                    page = futures[future]
+                    result = future.result()
+                    record(page, result)
+                    if page == total:
+                        has_next = result[2]
+                    if on_progress:
+                        on_progress(len(pages), total)
+
+        # A lista pode ter crescido durante a carga: continua em série
+        page = total
+        while has_next:
+            page += 1
+            result = fetch(page)
+            record(page, result)
+            has_next = result[2]
+
+        # Descarta páginas vazias no fim (a lista pode ter encolhido)
+        last_page = max((number for number, items in pages.items() if items), default=1)
+        if cache:
+            cache.truncate(login, last_page)
+        raw_repos = [item for number in sorted(pages) for item in pages[number]]
+        return RepoLoad(raw_repos, unchanged, last_page)
+
+    def load_repos_graphql(self, on_page: Optional[Callable[[List[RepoSummary], int, int], None]] = None
+                           ) -> Tuple[str, List[RepoSummary]]:
+        """Repositórios + nº de issues abertas em lotes de 100 (GraphQL). Devolve (login, repos)."""
+        # get_user() sem argumentos não faz pedido: o login vem da própria query
+        self.user = self.github_api.get_user()
+        login, repos = graphql_loader.load_repositories(
+            graphql_loader.HttpTransport(self.rest_client), on_page=on_page)
+        self.login = login
+        return login, repos
+
+    def full_repo(self, full_name: str) -> Any:
+        """
+        Objeto Repository do PyGithub para ações que precisam dele.
+        É criado "lazy": não faz pedido à API até a ação ser executada.
+        """
+        return self.github_api.get_repo(full_name, lazy=True)
+
+    def create_repo(self, name: str, description: str = "", private: bool = False,
+                    auto_init: bool = False) -> RepoSummary:
+        user = self.user or self.github_api.get_user()
+        created = user.create_repo(
+            name=name,
+            description=description if description else github.GithubObject.NotSet,
+            private=private,
+            auto_init=auto_init,
+        )
+        return RepoSummary.from_raw(created.raw_data)
+
+    def delete_repo(self, full_name: str) -> None:
+        self.full_repo(full_name).delete()
+
+    # --- Issues ---
+    def list_issues(self, full_name: str, force: bool = False, cancel: Optional[CancelToken] = None,
+                    on_page: Optional[Callable[[List[IssueSummary]], None]] = None
+                    ) -> Tuple[List[IssueSummary], bool]:
+        """Issues abertas (com o cache de issues). O segundo valor diz se nada mudou."""
+        return issue_cache.load_issues(self.rest_client, self.issue_cache, full_name,
+                                       force=force, cancel=cancel, on_page=on_page)
+
+    def create_issue(self, full_name: str, title: str, body: str = "") -> int:
+        """Cria a issue e devolve o número dela."""
+        issue = self.full_repo(full_name).create_issue(
+            title=title, body=body if body else github.GithubObject.NotSet)
+        self.issue_cache.invalidate(full_name)
+        return issue.number
+
+
+# --- Git ---
+
+def clone_repo(clone_url: str, destination: Path, report: Report = _ignore,
+               options: Optional[CloneOptions] = None,
+               mirrors: Optional["mirror_store.MirrorStore"] = None,
+               on_progress: Optional[git_progress.OnProgress] = None) -> Path:
+    """
+    Clona `clone_url` para `destination` (que não pode existir). `options`
+    escolhe o modo (raso, parcial, sparse...; ver `clone_options`). Com
+    `mirrors`, os objetos vêm do espelho local e o `origin` passa a ser
+    `clone_url` (ver `mirror_store`). `on_progress` recebe o progresso do git.
+
+    Os binários do Git LFS vêm no checkout, a menos que `options.lfs_skip_smudge`
+    os deixe como ponteiros para `fetch_lfs()` (ver `lfs`).
+    """
+    destination = Path(destination)
+    if destination.exists():
+        raise ServiceError(f"A pasta '{destination.name}' já existe em {destination.parent}")
+    options = options or CloneOptions()
+    mode = "" if options.is_full and not options.recurse_submodules else f" ({options.describe()})"
+    if mirrors is None:
+        report(f"⬇️ Clonando para {destination}{mode}...")
+        repo = _clone_from(clone_url, destination, on_progress,
+                           multi_options=options.clone_flags(), env=options.clone_env())
+    else:
+        mirror = mirrors.acquire(clone_url, report, on_progress)
+        try:
+            report(f"⬇️ Clonando do espelho local para {destination}{mode}...")
+            # O espelho não tem os objetos LFS: vêm do servidor depois do set_url
+            repo = _clone_from(str(mirror), destination, on_progress,
+                               multi_options=options.clone_flags(local=True), env=SKIP_SMUDGE_ENV)
+        finally:
+            mirrors.release(clone_url)
+        repo.remotes.origin.set_url(clone_url)
+        if options.recurse_submodules:
+            report("📦 Baixando submódulos...")
+            repo.git.submodule("update", "--init", "--recursive",
+                               f"--jobs={options.submodule_jobs}")
+    if options.sparse_paths:
+        report(f"📂 Sparse-checkout: {', '.join(options.sparse_paths)}")
+        repo.git.sparse_checkout("set", *options.sparse_args())
+    _clone_lfs(repo, options, report, fetch=mirrors is not None)
+    return destination
+
+
+def _clone_from(url: str, destination: Path, on_progress: Optional[git_progress.OnProgress],
+                **kwargs: Any) -> Any:
+    """
+    `Repo.clone_from` que não perde o erro do git quando há progresso: com
+    `progress=`, o GitPython lê o stderr no parser de progresso e o
+    GitCommandError sai com o `stderr` vazio. As linhas "fatal: ..." ficam
+    em `error_lines` do parser e voltam para a exceção.
+    """
+    progress = git_progress.transfer(on_progress)
+    parser = git.remote.CallableRemoteProgress(progress) if progress is not None else None
+    try:
+        return git.Repo.clone_from(url, str(destination), progress=parser, **kwargs)
+    except git.GitCommandError as e:
+        if parser is None or e.stderr or not parser.error_lines:
+            raise
+        raise git.GitCommandError(e.command, e.status, "\n".join(parser.error_lines)) from e
+
+
+def _clone_lfs(repo: Any, options: CloneOptions, report: Report, fetch: bool) -> None:
+    """Depois do clone: binários LFS sob demanda, ou baixados agora se o checkout os saltou."""
+    missing = lfs.pending(repo)
+    if not missing:
+        return
+    if lfs.version() is None:
+        report(f"ℹ️ {len(missing)} ficheiros do Git LFS ficaram como ponteiros "
+               "(instale o git-lfs: https://git-lfs.com).")
+    elif options.lfs_skip_smudge:
+        lfs.install(repo, skip_smudge=True)  # Os pulls seguintes também não os baixam
+        report(f"📦 {len(missing)} ficheiros do Git LFS ficaram para baixar sob demanda.")
+    elif fetch:
+        report(f"📦 Baixando {len(missing)} ficheiros do Git LFS "
+               f"({lfs.DEFAULT_CONCURRENT_TRANSFERS} em paralelo)...")
+        lfs.install(repo)
+        lfs.pull_objects(repo)
+
+
+def _require_lfs() -> None:
+    if lfs.version() is None:
+        raise ServiceError("O Git LFS não está instalado (https://git-lfs.com).")
+
+
+def fetch_lfs(local_path: str, report: Report = _ignore, include: Sequence[str] = (),
+              concurrent_transfers: int = lfs.DEFAULT_CONCURRENT_TRANSFERS) -> int:
+    """
+    Baixa os binários LFS que ficaram como ponteiros (todos, ou só os
+    caminhos/padrões `include`). Devolve quantos foram baixados.
+    """
+    _require_lfs()
+    repo = git.Repo(local_path)
+    missing = lfs.pending(repo)
+    if not missing:
+        report("ℹ️ Nenhum ficheiro do Git LFS por baixar.")
+        return 0
+    report(f"📦 Baixando ficheiros do Git LFS ({concurrent_transfers} em paralelo)...")
+    lfs.pull_objects(repo, include, concurrent_transfers)
+    return len(missing) - len(lfs.pending(repo))
+
+
+def _push(repo: Any, branch_name: str, on_progress: Optional[git_progress.OnProgress]) -> None:
+    """`git push --set-upstream origin <branch>` com progresso; falha se o remoto recusar."""
+    results = repo.remotes.origin.push(branch_name, progress=git_progress.transfer(on_progress),
+                                       set_upstream=True)
+    for info in results:
+        if info.flags & (info.REJECTED | info.REMOTE_REJECTED | info.REMOTE_FAILURE | info.ERROR):
+            raise ServiceError(f"Push de '{branch_name}' recusado: {info.summary.strip()}")
+    results.raise_if_error()
+
+
+def push_local(local_path: str, origin_url: str, report: Report = _ignore,
+               message: str = COMMIT_MESSAGE,
+               on_progress: Optional[git_progress.OnProgress] = None,
+               plan: Optional[staging.StagePlan] = None, exclude: Iterable[str] = (),
+               gitignore: bool = False, lfs_options: Optional[lfs.LfsOptions] = None) -> str:
+    """
+    Liga a pasta `local_path` ao remoto `origin_url` (git init se preciso),
+    faz commit do que mudou e envia o branch atual. Devolve o branch enviado.
+
+    `plan` é a análise de `staging.scan()` já mostrada ao utilizador (sem
+    ele, a pasta é analisada aqui); só esses caminhos entram no commit, menos
+    os de `exclude`. Com `gitignore`, o `.gitignore` sugerido é gravado antes
+    (e a pasta analisada de novo).
+
+    Com `lfs_options`, os ficheiros que elas escolhem passam ao Git LFS antes
+    do commit e os objetos sobem no push, em paralelo (ver `lfs`).
+    """
+    branch_name = "main"
+    if plan is None:
+        report("🔎 Analisando mudanças (git status)...")
+        plan = staging.scan(local_path)
+    if gitignore and plan.suggested_gitignore:
+        staging.write_gitignore(plan)
+        report(f"📄 .gitignore criado ({', '.join(plan.languages) or 'pastas geradas'}).")
+        plan = staging.scan(local_path, plan.large_bytes)
+    excluded = set(exclude)
+    if plan.conflicts:
+        raise ServiceError("Há conflitos por resolver: "
+                           f"{', '.join(change.path for change in plan.conflicts[:5])}")
+    # Ficheiros no LFS não contam para o limite do GitHub
+    to_track: List[staging.FileChange] = []
+    in_lfs: List[str] = []
+    if lfs_options is not None:
+        _require_lfs()
+        to_track = [change for change in lfs.candidates(plan, lfs_options)
+                    if change.path not in excluded]
+        in_lfs = lfs.covered(plan) + [change.path for change in to_track]
+    elif lfs.tracked_patterns(plan.root) and lfs.version() is not None:
+        in_lfs = lfs.covered(plan)
+    refused = plan.too_large(excluded | set(in_lfs))
+    if refused:
+        raise ServiceError(
+            f"O GitHub recusa ficheiros acima de {staging.MAX_FILE_BYTES // 1024 ** 2} MB: "
+            f"{', '.join(change.path for change in refused[:5])}. Deixe-os de fora do push.")
+    repo_local = git.Repo(str(plan.root))
+
+    # Configura remote origin
+    if "origin" in [r.name for r in repo_local.remotes]:
+        repo_local.remotes.origin.set_url(origin_url)
+    else:
+        repo_local.create_remote("origin", origin_url)
+
+    if lfs_options is not None:
+        lfs.install(repo_local)  # Filtros e o hook que envia os objetos no push
+        lfs.configure(repo_local, lfs_options)
+        if in_lfs:
+            lfs_set = set(in_lfs)
+            lfs_bytes = sum(change.size for change in plan.changes if change.path in lfs_set)
+            report(f"📦 {len(in_lfs)} ficheiros no Git LFS ({lfs_bytes / 1024 ** 2:.1f} MB, "
+                   f"{lfs_options.concurrent_transfers} transferências em paralelo)")
+
+    # Adiciona só o que a análise encontrou (sem percorrer a árvore outra vez)
+    paths = plan.paths(excluded)
+    if to_track:
+        # Antes do `git add`, para o filtro do LFS guardar só os ponteiros
+        lfs.track(plan.root, [change.path for change in to_track])
+        if lfs.ATTRIBUTES_FILE_NAME not in paths:
+            paths.append(lfs.ATTRIBUTES_FILE_NAME)
+    if paths:
+        report(f"📝 Adicionando arquivos: {plan.summary(excluded).splitlines()[0]}")
+        staging.stage(repo_local, paths)
+        report("💾 Criando commit...")
+        repo_local.index.commit(message)
+    else:
+        report("ℹ️ Nenhuma mudança para commitar. Prosseguindo...")
+
+    # Determina o branch atual
+    try:
+        branch_name = repo_local.active_branch.name
+    except TypeError:
+        # Se não houver branch (repo novo), cria 'main'
+        repo_local.git.branch("-M", branch_name)
+
+    report(f"⬆️ Enviando branch '{branch_name}' para o GitHub...")
+    try:
+        _push(repo_local, branch_name, on_progress)
+    except git.GitCommandError as e:
+        # Tenta lidar com o erro comum 'main' vs 'master'
+        if "src refspec main does not match any" not in str(e) or branch_name != "main":
+            raise
+        report("ℹ️ 'main' falhou, tentando 'master'...")
+        branch_name = "master"
+        repo_local.git.branch("-M", branch_name)
+        _push(repo_local, branch_name, on_progress)
+    return branch_name
+
+
+def pull_repo(local_path: str, report: Report = _ignore,
+              on_progress: Optional[git_progress.OnProgress] = None) -> None:
+    """`git pull` do remoto origin. Levanta `git.InvalidGitRepositoryError` se não for um repositório."""
+    repo = git.Repo(local_path)
+    if not repo.remotes:
+        raise ServiceError("Nenhum remote configurado neste repositório.")
+    report("⬇️ Baixando atualizações...")
+    repo.remotes.origin.pull(progress=git_progress.transfer(on_progress))
@@ -0,0 +1,386 @@
+"""
+Preparação do push de uma pasta local: o que vai ser enviado, e quanto pesa.
+
+Uma só passagem de `git status --porcelain=v2 -z --untracked-files=all`
+(com `core.untrackedCache` e, onde o git suporta, `core.fsmonitor`) dá a
+lista de ficheiros novos, modificados e apagados. Dela saem:
+
+- o resumo do push (quantos ficheiros, MB a enviar, os maiores);
+- os ficheiros grandes (aviso a partir de `LARGE_FILE_BYTES`; o GitHub recusa
+  acima de `MAX_FILE_BYTES`);
+- as pastas que parecem geradas (`node_modules/`, virtualenvs, `target/`...);
+- sem `.gitignore`, um modelo para as linguagens detetadas.
+
+`stage()` faz `git add --all` só dos caminhos da lista (sem percorrer a
+árvore outra vez), menos os que o utilizador excluiu.
+
+Uso:
+    python staging.py ~/projeto [--large-mb 50]
+"""
+import argparse
+import os
+import shutil
+import stat
+import sys
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import tracing
+from lazy_imports import LazyModule
+
+git = LazyModule("git", on_load=tracing.instrument_gitpython)
+
+LARGE_FILE_BYTES = 50 * 1024 ** 2  # O GitHub avisa a partir daqui
+MAX_FILE_BYTES = 100 * 1024 ** 2  # ... e recusa o push acima disto
+TOP_FILES = 10  # Maiores ficheiros mostrados no resumo
+PATHSPEC_FILE_NAME = "GESTOR_STAGE"  # Lista de caminhos para o `git add` (dentro do .git)
+# O fsmonitor embutido do git só existe em Windows e macOS (git 2.37+)
+FSMONITOR_PLATFORMS = ("win32", "darwin")
+FSMONITOR_MIN_GIT = (2, 37)
+
+NEW = "novo"
+MODIFIED = "modificado"
+DELETED = "apagado"
+RENAMED = "renomeado"
+CONFLICT = "conflito"
+KINDS = (NEW, MODIFIED, DELETED, RENAMED, CONFLICT)
+
+# Pastas que quase sempre são geradas (dependências, caches, builds)
+GENERATED_DIRS = {"node_modules", "__pycache__", ".tox", ".mypy_cache", ".pytest_cache",
+                  ".gradle", ".next", "target", "obj", "build", "dist"}
+VIRTUALENV_MARKER = "pyvenv.cfg"  # Uma pasta com este ficheiro é um virtualenv
+
+# Linguagem: (ficheiros que a denunciam, extensões, pastas geradas típicas)
+LANGUAGE_MARKERS: Dict[str, Tuple[Set[str], Set[str], Set[str]]] = {
+    "Python": ({"requirements.txt", "pyproject.toml", "setup.py", "Pipfile", VIRTUALENV_MARKER},
+               {".py", ".ipynb"}, {"__pycache__", ".tox", ".mypy_cache", ".pytest_cache"}),
+    "Node": ({"package.json"}, {".js", ".jsx", ".ts", ".tsx"}, {"node_modules", ".next"}),
+    "Java": ({"pom.xml", "build.gradle", "build.gradle.kts"}, {".java", ".kt"}, {".gradle"}),
+    "Go": ({"go.mod"}, {".go"}, set()),
+    "Rust": ({"Cargo.toml"}, {".rs"}, set()),
+    ".NET": (set(), {".cs", ".csproj", ".sln", ".fs", ".vb"}, set()),
+}
+
+GITIGNORE_COMMON = ["# Sistema e editores", ".DS_Store", "Thumbs.db", ".idea/", ".vscode/",
+                    "*.swp", ".env"]
+GITIGNORE_TEMPLATES: Dict[str, List[str]] = {
+    "Python": ["__pycache__/", "*.py[cod]", "venv/", ".venv/", "env/", "build/", "dist/",
+               "*.egg-info/", ".pytest_cache/", ".mypy_cache/", ".tox/", ".ipynb_checkpoints/"],
+    "Node": ["node_modules/", "npm-debug.log*", "yarn-error.log", "dist/", "build/", ".next/",
+             "coverage/"],
+    "Java": ["target/", "build/", "out/", ".gradle/", "*.class"],
+    "Go": ["bin/", "*.exe", "*.test", "*.out"],
+    "Rust": ["target/"],
+    ".NET": ["bin/", "obj/", ".vs/", "*.user"],
+}
+
+
+class FileChange:
+    """Um caminho do `git status`: tipo de mudança e tamanho na cópia de trabalho."""
+
+    __slots__ = ("path", "kind", "size", "orig_path")
+
+    def __init__(self, path: str, kind: str, size: int = 0,
+                 orig_path: Optional[str] = None) -> None:
+        self.path = path  # Relativo à raiz, com "/"
+        self.kind = kind
+        self.size = size  # 0 para apagados
+        self.orig_path = orig_path  # Caminho antigo (renomeados)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"FileChange({self.path!r}, {self.kind}, {self.size})"
+
+
+class StagePlan:
+    """O que o push vai levar: mudanças, linguagens, pastas geradas e ficheiros grandes."""
+
+    def __init__(self, root: Path, changes: List[FileChange], created_repo: bool = False,
+                 large_bytes: int = LARGE_FILE_BYTES) -> None:
+        self.root = Path(root)
+        self.changes = changes
+        self.created_repo = created_repo  # O `git init` foi feito pelo scan
+        self.large_bytes = large_bytes
+        self.has_gitignore = (self.root / ".gitignore").is_file()
+        self.languages = detect_languages(change.path for change in changes)
+        self.generated_dirs = generated_dirs(changes)
+
+    # --- Contagens ---
+
+    def count(self, kind: str, exclude: Iterable[str] = ()) -> int:
+        excluded = set(exclude)
+        return sum(1 for change in self.changes if change.kind == kind and change.path not in excluded)
+
+    def upload_bytes(self, exclude: Iterable[str] = ()) -> int:
+        """Tamanho dos ficheiros a enviar (o teto do que o push leva, antes da compressão)."""
+        excluded = set(exclude)
+        return sum(change.size for change in self.changes if change.path not in excluded)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changes
+
+    def large_files(self, exclude: Iterable[str] = ()) -> List[FileChange]:
+        """Ficheiros a partir de `large_bytes`, do maior para o menor."""
+        excluded = set(exclude)
+        return sorted((change for change in self.changes
+                       if change.size >= self.large_bytes and change.path not in excluded),
+                      key=lambda change: -change.size)
+
+    def too_large(self, exclude: Iterable[str] = ()) -> List[FileChange]:
+        """Ficheiros que o GitHub recusa (acima de `MAX_FILE_BYTES`)."""
+        return [change for change in self.large_files(exclude) if change.size > MAX_FILE_BYTES]
+
+    @property
+    def conflicts(self) -> List[FileChange]:
+        return [change for change in self.changes if change.kind == CONFLICT]
+
+    # --- .gitignore ---
+
+    @property
+    def suggested_gitignore(self) -> Optional[str]:
+        """Modelo de `.gitignore` (None se já existe um ou não há nada a sugerir)."""
+        if self.has_gitignore or not (self.languages or self.generated_dirs):
+            return None
+        return gitignore_template(self.languages, self.generated_dirs)
+
+    # --- Resultado ---
+
+    def paths(self, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Caminhos para o `git add --all`. Um renomeado já está no índice (só o
+        nome novo conta); um ficheiro novo que entretanto sumiu fica de fora.
+        """
+        excluded = set(exclude)
+        return [change.path for change in self.changes if change.path not in excluded
+                and (change.kind != NEW or os.path.lexists(self.root / change.path))]
+
+    def summary(self, exclude: Iterable[str] = ()) -> str:
+        """Resumo para mostrar antes do push (várias linhas)."""
+        excluded = set(exclude)
+        counts = [f"{self.count(kind, excluded)} {kind}s" for kind in KINDS
+                  if self.count(kind, excluded)]
+        lines = [f"{', '.join(counts) or 'Nenhuma mudança'} · "
+                 f"{self.upload_bytes(excluded) / 1024 ** 2:.1f} MB a enviar"]
+        large = self.large_files(excluded)
+        if large:
+            lines.append("Ficheiros grandes:")
+            for change in large[:TOP_FILES]:
+                note = "acima do limite do GitHub (100 MB)" if change.size > MAX_FILE_BYTES else "grande"
+                lines.append(f"  ⚠️ {change.size / 1024 ** 2:8.1f} MB  {change.path} ({note})")
+            if len(large) > TOP_FILES:
+                lines.append(f"  ... e mais {len(large) - TOP_FILES}")
+        if self.generated_dirs:
+            dirs = ", ".join(f"{path}/ ({files} ficheiros, {size / 1024 ** 2:.1f} MB)"
+                             for path, (files, size) in self.generated_dirs.items())
+            lines.append(f"Pastas que parecem geradas: {dirs}")
+        if excluded:
+            lines.append(f"Fora deste push: {len(excluded)} ficheiros")
+        if self.suggested_gitignore:
+            lines.append("Sem .gitignore: sugerido o modelo para "
+                         f"{', '.join(self.languages) or 'pastas geradas'}.")
+        return "\n".join(lines)
+
+    def as_dict(self, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+        excluded = set(exclude)
+        return {
+            "root": str(self.root),
+            "counts": {kind: self.count(kind, excluded) for kind in KINDS},
+            "upload_bytes": self.upload_bytes(excluded),
+            "large_files": [change.as_dict() for change in self.large_files(excluded)],
+            "generated_dirs": {path: {"files": files, "bytes": size}
+                               for path, (files, size) in self.generated_dirs.items()},
+            "languages": self.languages,
+            "has_gitignore": self.has_gitignore,
+            "excluded": sorted(excluded),
+        }
+
+
+# --- Análise ---
+
+def _parts(path: str) -> Tuple[str, ...]:
+    return PurePosixPath(path).parts
+
+
+def detect_languages(paths: Iterable[str]) -> List[str]:
+    """Linguagens do projeto, pelos ficheiros típicos e extensões (fora das pastas geradas)."""
+    found: Set[str] = set()
+    for path in paths:
+        parts = _parts(path)
+        name = parts[-1]
+        suffix = PurePosixPath(name).suffix.lower()
+        generated = any(part in GENERATED_DIRS for part in parts[:-1])
+        for language, (markers, suffixes, dirs) in LANGUAGE_MARKERS.items():
+            if name in markers or any(part in dirs for part in parts[:-1]) or \
+                    (suffix in suffixes and not generated):
+                found.add(language)
+    return [language for language in LANGUAGE_MARKERS if language in found]
+
+
+def generated_dirs(changes: Sequence[FileChange]) -> Dict[str, Tuple[int, int]]:
+    """Pastas novas que parecem geradas (`GENERATED_DIRS` e virtualenvs): (ficheiros, bytes)."""
+    virtualenvs = {str(PurePosixPath(change.path).parent) for change in changes
+                   if PurePosixPath(change.path).name == VIRTUALENV_MARKER}
+    found: Dict[str, List[int]] = {}
+    for change in changes:
+        if change.kind != NEW:
+            continue
+        parts = _parts(change.path)
+        for depth in range(1, len(parts)):
+            prefix = "/".join(parts[:depth])
+            if parts[depth - 1] in GENERATED_DIRS or prefix in virtualenvs:
+                totals = found.setdefault(prefix, [0, 0])
+                totals[0] += 1
+                totals[1] += change.size
+                break
+    return {path: (files, size) for path, (files, size) in
+            sorted(found.items(), key=lambda item: -item[1][1])}
+
+
+def gitignore_template(languages: Sequence[str],
+                       extra_dirs: Iterable[str] = ()) -> str:
+    """`.gitignore` com as regras comuns, as das `languages` e as pastas extra."""
+    lines = ["# Gerado pelo Gestor GitHub", ""] + GITIGNORE_COMMON
+    seen = set(GITIGNORE_COMMON)
+    for language in languages:
+        rules = [rule for rule in GITIGNORE_TEMPLATES.get(language, []) if rule not in seen]
+        if rules:
+            lines += ["", f"# {language}"] + rules
+            seen.update(rules)
+    extra = [f"{path}/" for path in extra_dirs if f"{path}/" not in seen
+             and f"{_parts(path)[-1]}/" not in seen]
+    if extra:
+        lines += ["", "# Pastas geradas"] + extra
+    return "\n".join(lines) + "\n"
+
+
+def parse_porcelain_v2(output: str) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Entradas de `git status --porcelain=v2 -z`: (tipo, caminho, caminho antigo).
+    Os ignorados (`!`) ficam de fora.
+    """
+    entries: List[Tuple[str, str, Optional[str]]] = []
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+        tag = record[0]
+        if tag == "?":
+            entries.append((NEW, record[2:], None))
+        elif tag == "1":
+            fields = record.split(" ", 8)
+            entries.append((_kind(fields[1]), fields[8], None))
+        elif tag == "2":
+            fields = record.split(" ", 9)
+            entries.append((RENAMED, fields[9], records[i]))
+            i += 1  # O caminho antigo vem no registo seguinte
+        elif tag == "u":
+            fields = record.split(" ", 10)
+            entries.append((CONFLICT, fields[10], None))
+    return entries
+
+
+def _kind(xy: str) -> str:
+    """Tipo de mudança pelo par XY (índice, cópia de trabalho) do porcelain v2."""
+    status = xy[1] if xy[1] != "." else xy[0]
+    if status == "A":
+        return NEW
+    if status == "D":
+        return DELETED
+    if status in "RC":
+        return RENAMED
+    return MODIFIED
+
+
+# --- Git ---
+
+def enable_fast_status(repo: Any) -> None:
+    """Liga o cache de pastas não rastreadas e, onde existe, o fsmonitor do git."""
+    repo.git.config("core.untrackedCache", "true")
+    if sys.platform in FSMONITOR_PLATFORMS and repo.git.version_info[:2] >= FSMONITOR_MIN_GIT:
+        repo.git.config("core.fsmonitor", "true")
+
+
+def open_repo(local_path: Any) -> Tuple[Any, bool]:
+    """O repositório da pasta (git init se preciso). Devolve (repo, criado agora?)."""
+    root = Path(local_path)
+    if (root / ".git").exists():
+        return git.Repo(str(root)), False
+    return git.Repo.init(str(root)), True
+
+
+def scan(local_path: Any, large_bytes: int = LARGE_FILE_BYTES) -> StagePlan:
+    """Analisa a pasta com uma só passagem de `git status` (faz `git init` se preciso)."""
+    repo, created = open_repo(local_path)
+    enable_fast_status(repo)
+    root = Path(repo.working_tree_dir)
+    output = repo.git.status("--porcelain=v2", "-z", "--untracked-files=all")
+    changes = []
+    for kind, path, orig_path in parse_porcelain_v2(output):
+        size = 0
+        if kind != DELETED:
+            try:
+                info = os.lstat(root / path)
+                size = info.st_size if stat.S_ISREG(info.st_mode) else 0  # Não conta links/pastas
+            except OSError:
+                pass
+        changes.append(FileChange(path, kind, size, orig_path))
+    return StagePlan(root, changes, created_repo=created, large_bytes=large_bytes)
+
+
+def write_gitignore(plan: StagePlan) -> Path:
+    """Grava o `.gitignore` sugerido (a lista do plano fica desatualizada: refaça o scan)."""
+    text = plan.suggested_gitignore
+    if text is None:
+        raise ValueError("Não há .gitignore a sugerir para esta pasta")
+    path = plan.root / ".gitignore"
+    path.write_text(text, encoding="utf-8")
+    plan.has_gitignore = True
+    return path
+
+
+def stage(repo: Any, paths: Sequence[str]) -> None:
+    """
+    `git add --all` só destes caminhos. A lista vai por ficheiro
+    (`--pathspec-from-file`): sem limite de tamanho da linha de comando.
+    """
+    if not paths:
+        return
+    spec = Path(repo.git_dir) / PATHSPEC_FILE_NAME
+    spec.write_bytes(b"\0".join(os.fsencode(path) for path in paths))
+    try:
+        # Caminhos literais: um ficheiro chamado "*.txt" não vira um padrão
+        repo.git.add("--all", f"--pathspec-from-file={spec}", "--pathspec-file-nul",
+                     env={"GIT_LITERAL_PATHSPECS": "1"})
+    finally:
+        spec.unlink(missing_ok=True)
+
+
+def discard(plan: StagePlan) -> None:
+    """Desfaz o `git init` do scan (quando o push é cancelado numa pasta que não era repositório)."""
+    if plan.created_repo:
+        shutil.rmtree(plan.root / ".git", ignore_errors=True)
+
+
+# --- Linha de comando ---
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--large-mb", type=float, default=LARGE_FILE_BYTES / 1024 ** 2)
+    args = parser.parse_args()
+    plan = scan(args.path, int(args.large_mb * 1024 ** 2))
+    print(plan.summary())
+    if plan.suggested_gitignore:
+        print("\n--- .gitignore sugerido ---")
+        print(plan.suggested_gitignore, end="")
+    discard(plan)  # Só olhar: não deixa para trás um .git que não existia
+
+
+if __name__ == "__main__":
+    main()
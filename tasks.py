@@ -0,0 +1,251 @@
+"""
+Cancelamento cooperativo de tarefas em segundo plano.
+
+Uma tarefa recebe um `CancelToken` e verifica-o entre passos (ex: entre
+páginas da API). Quando o utilizador muda de ideia (outra seleção), o token
+antigo é cancelado e a tarefa para no próximo ponto de verificação.
+
+As tarefas são executadas pelo `TaskScheduler`, que separa o trabalho em
+pistas (interativo, em massa, segundo plano), cada uma com os seus workers.
+"""
+import itertools
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class Cancelled(Exception):
+    """A tarefa foi cancelada (resultado já não interessa)."""
+
+
+class CancelToken:
+    """Sinal de cancelamento partilhado entre a UI e uma tarefa."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Ponto de verificação: interrompe a tarefa se tiver sido cancelada."""
+        if self._event.is_set():
+            raise Cancelled()
+
+
+# --- Agendador de tarefas ---
+# Cada pista (lane) tem a sua fila e os seus workers: um clone de vários GB na
+# pista "bulk" nunca atrasa o carregamento de issues da pista "interactive".
+
+INTERACTIVE = "interactive"  # Resposta direta a um clique (issues, criar repo...)
+BULK = "bulk"  # Operações longas (clone, push, pull)
+BACKGROUND = "background"  # Trabalho especulativo (pré-carregamento)
+
+DEFAULT_LANE_WORKERS: Dict[str, int] = {INTERACTIVE: 4, BULK: 2, BACKGROUND: 2}
+
+# Menor número = sai da fila primeiro (dentro da mesma pista)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+_current = threading.local()  # Pista da tarefa que a thread está a executar
+
+
+def current_lane() -> Optional[str]:
+    """Pista da tarefa em execução nesta thread (None fora do agendador)."""
+    return getattr(_current, "lane", None)
+
+
+def current_task() -> Optional["Task"]:
+    """Tarefa em execução nesta thread (None fora do agendador)."""
+    return getattr(_current, "task", None)
+
+
+PENDING = "pendente"
+RUNNING = "a correr"
+DONE = "concluída"
+FAILED = "falhou"
+CANCELLED = "cancelada"
+
+
+class Task:
+    """Uma tarefa agendada: função, pista, prioridade, estado e token de cancelamento."""
+
+    __slots__ = ("id", "name", "lane", "priority", "token", "state", "submitted_at",
+                 "started_at", "finished_at", "error", "progress", "_fn", "_args", "_kwargs")
+
+    def __init__(self, task_id: int, name: str, lane: str, priority: int, token: CancelToken,
+                 fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        self.id = task_id
+        self.name = name
+        self.lane = lane
+        self.priority = priority
+        self.token = token
+        self.state = PENDING
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.progress: Optional[str] = None  # Detalhe ao vivo (ex: fase e MB/s de um clone)
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def cancel(self) -> None:
+        """Pendente: não chega a correr. A correr: a função deve verificar o token."""
+        self.token.cancel()
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos a correr (ou à espera, se ainda não começou)."""
+        start = self.started_at if self.started_at is not None else self.submitted_at
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - start
+
+    def __repr__(self) -> str:
+        return f"Task({self.id}, {self.name!r}, {self.lane}, {self.state})"
+
+
+class _Lane:
+    """Fila com prioridade + workers criados sob demanda até `max_workers`."""
+
+    def __init__(self, scheduler: "TaskScheduler", name: str, max_workers: int) -> None:
+        self.scheduler = scheduler
+        self.name = name
+        self.max_workers = max_workers
+        self.queue: "queue.PriorityQueue[Tuple[int, int, Optional[Task]]]" = queue.PriorityQueue()
+        self.threads: List[threading.Thread] = []
+        self.idle = 0
+        self.lock = threading.Lock()
+
+    def put(self, task: Task) -> None:
+        self.queue.put((task.priority, task.id, task))
+        with self.lock:
+            # Só cria outro worker se os ociosos não chegam para o que está na fila
+            if self.queue.qsize() > self.idle and len(self.threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._work, name=f"{self.name}-{len(self.threads) + 1}", daemon=True)
+                self.threads.append(thread)
+                thread.start()
+
+    def stop(self) -> None:
+        with self.lock:
+            for _ in self.threads:
+                self.queue.put((sys.maxsize, sys.maxsize, None))
+
+    def _work(self) -> None:
+        while True:
+            with self.lock:
+                self.idle += 1
+            _, _, task = self.queue.get()
+            with self.lock:
+                self.idle -= 1
+            if task is None:
+                return
+            self.scheduler._run(task)
+
+
+class TaskScheduler:
+    """
+    Executor central: um conjunto limitado de workers por pista, prioridades,
+    cancelamento e uma visão das tarefas ativas (para o painel da UI).
+    Os ouvintes (`add_listener`) são chamados na thread que mudou o estado.
+    """
+
+    def __init__(self, lane_workers: Optional[Dict[str, int]] = None) -> None:
+        workers = dict(DEFAULT_LANE_WORKERS)
+        workers.update(lane_workers or {})
+        self._lanes = {name: _Lane(self, name, count) for name, count in workers.items()}
+        self._active: Dict[int, Task] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._listeners: List[Callable[[], None]] = []
+
+    def submit(self, fn: Callable[..., Any], *args: Any, name: Optional[str] = None,
+               lane: str = INTERACTIVE, priority: int = PRIORITY_NORMAL,
+               token: Optional[CancelToken] = None, **kwargs: Any) -> Task:
+        """Agenda `fn(*args, **kwargs)` na pista indicada e devolve a `Task`."""
+        if lane not in self._lanes:
+            raise ValueError(f"Pista desconhecida: {lane!r}")
+        task = Task(next(self._ids), name or getattr(fn, "__name__", "tarefa"), lane, priority,
+                    token or CancelToken(), fn, args, kwargs)
+        with self._lock:
+            self._active[task.id] = task
+        self._lanes[lane].put(task)
+        self._notify()
+        return task
+
+    def active_tasks(self) -> List[Task]:
+        """Tarefas pendentes ou a correr, das mais antigas para as mais recentes."""
+        with self._lock:
+            return sorted(self._active.values(), key=lambda task: task.id)
+
+    def cancel(self, task_id: int) -> bool:
+        with self._lock:
+            task = self._active.get(task_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def cancel_all(self, lane: Optional[str] = None) -> None:
+        for task in self.active_tasks():
+            if lane is None or task.lane == lane:
+                task.cancel()
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        self._listeners.append(callback)
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """Para os workers (as tarefas em curso terminam; as pendentes são descartadas)."""
+        if cancel_pending:
+            self.cancel_all()
+        for lane in self._lanes.values():
+            lane.stop()
+
+    def _run(self, task: Task) -> None:
+        """(Worker Thread) Executa uma tarefa tirada da fila."""
+        if task.token.cancelled:
+            self._finish(task, CANCELLED)
+            return
+        task.state = RUNNING
+        task.started_at = time.monotonic()
+        self._notify()
+        _current.lane = task.lane
+        _current.task = task
+        try:
+            task._fn(*task._args, **task._kwargs)
+        except Cancelled:
+            self._finish(task, CANCELLED)
+        except Exception as e:
+            task.error = e
+            print(f"Tarefa '{task.name}' falhou: {e}")
+            self._finish(task, FAILED)
+        else:
+            self._finish(task, CANCELLED if task.token.cancelled else DONE)
+        finally:
+            _current.lane = None
+            _current.task = None
+
+    def _finish(self, task: Task, state: str) -> None:
+        task.state = state
+        task.finished_at = time.monotonic()
+        task._args = task._kwargs = None  # type: ignore  # Liberta referências
+        with self._lock:
+            self._active.pop(task.id, None)
+        self._notify()
+
+    def _notify(self) -> None:
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Erro num ouvinte do agendador: {e}")
@@ -0,0 +1,338 @@
+"""
+Spans de tempo por operação, com filhos para cada pedido HTTP e comando git.
+
+Cada operação de alto nível (conectar, carregar issues, clonar, push, pull,
+gráfico) abre um span; dentro dele, os pedidos HTTP (ver `github_http`)
+e os comandos do GitPython viram spans filhos com os seus detalhes (URL,
+status, bytes, rate limit / argv, código de saída). Os spans terminados ficam
+num buffer limitado e podem ser exportados em JSONL ou no formato do Chrome
+(`chrome://tracing` / Perfetto).
+"""
+import functools
+import itertools
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_CAPACITY = 10000  # Spans terminados guardados em memória
+TRACE_FLAG = "--trace"
+
+RATE_LIMIT_HEADERS = {
+    "X-RateLimit-Limit": "ratelimit_limit",
+    "X-RateLimit-Remaining": "ratelimit_remaining",
+    "X-RateLimit-Used": "ratelimit_used",
+    "X-RateLimit-Reset": "ratelimit_reset",
+    "X-RateLimit-Resource": "ratelimit_resource",
+}
+
+# Segmentos variáveis do caminho -> nome do parâmetro (para agrupar pedidos iguais)
+_PATH_TEMPLATES = [
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/users/[^/]+"), "/users/{user}"),
+    (re.compile(r"^/orgs/[^/]+"), "/orgs/{org}"),
+]
+_NUMBER_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def url_template(url: str) -> str:
+    """'/repos/octo/app/issues/12?page=2' -> '/repos/{owner}/{repo}/issues/{number}'."""
+    path = urlparse(url).path or "/"
+    if path.startswith("/api/v3/"):  # GitHub Enterprise
+        path = path[len("/api/v3"):]
+    for pattern, template in _PATH_TEMPLATES:
+        path = pattern.sub(template, path, count=1)
+    return _NUMBER_SEGMENT.sub("/{number}", path)
+
+
+class Span:
+    """Um intervalo de tempo com nome, categoria, atributos e o span pai."""
+
+    __slots__ = ("span_id", "parent_id", "name", "category", "attrs", "started_at",
+                 "wall_start", "ended_at", "thread_id", "thread_name")
+
+    def __init__(self, span_id: int, parent_id: Optional[int], name: str, category: str,
+                 attrs: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.wall_start = time.time()
+        self.started_at = time.perf_counter()
+        self.ended_at: Optional[float] = None
+        self.thread_id = thread.ident or 0
+        self.thread_name = thread.name
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.ended_at if self.ended_at is not None else time.perf_counter()
+        return (end - self.started_at) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "cat": self.category,
+            "start": self.wall_start,
+            "duration_ms": round(self.duration_ms, 3),
+            "thread": self.thread_name,
+            "attrs": self.attrs,
+        }
+
+    def to_chrome_event(self) -> Dict[str, Any]:
+        """Evento "complete" (ph=X) do Chrome Trace Event Format (tempos em µs)."""
+        return {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": round(self.wall_start * 1_000_000),
+            "dur": round(self.duration_ms * 1000),
+            "pid": 1,
+            "tid": self.thread_id,
+            "args": dict(self.attrs, span_id=self.span_id, parent_id=self.parent_id),
+        }
+
+
+class Tracer:
+    """Cria spans (pilha por thread) e guarda os terminados num buffer circular."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self._finished: Deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Optional[Span]:
+        """Span ativo nesta thread (o pai dos próximos spans)."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def start_span(self, name: str, category: str = "op", parent: Optional[Span] = None,
+                   **attrs: Any) -> Span:
+        """Abre um span sem o tornar o atual (ex: processo que termina noutra thread)."""
+        if parent is None:
+            parent = self.current()
+        return Span(next(self._ids), parent.span_id if parent else None, name, category, attrs)
+
+    def finish(self, span: Span, **attrs: Any) -> None:
+        if attrs:
+            span.set(**attrs)
+        span.ended_at = time.perf_counter()
+        with self._lock:
+            self._finished.append(span)
+
+    @contextmanager
+    def span(self, name: str, category: str = "op", **attrs: Any) -> Iterator[Span]:
+        """Span atual enquanto o bloco corre; exceções ficam registadas em `error`."""
+        span = self.start_span(name, category, **attrs)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            stack.pop()
+            self.finish(span)
+
+    @contextmanager
+    def attach(self, parent: Optional[Span]) -> Iterator[None]:
+        """Usa `parent` como span atual noutra thread (ex: workers de um pool)."""
+        if parent is None:
+            yield
+            return
+        stack = self._stack()
+        stack.append(parent)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._finished)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._finished.clear()
+
+    def export_jsonl(self, path: Path) -> int:
+        """Um span por linha (JSON). Devolve quantos spans foram escritos."""
+        spans = self.spans()
+        with open(path, "w", encoding="utf-8") as file:
+            for span in spans:
+                file.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+        return len(spans)
+
+    def export_chrome(self, path: Path) -> int:
+        """Ficheiro para abrir em chrome://tracing ou ui.perfetto.dev."""
+        spans = self.spans()
+        events = [span.to_chrome_event() for span in spans]
+        names = {(span.thread_id, span.thread_name) for span in spans}
+        events.extend({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                       "args": {"name": name}} for tid, name in names)
+        Path(path).write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str),
+            encoding="utf-8")
+        return len(spans)
+
+    def export(self, path: Path) -> int:
+        """Escolhe o formato pela extensão: `.jsonl` -> JSONL; outra -> Chrome trace."""
+        if str(path).endswith(".jsonl"):
+            return self.export_jsonl(path)
+        return self.export_chrome(path)
+
+
+TRACER = Tracer()
+
+
+def trace_path_from_argv(argv: List[str]) -> Optional[Path]:
+    """Caminho passado em `--trace ARQUIVO` (ou None)."""
+    if TRACE_FLAG in argv:
+        index = argv.index(TRACE_FLAG)
+        if index + 1 < len(argv):
+            return Path(argv[index + 1])
+    return None
+
+
+def traced(name: Optional[str] = None, category: str = "op") -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorador: executa a função dentro de um span (por omissão, com o nome dela)."""
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with TRACER.span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- HTTP ---
+
+def http_span_attrs(method: str, url: str) -> Dict[str, Any]:
+    attrs: Dict[str, Any] = {"method": method.upper(), "url": url_template(url),
+                             "host": urlparse(url).hostname}
+    page = parse_qs(urlparse(url).query).get("page")
+    if page:
+        attrs["page"] = page[0]
+    return attrs
+
+
+def record_http_response(span: Span, status: int, headers: Any,
+                         body: Optional[bytes] = None) -> None:
+    """Guarda status, tamanho da resposta e headers de rate limit no span."""
+    span.set(status=status)
+    length = headers.get("Content-Length")
+    if length is not None:
+        span.set(bytes=int(length))
+    elif body is not None:
+        span.set(bytes=len(body))
+    for header, attr in RATE_LIMIT_HEADERS.items():
+        value = headers.get(header)
+        if value is not None:
+            span.set(**{attr: value})
+
+
+@contextmanager
+def http_span(method: str, url: str) -> Iterator[Span]:
+    attrs = http_span_attrs(method, url)
+    with TRACER.span(f"{attrs['method']} {attrs['url']}", "http", **attrs) as span:
+        yield span
+
+
+# --- Git ---
+
+_git_lock = threading.Lock()
+_git_instrumented = False
+
+
+def instrument_gitpython(git_module: Any = None) -> None:
+    """Regista spans para cada comando do GitPython (argv, tempo e código de saída)."""
+    global _git_instrumented
+    with _git_lock:
+        if _git_instrumented:
+            return
+        from git import cmd as git_cmd  # type: ignore
+        from git.exc import GitCommandError  # type: ignore
+
+        original_execute = git_cmd.Git.execute
+
+        class TracedProcess(git_cmd.Git.AutoInterrupt):  # type: ignore
+            """
+            O processo de `as_process=True` guarda o próprio span: fecha no
+            wait() ou, se ninguém esperar por ele, quando o GitPython o termina
+            (`__del__` -> `_terminate`). Nada fica preso num registo global.
+            """
+            __slots__ = ("span",)
+
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                super().__init__(*args, **kwargs)
+                self.span: Optional[Span] = None
+
+            def _finish_span(self, **attrs: Any) -> None:
+                span, self.span = getattr(self, "span", None), None
+                if span is not None:
+                    TRACER.finish(span, **attrs)
+
+            def wait(self, *args: Any, **kwargs: Any) -> int:
+                try:
+                    status = super().wait(*args, **kwargs)
+                except GitCommandError as e:
+                    self._finish_span(exit_code=e.status)
+                    raise
+                self._finish_span(exit_code=status)
+                return status
+
+            def _terminate(self) -> None:
+                self._finish_span(terminated=True)  # Sem wait(): fica sem código de saída
+                super()._terminate()
+
+        @functools.wraps(original_execute)
+        def execute(self: Any, command: Any, *args: Any, **kwargs: Any) -> Any:
+            argv = [str(part) for part in command] if not isinstance(command, str) else [command]
+            name = " ".join(argv[:2])
+            if kwargs.get("as_process"):
+                # O processo continua a correr depois do return: o span fecha com ele
+                span = TRACER.start_span(name, "git", argv=argv, as_process=True)
+                process = original_execute(self, command, *args, **kwargs)
+                if any(part.startswith("--batch") for part in argv):
+                    # `cat-file --batch` fica aberto enquanto o Repo existir: só o arranque conta
+                    TRACER.finish(span, persistent=True)
+                elif isinstance(process, TracedProcess):
+                    process.span = span
+                else:
+                    TRACER.finish(span)
+                return process
+
+            with TRACER.span(name, "git", argv=argv) as span:
+                try:
+                    result = original_execute(self, command, *args, **kwargs)
+                except GitCommandError as e:
+                    span.set(exit_code=e.status)
+                    raise
+                status = result[0] if kwargs.get("with_extended_output") else 0
+                span.set(exit_code=status)
+                return result
+
+        git_cmd.Git.execute = execute
+        git_cmd.Git.AutoInterrupt = TracedProcess
+        _git_instrumented = True
@@ -0,0 +1,160 @@
+"""
+Fila de despacho para a UI thread, esvaziada uma vez por frame (~16 ms).
+
+Os workers não chamam `widget.after(0, ...)` a cada mensagem: colocam o
+pedido nesta fila (segura entre threads) e o loop principal processa tudo de
+uma vez. Mensagens de status seguidas são fundidas (a barra só mostra a
+última) e as linhas de log do lote entram na caixa de log com um só insert.
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+DEFAULT_INTERVAL_MS = 16  # ~60 frames por segundo
+
+_CALL = 0
+_STATUS = 1
+
+
+class DispatchStats:
+    """Métricas da fila: profundidade e latência (enfileirar -> executar)."""
+
+    __slots__ = ("depth", "max_depth", "drains", "items", "merged_statuses",
+                 "last_latency_ms", "max_latency_ms", "last_drain_ms", "max_drain_ms")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.max_depth = 0
+        self.drains = 0
+        self.items = 0
+        self.merged_statuses = 0  # Status que nunca chegaram à barra (substituídos)
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.last_drain_ms = 0.0
+        self.max_drain_ms = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class UIDispatcher:
+    """
+    Recebe pedidos de qualquer thread e executa-os na UI thread, em lotes.
+
+    `on_status(mensagem)` atualiza a barra de status e `on_log(linhas)` recebe
+    as linhas de log já formatadas do lote; ambos correm na UI thread.
+    """
+
+    def __init__(self, widget: Any, on_status: Callable[[str], None],
+                 on_log: Callable[[List[str]], None],
+                 interval_ms: int = DEFAULT_INTERVAL_MS) -> None:
+        self.widget = widget
+        self.on_status = on_status
+        self.on_log = on_log
+        self.interval_ms = interval_ms
+        self.stats = DispatchStats()
+        self._queue: Deque[List[Any]] = deque()
+        self._keyed: Dict[Hashable, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._after_id: Optional[str] = None
+
+    # --- Qualquer thread ---
+    def call(self, fn: Callable[..., Any], *args: Any, key: Optional[Hashable] = None) -> None:
+        """
+        Agenda `fn(*args)` na UI thread. Com `key`, um pedido ainda pendente com
+        a mesma chave é atualizado em vez de enfileirar outro (ex: contadores).
+        """
+        with self._lock:
+            if key is not None:
+                pending = self._keyed.get(key)
+                if pending is not None:
+                    pending[2], pending[3] = fn, args
+                    return
+            item = [_CALL, time.monotonic(), fn, args, key]
+            if key is not None:
+                self._keyed[key] = item
+            self._enqueue(item)
+
+    def status(self, message: str, log: bool = True) -> None:
+        """Mostra `message` na barra de status (e, com `log`, regista-a no log)."""
+        line = f"[{datetime.now().strftime('%H:%M:%S')}] {message}\n" if log else None
+        with self._lock:
+            self._enqueue([_STATUS, time.monotonic(), message, line, None])
+
+    def _enqueue(self, item: List[Any]) -> None:
+        self._queue.append(item)
+        depth = len(self._queue)
+        self.stats.depth = depth
+        if depth > self.stats.max_depth:
+            self.stats.max_depth = depth
+
+    # --- UI Thread ---
+    def start(self) -> None:
+        """(UI Thread) Começa a esvaziar a fila a cada `interval_ms`."""
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self) -> None:
+        # O próximo tick é agendado antes de processar: se um pedido abrir um
+        # diálogo modal, o loop aninhado do diálogo continua a esvaziar a fila.
+        self._after_id = self.widget.after(self.interval_ms, self._tick)
+        self.drain()
+
+    def drain(self) -> None:
+        """(UI Thread) Processa tudo o que está na fila neste momento."""
+        with self._lock:
+            if not self._queue:
+                return
+            batch = self._queue
+            self._queue = deque()
+            self._keyed.clear()
+            self.stats.depth = 0
+
+        started = time.monotonic()
+        latency_ms = (started - batch[0][1]) * 1000
+        status: Optional[str] = None
+        lines: List[str] = []
+
+        def flush() -> None:
+            nonlocal status
+            if lines:
+                self.on_log(lines[:])
+                lines.clear()
+            if status is not None:
+                self.on_status(status)
+                status = None
+
+        for kind, _, payload, extra, _ in batch:
+            if kind == _STATUS:
+                if status is not None:
+                    self.stats.merged_statuses += 1
+                status = payload
+                if extra:
+                    lines.append(extra)
+                continue
+            flush()  # Mantém a ordem: status anteriores aparecem antes da chamada
+            try:
+                payload(*extra)
+            except Exception as e:
+                print(f"Erro num pedido para a UI ({getattr(payload, '__name__', payload)}): {e}")
+        flush()
+
+        stats = self.stats
+        stats.drains += 1
+        stats.items += len(batch)
+        stats.last_latency_ms = latency_ms
+        stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+        stats.last_drain_ms = (time.monotonic() - started) * 1000
+        stats.max_drain_ms = max(stats.max_drain_ms, stats.last_drain_ms)
+
+    def snapshot(self) -> Tuple[int, float, float]:
+        """(profundidade atual, última latência em ms, latência máxima em ms)."""
+        with self._lock:
+            return self.stats.depth, self.stats.last_latency_ms, self.stats.max_latency_ms
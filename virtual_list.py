@@ -0,0 +1,243 @@
+"""
+Lista virtualizada: guarda todos os itens numa lista Python e só coloca no
+Tk as linhas visíveis. Usada para a lista de repositórios (20k+ itens).
+
+Imita a API do `tkinter.Listbox` que o app usa (insert, delete, get, size,
+curselection, see, selection_set/clear) e gera `<<ListboxSelect>>` no próprio
+widget, como uma Listbox normal.
+
+Seleção múltipla como no modo "extended": Ctrl+clique alterna um item,
+Shift+clique seleciona o intervalo desde o último clique e Ctrl+A seleciona
+todos os itens (inclusive os que não estão visíveis).
+"""
+import tkinter as tk
+from tkinter import font as tkfont
+from typing import Any, Callable, List, Optional, Set, Tuple, Union
+
+Index = Union[int, str]
+
+
+class VirtualListbox(tk.Frame):
+    """Listbox que só materializa as linhas da área visível."""
+
+    def __init__(self, master: Any, font: Any = None,
+                 formatter: Optional[Callable[[str], str]] = None, **listbox_options: Any) -> None:
+        super().__init__(master, bg=listbox_options.get("bg", None),
+                         borderwidth=0, highlightthickness=0)
+        self._items: List[str] = []
+        # Texto mostrado para cada item (só é chamado para as linhas visíveis)
+        self._formatter = formatter
+        self._selected: Set[str] = set()
+        self._anchor: Optional[str] = None  # Último item clicado (início do Shift+clique)
+        self._offset = 0  # Primeiro índice visível
+        self._rows = 1  # Nº de linhas que cabem na área visível
+        self._render_pending = False
+
+        self._listbox = tk.Listbox(self, font=font, exportselection=False,
+                                   activestyle="none", selectmode="extended", **listbox_options)
+        self._scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self._scrollbar.pack(side="right", fill="y")
+        self._listbox.pack(side="left", fill="both", expand=True)
+        self._row_height = max(1, tkfont.Font(font=self._listbox.cget("font")).metrics("linespace") + 1)
+
+        self._listbox.bind("<Configure>", self._on_configure)
+        self._listbox.bind("<<ListboxSelect>>", self._on_inner_select)
+        self._listbox.bind("<Control-Button-1>", self._on_control_click)
+        self._listbox.bind("<Shift-Button-1>", self._on_shift_click)
+        self._listbox.bind("<Control-a>", lambda e: self._select_all_event())
+        self._listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self._listbox.bind("<Button-4>", lambda e: self._scroll_units(-3))
+        self._listbox.bind("<Button-5>", lambda e: self._scroll_units(3))
+        for key, step in (("<Up>", -1), ("<Down>", 1)):
+            self._listbox.bind(key, lambda e, s=step: self._move_selection(s))
+        for key, step in (("<Prior>", -1), ("<Next>", 1)):
+            self._listbox.bind(key, lambda e, s=step: self._move_selection(s * self._rows))
+        self._listbox.bind("<Home>", lambda e: self._move_selection(-len(self._items)))
+        self._listbox.bind("<End>", lambda e: self._move_selection(len(self._items)))
+
+    # ---------------------------------
+    # --- API compatível com Listbox ---
+    # ---------------------------------
+
+    def size(self) -> int:
+        return len(self._items)
+
+    def get(self, index: Index) -> str:
+        return self._items[self._resolve(index)]
+
+    def insert(self, index: Index, *items: str) -> None:
+        position = len(self._items) if index == "end" else int(index)
+        self._items[position:position] = items
+        self._schedule_render()
+
+    def delete(self, first: Index, last: Optional[Index] = None) -> None:
+        start = self._resolve(first)
+        stop = start + 1 if last is None else self._resolve(last) + 1
+        if self._selected:
+            self._selected.difference_update(self._items[start:stop])
+        del self._items[start:stop]
+        self._schedule_render()
+
+    def curselection(self) -> Tuple[int, ...]:
+        if not self._selected:
+            return ()
+        selected = self._selected
+        return tuple(index for index, item in enumerate(self._items) if item in selected)
+
+    def selection_set(self, index: Index) -> None:
+        position = self._resolve(index)
+        self._selected = {self._items[position]}
+        self._anchor = self._items[position]
+        self._schedule_render()
+
+    def selection_clear(self, first: Index = 0, last: Optional[Index] = None) -> None:
+        self._selected.clear()
+        self._schedule_render()
+
+    def selection_add(self, first: Index, last: Optional[Index] = None) -> None:
+        """Junta o intervalo `first`..`last` (inclusive) à seleção atual."""
+        start = self._resolve(first)
+        stop = start if last is None else self._resolve(last)
+        if start > stop:
+            start, stop = stop, start
+        self._selected.update(self._items[start:stop + 1])
+        self._schedule_render()
+
+    def select_all(self) -> None:
+        self._selected = set(self._items)
+        self._schedule_render()
+
+    def see(self, index: Index) -> None:
+        position = self._resolve(index)
+        if position < self._offset:
+            self._set_offset(position)
+        elif position >= self._offset + self._rows:
+            self._set_offset(position - self._rows + 1)
+
+    # ---------------------------------
+    # --- Renderização ---
+    # ---------------------------------
+
+    def _resolve(self, index: Index) -> int:
+        if index == "end":
+            return len(self._items) - 1
+        return int(index)
+
+    def _schedule_render(self) -> None:
+        """Agrupa várias mudanças seguidas numa única renderização."""
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self) -> None:
+        """Coloca no Tk apenas as linhas entre `_offset` e `_offset + _rows`."""
+        self._render_pending = False
+        self._offset = max(0, min(self._offset, len(self._items) - self._rows))
+        visible = self._items[self._offset:self._offset + self._rows]
+
+        self._listbox.delete(0, "end")
+        if visible:
+            texts = [self._formatter(item) for item in visible] if self._formatter else visible
+            self._listbox.insert(0, *texts)
+        for row, item in enumerate(visible):
+            if item in self._selected:
+                self._listbox.selection_set(row)
+
+        total = len(self._items)
+        if total <= self._rows:
+            self._scrollbar.set(0.0, 1.0)
+        else:
+            self._scrollbar.set(self._offset / total, (self._offset + self._rows) / total)
+
+    def _set_offset(self, offset: int) -> None:
+        offset = max(0, min(offset, len(self._items) - self._rows))
+        if offset != self._offset:
+            self._offset = offset
+            self._schedule_render()
+
+    # ---------------------------------
+    # --- Eventos ---
+    # ---------------------------------
+
+    def _on_configure(self, event: Any) -> None:
+        rows = max(1, event.height // self._row_height)
+        if rows != self._rows:
+            self._rows = rows
+            self._schedule_render()
+
+    def _on_scrollbar(self, action: str, *args: str) -> None:
+        if action == "moveto":
+            self._set_offset(int(float(args[0]) * len(self._items)))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self._scroll_units(amount * self._rows if unit == "pages" else amount)
+
+    def _on_mousewheel(self, event: Any) -> str:
+        # Windows envia múltiplos de 120; macOS envia valores pequenos
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_units(-3 * delta)
+
+    def _scroll_units(self, amount: int) -> str:
+        self._set_offset(self._offset + amount)
+        return "break"
+
+    def _on_inner_select(self, event: Any) -> None:
+        """Clique numa linha visível: converte para o índice real e repassa o evento."""
+        rows = self._listbox.curselection()
+        if not rows:
+            return
+        position = self._offset + rows[0]
+        if position < len(self._items):
+            self._selected = {self._items[position]}
+            self._anchor = self._items[position]
+            self.event_generate("<<ListboxSelect>>")
+
+    def _row_item(self, event: Any) -> Optional[str]:
+        """Item sob o cursor do rato (None abaixo da última linha)."""
+        position = self._offset + self._listbox.nearest(event.y)
+        return self._items[position] if 0 <= position < len(self._items) else None
+
+    def _on_control_click(self, event: Any) -> str:
+        """Ctrl+clique: junta ou tira o item da seleção."""
+        item = self._row_item(event)
+        if item is not None:
+            if item in self._selected:
+                self._selected.discard(item)
+            else:
+                self._selected.add(item)
+            self._anchor = item
+            self._schedule_render()
+            self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def _on_shift_click(self, event: Any) -> str:
+        """Shift+clique: seleciona do último item clicado até este."""
+        item = self._row_item(event)
+        if item is None:
+            return "break"
+        end = self._items.index(item)
+        try:
+            start = self._items.index(self._anchor) if self._anchor is not None else end
+        except ValueError:  # O item âncora saiu da lista (filtro)
+            start = end
+        self._selected.clear()
+        self.selection_add(start, end)
+        self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def _select_all_event(self) -> str:
+        self.select_all()
+        self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def _move_selection(self, step: int) -> str:
+        """Setas/PageUp/PageDown/Home/End: move a seleção no conjunto completo."""
+        if not self._items:
+            return "break"
+        current = self.curselection()
+        start = current[-1] if current else self._offset - 1
+        position = max(0, min(start + step, len(self._items) - 1))
+        self.selection_set(position)
+        self.see(position)
+        self.event_generate("<<ListboxSelect>>")
+        return "break"